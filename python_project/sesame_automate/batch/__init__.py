@@ -0,0 +1 @@
+from sesame_automate.batch.batch_cli import BatchRunner, main
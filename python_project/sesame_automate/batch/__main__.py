@@ -0,0 +1,3 @@
+from sesame_automate.batch.batch_cli import main
+
+main()
@@ -0,0 +1,184 @@
+import argparse
+import fnmatch
+import json
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from typing import TYPE_CHECKING, Any, Optional, TextIO
+
+if TYPE_CHECKING:
+    from sesame_automate.jobs import AccountJobs
+
+COMMANDS = {
+    "check-in": "in_time_job",
+    "check-out": "out_time_job",
+    "break-start": "break_start_job",
+    "break-end": "break_finished_job",
+    "plan": "plan_job"
+}
+RESULT_FIELDS = (
+    "last_successful", "error", "previous_error", "skip_reason", "queued", "outbox_event_id",
+    "current_state", "day_plan", "day_off", "executed_steps", "skipped_steps", "error_chain", "timestamp"
+)
+
+
+def select_accounts(accounts: dict[str, "AccountJobs"], names: list[str], patterns: list[str]) -> dict[str, "AccountJobs"]:
+    unknown = [name for name in names if name not in accounts]
+    if unknown:
+        raise ValueError(f"Unknown accounts: {', '.join(unknown)}")
+    if not names and not patterns:
+        return dict(accounts)
+    return {
+        name: jobs for name, jobs in accounts.items()
+        if name in names or any(
+            fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(jobs.account.email, pattern)
+            for pattern in patterns
+        )
+    }
+
+
+def read_account_names(path: str) -> list[str]:
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def result_line(command: str, account: str, day: Optional[date], result: Any, duration: float, error: Optional[Exception] = None) -> dict[str, Any]:
+    result = result if isinstance(result, dict) else {}
+    line = {
+        "command": command,
+        "account": account,
+        "ok": error is None and bool(result.get("last_successful")),
+        "skipped": bool(result.get("skipped")),
+        "duration_ms": round(duration * 1000, 1)
+    }
+    if day is not None:
+        line["date"] = day.isoformat()
+    for field in RESULT_FIELDS:
+        value = result.get(field)
+        if value is not None:
+            line[field] = value.to_dict() if hasattr(value, "to_dict") else value
+    if error is not None:
+        line["error"] = str(error)
+    elif not result:
+        line["error"] = "Job returned no result"
+    return line
+
+
+class BatchRunner:
+    def __init__(self, workers: int, rate_limit: Optional[float] = None, output: TextIO = sys.stdout):
+        from sesame_automate.http_client.rate_limiter import TokenBucket
+
+        self._workers = workers
+        self._bucket = TokenBucket(rate_limit, burst=1.0) if rate_limit else None
+        self._output = output
+        self._output_lock = threading.Lock()
+
+    def run(self, command: str, accounts: dict[str, "AccountJobs"], days: list[Optional[date]]) -> dict[str, Any]:
+        started = time.perf_counter()
+        job_name = COMMANDS[command]
+        tasks = [(name, jobs, day) for name, jobs in accounts.items() for day in days]
+        counts = {"ok": 0, "skipped": 0, "failed": 0}
+        failed: list[str] = []
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="batch") as executor:
+            futures = [executor.submit(self._run_one, command, job_name, name, jobs, day) for name, jobs, day in tasks]
+            for future in as_completed(futures):
+                line = future.result()
+                self._emit(line)
+                if not line["ok"]:
+                    counts["failed"] += 1
+                    failed.append(line["account"])
+                elif line["skipped"]:
+                    counts["skipped"] += 1
+                else:
+                    counts["ok"] += 1
+        return {
+            "summary": {
+                "command": command,
+                "total": len(tasks),
+                **counts,
+                "failed_accounts": sorted(set(failed)),
+                "elapsed_seconds": round(time.perf_counter() - started, 3)
+            }
+        }
+
+    def _run_one(self, command: str, job_name: str, name: str, jobs: "AccountJobs", day: Optional[date]) -> dict[str, Any]:
+        if self._bucket:
+            self._bucket.acquire()
+        started = time.perf_counter()
+        try:
+            job = getattr(jobs, job_name)
+            result = job(day) if job_name == "plan_job" else job()
+            return result_line(command, name, day, result, time.perf_counter() - started)
+        except Exception as e:
+            return result_line(command, name, day, None, time.perf_counter() - started, e)
+
+    def _emit(self, line: dict[str, Any]) -> None:
+        with self._output_lock:
+            self._output.write(json.dumps(line, default=str) + "\n")
+            self._output.flush()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run clock operations or day plans for many accounts at once, one JSON line per account")
+    parser.add_argument("command", choices=list(COMMANDS))
+    parser.add_argument("--account", action="append", default=[], help="Account name, may be repeated")
+    parser.add_argument("--accounts-from", help="File with one account name per line, - for stdin")
+    parser.add_argument("--match", action="append", default=[], help="Glob matched against account names and emails, may be repeated")
+    parser.add_argument("--all", action="store_true", help="Run for every configured account")
+    parser.add_argument("--date", action="append", type=date.fromisoformat, default=[], help="Day to plan (YYYY-MM-DD), may be repeated, plan only")
+    parser.add_argument("--workers", type=int, default=None, help="Accounts processed concurrently, defaults to FLEET_MAX_WORKERS")
+    parser.add_argument("--rate", type=float, default=None, help="Maximum accounts started per second")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the selected accounts")
+    args = parser.parse_args(argv)
+
+    if args.date and args.command != "plan":
+        parser.error("--date is only supported by plan, clock events cannot be backdated")
+    names = list(args.account)
+    if args.accounts_from:
+        names += read_account_names(args.accounts_from)
+    if args.command != "plan" and not (names or args.match or args.all):
+        parser.error(f"{args.command} changes clock state, select accounts with --account, --accounts-from, --match or --all")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be positive")
+
+    logging.basicConfig(level=logging.WARNING)
+    from sesame_automate.config import get_settings
+    from sesame_automate.fleet import Fleet
+    from sesame_automate.main import build_runtime, load_environment
+
+    load_environment()
+    runtime = build_runtime()
+    accounts = runtime.accounts if isinstance(runtime, Fleet) else {runtime.account.name: runtime}
+    try:
+        selected = select_accounts(accounts, names, args.match)
+    except ValueError as e:
+        parser.error(str(e))
+    if not selected:
+        parser.error("No accounts match the selection")
+
+    try:
+        if args.dry_run:
+            for name, jobs in selected.items():
+                print(json.dumps({"command": args.command, "account": name, "email": jobs.account.email, "dry_run": True}))
+            return
+        runner = BatchRunner(args.workers or get_settings().fleet_max_workers, args.rate)
+        summary = runner.run(args.command, selected, args.date or [None])
+        print(json.dumps(summary))
+    finally:
+        if isinstance(runtime, Fleet):
+            runtime.shutdown()
+    if summary["summary"]["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
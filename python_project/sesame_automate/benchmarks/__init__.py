@@ -0,0 +1 @@
+from sesame_automate.benchmarks.job_benchmark import run_benchmark
@@ -0,0 +1,3 @@
+from sesame_automate.benchmarks.job_benchmark import main
+
+main()
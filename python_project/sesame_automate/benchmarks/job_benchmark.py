@@ -0,0 +1,258 @@
+import argparse
+import json
+import logging
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Optional
+from sesame_automate.models.account import Account
+from sesame_automate.models.runnable_sequence import Runnable
+from sesame_automate.simulation.mock_sesame_server import MockSesameServer
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+JOB_TYPES = ("in_time_job", "out_time_job", "break_start_job", "break_finished_job")
+STEP_ATTRIBUTES = ("_login", "_me", "_check_status", "_day_plan", "_work_break", "_assigned_work_check_types", "_check_in", "_check_out")
+
+
+class TimedRunnable(Runnable):
+    def __init__(self, runnable: Runnable, name: str, samples: dict[str, list[float]]):
+        self._runnable = runnable
+        self._name = name
+        self._samples = samples
+
+    def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            return self._runnable.execute(data)
+        finally:
+            self._samples[self._name].append(time.perf_counter() - started)
+
+
+def percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    return {
+        "count": len(values),
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "max_ms": max(values, default=0.0) * 1000
+    }
+
+
+def isolated_environment(workdir: str) -> dict[str, str]:
+    return {
+        "SESSION_STORE_PATH": os.path.join(workdir, "session.json"),
+        "CLOCK_OUTBOX_PATH": os.path.join(workdir, "outbox.sqlite"),
+        "STATE_STORE_PATH": os.path.join(workdir, "state.sqlite"),
+        "RUN_HISTORY_PATH": os.path.join(workdir, "runs.sqlite"),
+        "REFERENCE_CACHE_PATH": os.path.join(workdir, "reference_cache.json"),
+        "COORDINATION_PATH": os.path.join(workdir, "leases.sqlite"),
+        "HTTP_CASSETTE": "off",
+        "HTTP_CASSETTE_PATH": os.path.join(workdir, "cassette.json.gz"),
+        "LOG_DIR": os.path.join(workdir, "logs"),
+        "METRICS_FILE": "",
+        "TRACE_FILE": "",
+        "SETTINGS_FILE": "",
+        "SETTINGS_HOT_RELOAD": "false",
+        "SESAME_ACCOUNTS_FILE": ""
+    }
+
+
+def run_benchmark(
+    accounts: int = 1,
+    iterations: int = 20,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    rate_limit: Optional[float] = None,
+    cold: bool = False,
+    job_types: tuple[str, ...] = JOB_TYPES
+) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="sesame-bench-") as workdir, \
+            MockSesameServer(latency=latency, error_rate=error_rate, rate_limit=rate_limit) as server:
+        os.environ.update({
+            "BASE_URL": server.base_url,
+            "COOKIE_DOMAIN": "127.0.0.1",
+            "BREAK_NAME": "Lunch",
+            "REFERENCE_CACHE_BACKEND": "memory",
+            **isolated_environment(workdir)
+        })
+        from sesame_automate.config import reload_settings
+        from sesame_automate.jobs.account_jobs import AccountJobs
+        from sesame_automate.stores.reference_cache import get_reference_cache
+        from sesame_automate.stores.session_store import get_session_store
+
+        reload_settings()
+
+        step_samples: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+        all_jobs = [
+            AccountJobs(Account(name=f"bench{i}", email=f"bench{i}@example.com", password="benchmark"))
+            for i in range(accounts)
+        ]
+
+        report: dict[str, Any] = {
+            "config": {
+                "accounts": accounts,
+                "iterations": iterations,
+                "latency": latency,
+                "error_rate": error_rate,
+                "rate_limit": rate_limit,
+                "cold": cold
+            },
+            "jobs": {}
+        }
+
+        for account_jobs in all_jobs:
+            account_jobs.welcome_job()
+
+        for job_type in job_types:
+            for account_jobs in all_jobs:
+                for attribute in STEP_ATTRIBUTES:
+                    runnable = getattr(account_jobs, attribute)
+                    inner = runnable._runnable if isinstance(runnable, TimedRunnable) else runnable
+                    setattr(account_jobs, attribute, TimedRunnable(inner, attribute.lstrip("_"), step_samples[job_type]))
+
+            latencies = []
+            failures = 0
+            server.reset_stats()
+            tracemalloc.start()
+            cpu_started = time.process_time()
+            for _ in range(iterations):
+                for account_jobs in all_jobs:
+                    if cold:
+                        get_session_store().invalidate(account_jobs.account.email)
+                        get_reference_cache().clear()
+                    started = time.perf_counter()
+                    result = getattr(account_jobs, job_type)()
+                    latencies.append(time.perf_counter() - started)
+                    if not result or not result.get("last_successful"):
+                        failures += 1
+            cpu_seconds = time.process_time() - cpu_started
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            runs = iterations * accounts
+            report["jobs"][job_type] = {
+                "latency": summarize(latencies),
+                "failures": failures,
+                "requests_per_run": server.total_requests / runs if runs else 0.0,
+                "requests": dict(server.request_counts),
+                "bytes_received": server.bytes_sent,
+                "cpu_ms_per_run": cpu_seconds * 1000 / runs if runs else 0.0,
+                "peak_traced_memory_kb": peak_memory / 1024,
+                "steps": {name: summarize(samples) for name, samples in step_samples[job_type].items()}
+            }
+
+        report["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return report
+
+
+STARTUP_SCRIPT = '''
+import json, time
+started = time.perf_counter()
+import sesame_automate.main as main
+imported = time.perf_counter()
+main.prepare_scheduler()
+ready = time.perf_counter()
+print(json.dumps({"import_ms": (imported - started) * 1000, "ready_ms": (ready - started) * 1000}))
+'''
+
+
+def measure_startup(latency: float = 0.0, runs: int = 3) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="sesame-startup-") as workdir, MockSesameServer(latency=latency) as server:
+        env = dict(
+            os.environ,
+            PYTHONPATH=os.pathsep.join(filter(None, (PROJECT_ROOT, os.environ.get("PYTHONPATH")))),
+            BASE_URL=server.base_url,
+            COOKIE_DOMAIN="127.0.0.1",
+            SESAME_EMAIL="startup@example.com",
+            SESAME_PASSWORD="benchmark",
+            **isolated_environment(workdir),
+            IN_TIME_CRON="0 9 * * 1-5",
+            OUT_TIME_CRON="0 18 * * 1-5",
+            BREAK_START_CRON="0 13 * * 1-5",
+            BREAK_END_CRON="0 14 * * 1-5"
+        )
+        for fast_start in (False, True):
+            samples = []
+            for _ in range(runs):
+                shutil.rmtree(workdir, ignore_errors=True)
+                os.makedirs(workdir)
+                output = subprocess.run(
+                    [sys.executable, "-c", STARTUP_SCRIPT],
+                    env=dict(env, FAST_START=str(fast_start).lower()),
+                    capture_output=True,
+                    text=True,
+                    check=True
+                ).stdout
+                samples.append(json.loads(output.strip().splitlines()[-1]))
+            results["fast_start" if fast_start else "blocking_start"] = {
+                "import_ms": percentile([sample["import_ms"] for sample in samples], 50),
+                "ready_ms": percentile([sample["ready_ms"] for sample in samples], 50)
+            }
+    return results
+
+
+def format_report(report: dict[str, Any]) -> str:
+    lines = [f"Benchmark configuration: {json.dumps(report['config'])}", ""]
+    lines.append(f"{'job':<28}{'p50 ms':>10}{'p95 ms':>10}{'req/run':>10}{'cpu ms':>10}{'mem KB':>10}{'failures':>10}")
+    for job_type, job in report["jobs"].items():
+        lines.append(
+            f"{job_type:<28}{job['latency']['p50_ms']:>10.2f}{job['latency']['p95_ms']:>10.2f}"
+            f"{job['requests_per_run']:>10.2f}{job['cpu_ms_per_run']:>10.2f}"
+            f"{job['peak_traced_memory_kb']:>10.1f}{job['failures']:>10}"
+        )
+        for step, stats in job["steps"].items():
+            lines.append(f"  {step:<26}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}   ({stats['count']} calls)")
+    for mode, startup in report.get("startup", {}).items():
+        lines.append(f"startup ({mode}): import {startup['import_ms']:.1f} ms, scheduler ready {startup['ready_ms']:.1f} ms")
+    lines.append("")
+    lines.append(f"Max RSS: {report['max_rss_kb']} KB")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Sesame jobs against a local mock server")
+    parser.add_argument("--accounts", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock server latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Mock server requests per second")
+    parser.add_argument("--cold", action="store_true", help="Drop the session store and caches before every run")
+    parser.add_argument("--jobs", nargs="+", choices=JOB_TYPES, default=list(JOB_TYPES))
+    parser.add_argument("--startup", action="store_true", help="Also measure process startup time with and without FAST_START")
+    parser.add_argument("--json", dest="json_path", help="Also write the full report to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    report = run_benchmark(
+        accounts=args.accounts,
+        iterations=args.iterations,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        cold=args.cold,
+        job_types=tuple(args.jobs)
+    )
+    if args.startup:
+        report["startup"] = measure_startup(latency=args.latency)
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+from sesame_automate.config.settings import Settings, SettingsError, get_settings, parse_work_days, reload_settings
+from sesame_automate.config.settings_watcher import SettingsWatcher
@@ -0,0 +1,372 @@
+import logging
+import os
+import threading
+import tomllib
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+SPREAD_MODES = ("none", "deterministic", "random")
+CALENDAR_SOURCES = ("none", "api", "file")
+REFERENCE_CACHE_BACKENDS = ("memory", "file")
+CLOCK_OUTBOX_MODES = ("off", "fallback", "always")
+COORDINATION_BACKENDS = ("none", "sqlite", "file")
+HTTP_CASSETTE_MODES = ("off", "record", "replay")
+LOG_LEVELS = ("debug", "info", "warning", "error", "critical")
+LOG_FORMATS = ("text", "json")
+LOG_ROTATIONS = ("size", "time")
+LOG_ROTATION_INTERVALS = ("s", "m", "h", "d", "midnight", "w0", "w1", "w2", "w3", "w4", "w5", "w6")
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off", "")
+REQUIRED_SCHEDULES = {
+    "IN_TIME_CRON": "check in",
+    "OUT_TIME_CRON": "check out",
+    "BREAK_START_CRON": "break start",
+    "BREAK_END_CRON": "break end"
+}
+
+
+class SettingsError(ValueError):
+    def __init__(self, errors: list[str]):
+        super().__init__("Invalid settings:\n" + "\n".join(f"  - {error}" for error in errors))
+        self.errors = errors
+
+
+def parse_work_days(value: str | Iterable[str] | None) -> frozenset[str]:
+    if value is None:
+        return frozenset()
+    if isinstance(value, str):
+        value = value.split(",")
+    return frozenset(day.strip().casefold() for day in value if day.strip())
+
+
+class _SettingsReader:
+    def __init__(self, values: Mapping[str, str]):
+        self.values = values
+        self.errors: list[str] = []
+
+    def text(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.values.get(name)
+        return value if value not in (None, "") else default
+
+    def integer(self, name: str, default: Optional[int], minimum: Optional[int] = None) -> Optional[int]:
+        return self._number(name, default, int, minimum)
+
+    def decimal(self, name: str, default: Optional[float], minimum: Optional[float] = None) -> Optional[float]:
+        return self._number(name, default, float, minimum)
+
+    def flag(self, name: str, default: bool) -> bool:
+        value = self.text(name)
+        if value is None:
+            return default
+        if value.lower() in TRUE_VALUES:
+            return True
+        if value.lower() in FALSE_VALUES:
+            return False
+        self.errors.append(f"{name}={value!r} is not a boolean, expected one of {', '.join(TRUE_VALUES + FALSE_VALUES[:-1])}")
+        return default
+
+    def choice(self, name: str, default: str, choices: tuple[str, ...]) -> str:
+        value = (self.text(name) or default).lower()
+        if value not in choices:
+            self.errors.append(f"{name}={value!r} is not valid, expected one of {', '.join(choices)}")
+            return default
+        return value
+
+    def items(self, name: str, default: tuple[str, ...] = ()) -> tuple[str, ...]:
+        value = self.values.get(name)
+        if value is None:
+            return default
+        return tuple(item.strip() for item in value.split(",") if item.strip())
+
+    def _number(self, name: str, default: Any, kind: type, minimum: Any) -> Any:
+        value = self.text(name)
+        if value is None:
+            return default
+        try:
+            number = kind(value)
+        except ValueError:
+            self.errors.append(f"{name}={value!r} is not a valid {kind.__name__}")
+            return default
+        if minimum is not None and number < minimum:
+            self.errors.append(f"{name}={value!r} must be at least {minimum}")
+            return default
+        return number
+
+
+@dataclass(frozen=True)
+class Settings:
+    base_url: Optional[str] = None
+    cookie_domain: Optional[str] = None
+    email: Optional[str] = None
+    password: Optional[str] = field(default=None, repr=False)
+    accounts_file: Optional[str] = None
+    time_zone: Optional[str] = None
+    remote_work_days: frozenset[str] = frozenset()
+    break_name: Optional[str] = None
+
+    in_time_crons: tuple[str, ...] = ()
+    out_time_crons: tuple[str, ...] = ()
+    break_start_cron: Optional[str] = None
+    break_end_cron: Optional[str] = None
+    calendar_refresh_cron: str = "5 0 * * *"
+    cron_triggers: dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    fast_start: bool = False
+    schedule_spread_mode: str = "none"
+    schedule_spread_window: float = 0.0
+    scheduler_max_workers: int = 10
+    scheduler_max_instances: int = 1
+    scheduler_misfire_grace_time: int = 300
+    scheduler_coalesce: bool = True
+    catch_up_jobs: tuple[str, ...] = ("in_time_job",)
+    catch_up_max_delay: float = 1800.0
+
+    calendar_source: str = "none"
+    calendar_file: Optional[str] = None
+    calendar_lookahead_days: int = 31
+
+    metrics_file: Optional[str] = None
+    metrics_export_interval: int = 60
+    trace_file: Optional[str] = None
+    status_port: Optional[int] = None
+    status_host: str = "127.0.0.1"
+    status_history_size: int = 200
+    status_login_grace: float = 900.0
+
+    log_dir: str = "logs"
+    log_level: str = "info"
+    log_format: str = "text"
+    log_rotation: str = "size"
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_rotation_when: str = "midnight"
+    log_backup_count: int = 7
+    log_compress: bool = True
+    log_queue_size: int = 10000
+
+    clock_outbox: str = "fallback"
+    clock_outbox_path: str = ".sesame_outbox.sqlite"
+    outbox_drain_interval: float = 30.0
+    outbox_max_concurrency: int = 4
+    outbox_rate_limit: float = 2.0
+    outbox_max_age: float = 28800.0
+
+    fleet_max_workers: int = 16
+    coordination_backend: str = "none"
+    coordination_path: Optional[str] = None
+    replica_id: Optional[str] = None
+    replica_index: int = 0
+    replica_count: int = 1
+    lease_ttl: float = 30.0
+    session_store_path: str = ".sesame_session.json"
+    state_store_path: str = ".sesame_state.sqlite"
+    run_history_path: str = ".sesame_runs.sqlite"
+    reference_cache_backend: str = "memory"
+    reference_cache_ttl: float = 3600.0
+    reference_cache_path: str = ".sesame_reference_cache.json"
+
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 15.0
+    http_max_retries: int = 3
+    http_backoff_base: float = 0.5
+    http_backoff_max: float = 10.0
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+    http_rate_limit: Optional[float] = None
+    http_rate_burst: float = 1.0
+    http_max_concurrency: Optional[int] = None
+    async_max_connections: int = 100
+    async_max_keepalive_connections: int = 20
+    http_cassette: str = "off"
+    http_cassette_path: str = "cassettes/sesame.json.gz"
+
+    settings_file: Optional[str] = None
+    settings_hot_reload: bool = False
+    settings_reload_interval: float = 5.0
+
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, str]) -> "Settings":
+        reader = _SettingsReader(values)
+        time_zone = reader.text("TIME_ZONE")
+        if time_zone:
+            try:
+                ZoneInfo(time_zone)
+            except (ZoneInfoNotFoundError, ValueError):
+                reader.errors.append(f"TIME_ZONE={time_zone!r} is not a known time zone")
+                time_zone = None
+
+        remote_work_days = parse_work_days(reader.text("REMOTE_WORK_DAYS", ""))
+        unknown_days = sorted(remote_work_days - set(WEEKDAYS))
+        if unknown_days:
+            reader.errors.append(f"REMOTE_WORK_DAYS contains unknown weekdays: {', '.join(unknown_days)}")
+
+        replica_count = reader.integer("REPLICA_COUNT", 1, minimum=1)
+        replica_index = reader.integer("REPLICA_INDEX", 0, minimum=0)
+        if replica_index >= replica_count:
+            reader.errors.append(f"REPLICA_INDEX={replica_index} must be lower than REPLICA_COUNT={replica_count}")
+            replica_index = 0
+        settings = cls(
+            base_url=reader.text("BASE_URL"),
+            cookie_domain=reader.text("COOKIE_DOMAIN"),
+            email=reader.text("SESAME_EMAIL"),
+            password=reader.text("SESAME_PASSWORD"),
+            accounts_file=reader.text("SESAME_ACCOUNTS_FILE"),
+            time_zone=time_zone,
+            remote_work_days=remote_work_days,
+            break_name=reader.text("BREAK_NAME"),
+            in_time_crons=reader.items("IN_TIME_CRON"),
+            out_time_crons=reader.items("OUT_TIME_CRON"),
+            break_start_cron=reader.text("BREAK_START_CRON"),
+            break_end_cron=reader.text("BREAK_END_CRON"),
+            calendar_refresh_cron=reader.text("CALENDAR_REFRESH_CRON", "5 0 * * *"),
+            fast_start=reader.flag("FAST_START", False),
+            schedule_spread_mode=reader.choice("SCHEDULE_SPREAD_MODE", "none", SPREAD_MODES),
+            schedule_spread_window=reader.decimal("SCHEDULE_SPREAD_WINDOW", 0.0, minimum=0),
+            scheduler_max_workers=reader.integer("SCHEDULER_MAX_WORKERS", 10, minimum=1),
+            scheduler_max_instances=reader.integer("SCHEDULER_MAX_INSTANCES", 1, minimum=1),
+            scheduler_misfire_grace_time=reader.integer("SCHEDULER_MISFIRE_GRACE_TIME", 300, minimum=1),
+            scheduler_coalesce=reader.flag("SCHEDULER_COALESCE", True),
+            catch_up_jobs=reader.items("CATCH_UP_JOBS", ("in_time_job",)),
+            catch_up_max_delay=reader.decimal("CATCH_UP_MAX_DELAY", 1800.0, minimum=0),
+            calendar_source=reader.choice("CALENDAR_SOURCE", "none", CALENDAR_SOURCES),
+            calendar_file=reader.text("CALENDAR_FILE"),
+            calendar_lookahead_days=reader.integer("CALENDAR_LOOKAHEAD_DAYS", 31, minimum=1),
+            metrics_file=reader.text("METRICS_FILE"),
+            metrics_export_interval=reader.integer("METRICS_EXPORT_INTERVAL", 60, minimum=1),
+            trace_file=reader.text("TRACE_FILE"),
+            status_port=reader.integer("STATUS_PORT", None, minimum=0),
+            status_host=reader.text("STATUS_HOST", "127.0.0.1"),
+            status_history_size=reader.integer("STATUS_HISTORY_SIZE", 200, minimum=1),
+            status_login_grace=reader.decimal("STATUS_LOGIN_GRACE", 900.0, minimum=0),
+            log_dir=reader.text("LOG_DIR", "logs"),
+            log_level=reader.choice("LOG_LEVEL", "info", LOG_LEVELS),
+            log_format=reader.choice("LOG_FORMAT", "text", LOG_FORMATS),
+            log_rotation=reader.choice("LOG_ROTATION", "size", LOG_ROTATIONS),
+            log_max_bytes=reader.integer("LOG_MAX_BYTES", 10 * 1024 * 1024, minimum=1024),
+            log_rotation_when=reader.choice("LOG_ROTATION_WHEN", "midnight", LOG_ROTATION_INTERVALS),
+            log_backup_count=reader.integer("LOG_BACKUP_COUNT", 7, minimum=0),
+            log_compress=reader.flag("LOG_COMPRESS", True),
+            log_queue_size=reader.integer("LOG_QUEUE_SIZE", 10000, minimum=1),
+            clock_outbox=reader.choice("CLOCK_OUTBOX", "fallback", CLOCK_OUTBOX_MODES),
+            clock_outbox_path=reader.text("CLOCK_OUTBOX_PATH", ".sesame_outbox.sqlite"),
+            outbox_drain_interval=reader.decimal("OUTBOX_DRAIN_INTERVAL", 30.0, minimum=1),
+            outbox_max_concurrency=reader.integer("OUTBOX_MAX_CONCURRENCY", 4, minimum=1),
+            outbox_rate_limit=reader.decimal("OUTBOX_RATE_LIMIT", 2.0, minimum=0.01),
+            outbox_max_age=reader.decimal("OUTBOX_MAX_AGE", 28800.0, minimum=60),
+            fleet_max_workers=reader.integer("FLEET_MAX_WORKERS", 16, minimum=1),
+            coordination_backend=reader.choice("COORDINATION_BACKEND", "none", COORDINATION_BACKENDS),
+            coordination_path=reader.text("COORDINATION_PATH"),
+            replica_id=reader.text("REPLICA_ID"),
+            replica_index=replica_index,
+            replica_count=replica_count,
+            lease_ttl=reader.decimal("LEASE_TTL", 30.0, minimum=1),
+            session_store_path=reader.text("SESSION_STORE_PATH", ".sesame_session.json"),
+            state_store_path=reader.text("STATE_STORE_PATH", ".sesame_state.sqlite"),
+            run_history_path=reader.text("RUN_HISTORY_PATH", ".sesame_runs.sqlite"),
+            reference_cache_backend=reader.choice("REFERENCE_CACHE_BACKEND", "memory", REFERENCE_CACHE_BACKENDS),
+            reference_cache_ttl=reader.decimal("REFERENCE_CACHE_TTL", 3600.0, minimum=0),
+            reference_cache_path=reader.text("REFERENCE_CACHE_PATH", ".sesame_reference_cache.json"),
+            http_connect_timeout=reader.decimal("HTTP_CONNECT_TIMEOUT", 5.0, minimum=0),
+            http_read_timeout=reader.decimal("HTTP_READ_TIMEOUT", 15.0, minimum=0),
+            http_max_retries=reader.integer("HTTP_MAX_RETRIES", 3, minimum=0),
+            http_backoff_base=reader.decimal("HTTP_BACKOFF_BASE", 0.5, minimum=0),
+            http_backoff_max=reader.decimal("HTTP_BACKOFF_MAX", 10.0, minimum=0),
+            circuit_failure_threshold=reader.integer("CIRCUIT_FAILURE_THRESHOLD", 5, minimum=1),
+            circuit_reset_timeout=reader.decimal("CIRCUIT_RESET_TIMEOUT", 30.0, minimum=0),
+            http_rate_limit=reader.decimal("HTTP_RATE_LIMIT", None, minimum=0),
+            http_rate_burst=reader.decimal("HTTP_RATE_BURST", 1.0, minimum=1),
+            http_max_concurrency=reader.integer("HTTP_MAX_CONCURRENCY", None, minimum=1),
+            async_max_connections=reader.integer("ASYNC_MAX_CONNECTIONS", 100, minimum=1),
+            async_max_keepalive_connections=reader.integer("ASYNC_MAX_KEEPALIVE_CONNECTIONS", 20, minimum=0),
+            http_cassette=reader.choice("HTTP_CASSETTE", "off", HTTP_CASSETTE_MODES),
+            http_cassette_path=reader.text("HTTP_CASSETTE_PATH", "cassettes/sesame.json.gz"),
+            settings_file=reader.text("SETTINGS_FILE"),
+            settings_hot_reload=reader.flag("SETTINGS_HOT_RELOAD", False),
+            settings_reload_interval=reader.decimal("SETTINGS_RELOAD_INTERVAL", 5.0, minimum=0.1)
+        )
+        settings.cron_triggers.update(_parse_crons(settings, reader.errors))
+        if reader.errors:
+            raise SettingsError(reader.errors)
+        return settings
+
+    @classmethod
+    def load(cls, environ: Optional[Mapping[str, str]] = None) -> "Settings":
+        environ = os.environ if environ is None else environ
+        values: dict[str, str] = dict(environ)
+        settings_file = environ.get("SETTINGS_FILE")
+        if settings_file:
+            file_values = _load_settings_file(settings_file)
+            masked = sorted(key for key, value in file_values.items() if environ.get(key, value) != value)
+            if masked:
+                logging.getLogger(__name__).warning(f"{settings_file} overrides the environment for {', '.join(masked)}")
+            values.update(file_values)
+        return cls.from_mapping(values)
+
+    def missing_schedules(self) -> dict[str, str]:
+        configured = {
+            "IN_TIME_CRON": self.in_time_crons,
+            "OUT_TIME_CRON": self.out_time_crons,
+            "BREAK_START_CRON": self.break_start_cron,
+            "BREAK_END_CRON": self.break_end_cron
+        }
+        return {variable: jobs for variable, jobs in REQUIRED_SCHEDULES.items() if not configured[variable]}
+
+    def cron_trigger(self, expression: str) -> Any:
+        return self.cron_triggers[expression]
+
+
+def _parse_crons(settings: Settings, errors: list[str]) -> dict[str, Any]:
+    expressions = {
+        "IN_TIME_CRON": settings.in_time_crons,
+        "OUT_TIME_CRON": settings.out_time_crons,
+        "BREAK_START_CRON": (settings.break_start_cron,) if settings.break_start_cron else (),
+        "BREAK_END_CRON": (settings.break_end_cron,) if settings.break_end_cron else (),
+        "CALENDAR_REFRESH_CRON": (settings.calendar_refresh_cron,) if settings.calendar_source == "api" else ()
+    }
+    if not any(expressions.values()):
+        return {}
+
+    from apscheduler.triggers.cron import CronTrigger
+    triggers = {}
+    for variable, crons in expressions.items():
+        for cron in crons:
+            try:
+                triggers[cron] = CronTrigger.from_crontab(cron, timezone=settings.time_zone)
+            except ValueError as e:
+                errors.append(f"{variable}={cron!r} is not a valid cron expression: {e}")
+    return triggers
+
+
+def _load_settings_file(path: str) -> dict[str, str]:
+    if not path.endswith(".toml"):
+        raise SettingsError([f"SETTINGS_FILE={path!r} is not supported, expected a .toml file"])
+    try:
+        with open(path, "rb") as f:
+            content = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise SettingsError([f"SETTINGS_FILE={path!r} could not be read: {e}"])
+    return {
+        key.upper(): ",".join(str(item) for item in value) if isinstance(value, list) else str(value).lower() if isinstance(value, bool) else str(value)
+        for key, value in content.items()
+    }
+
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+
+def get_settings() -> Settings:
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = Settings.load()
+        return _settings
+
+
+def reload_settings(environ: Optional[Mapping[str, str]] = None) -> Settings:
+    global _settings
+    settings = Settings.load(environ)
+    with _settings_lock:
+        _settings = settings
+    return settings
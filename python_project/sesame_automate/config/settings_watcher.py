@@ -0,0 +1,65 @@
+import logging
+import os
+import threading
+from typing import Callable, Optional
+from sesame_automate.config.settings import Settings, SettingsError, reload_settings
+
+
+class SettingsWatcher:
+    def __init__(self, paths: list[str], on_change: Callable[[Settings], None], interval: float = 5.0):
+        self._paths = [path for path in paths if path]
+        self._on_change = on_change
+        self._interval = interval
+        self._mtimes = {path: self._mtime(path) for path in self._paths}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._logger = logging.getLogger(__name__)
+
+    def start(self) -> None:
+        if not self._paths:
+            return
+        self._thread = threading.Thread(target=self._run, name="settings-watcher", daemon=True)
+        self._thread.start()
+        self._logger.info(f"Watching {', '.join(self._paths)} for settings changes")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def check(self) -> bool:
+        mtimes = {path: self._mtime(path) for path in self._paths}
+        if mtimes == self._mtimes:
+            return False
+        self._mtimes = mtimes
+
+        env_files = [path for path in self._paths if path.endswith(".env") and os.path.exists(path)]
+        try:
+            if env_files:
+                from dotenv import load_dotenv
+                for path in env_files:
+                    load_dotenv(path, override=True)
+            settings = reload_settings()
+        except ImportError:
+            self._logger.warning("python-dotenv not installed, .env changes cannot be reloaded")
+            return False
+        except SettingsError as e:
+            self._logger.error(f"Settings change ignored, keeping the current settings. {e}")
+            return False
+
+        self._logger.info("Settings reloaded")
+        try:
+            self._on_change(settings)
+        except Exception as e:
+            self._logger.error(f"Failed to apply reloaded settings: {e}")
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.check()
+
+    def _mtime(self, path: str) -> Optional[float]:
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
@@ -0,0 +1,2 @@
+from sesame_automate.coordination.lease_backends import FileLeaseBackend, SqliteLeaseBackend
+from sesame_automate.coordination.job_coordinator import JobCoordinator, get_job_coordinator, scheduled_slot, shard_index
@@ -0,0 +1,206 @@
+import heapq
+import itertools
+import logging
+import os
+import socket
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterator, Optional
+from sesame_automate.config.settings import Settings, get_settings
+from sesame_automate.coordination.lease_backends import FileLeaseBackend, SqliteLeaseBackend
+
+
+def shard_index(account: str, replica_count: int) -> int:
+    return zlib.crc32(account.encode("utf-8")) % replica_count
+
+
+def scheduled_slot(trigger: Any, now: Optional[datetime] = None) -> datetime:
+    from sesame_automate.scheduling.catch_up import last_fire_time
+
+    now = now or datetime.now().astimezone()
+    slot = last_fire_time(trigger, now - timedelta(days=7), now)
+    return slot or now.replace(second=0, microsecond=0)
+
+
+class JobCoordinator:
+    def __init__(
+        self,
+        backend: Optional[SqliteLeaseBackend | FileLeaseBackend] = None,
+        replica_id: Optional[str] = None,
+        lease_ttl: float = 30.0,
+        replica_index: int = 0,
+        replica_count: int = 1,
+        max_wait: float = 600.0
+    ):
+        self._backend = backend
+        self.replica_id = replica_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._lease_ttl = lease_ttl
+        self._replica_index = replica_index
+        self._replica_count = max(replica_count, 1)
+        self._max_wait = max_wait
+        self._standby: list[tuple[float, int, str, Callable[[], Any], float]] = []
+        self._standby_sequence = itertools.count()
+        self._standby_condition = threading.Condition()
+        self._standby_thread: Optional[threading.Thread] = None
+        self._takeover_executor: Optional[ThreadPoolExecutor] = None
+        self._logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Settings] = None) -> "JobCoordinator":
+        settings = settings or get_settings()
+        backend = None
+        if settings.coordination_backend == "sqlite":
+            backend = SqliteLeaseBackend(settings.coordination_path or ".sesame_leases.sqlite")
+        elif settings.coordination_backend == "file":
+            backend = FileLeaseBackend(settings.coordination_path or ".sesame_leases.json")
+        return cls(backend, settings.replica_id, settings.lease_ttl, settings.replica_index, settings.replica_count)
+
+    def owns(self, account: str) -> bool:
+        return self._replica_count == 1 or shard_index(account, self._replica_count) == self._replica_index
+
+    def run(self, account: str, job_name: str, scheduled_at: Optional[datetime], func: Callable[[], Any]) -> Any:
+        if self._backend is None:
+            return func()
+
+        key = f"{account}:{job_name}:{(scheduled_at or datetime.now().astimezone()).isoformat()}"
+        if not self.owns(account):
+            return self._stand_by(key, func)
+        if not self._claim(key):
+            return self._skipped_result(key)
+        return self._run_claimed(key, func)
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[bool]:
+        if self._backend is None:
+            yield True
+            return
+        if not self._backend.acquire(key, self.replica_id, self._lease_ttl):
+            yield False
+            return
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(key, stop), name="lease-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            yield True
+        finally:
+            stop.set()
+            heartbeat.join()
+            try:
+                self._backend.complete(key, self.replica_id, "released")
+            except Exception as e:
+                self._logger.error(f"Could not release lease {key}: {e}")
+
+    def _run_claimed(self, key: str, func: Callable[[], Any]) -> Any:
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(key, stop), name="lease-heartbeat", daemon=True)
+        heartbeat.start()
+        status = "failed"
+        try:
+            result = func()
+            if isinstance(result, dict) and result.get("last_successful"):
+                status = "done"
+            return result
+        finally:
+            stop.set()
+            heartbeat.join()
+            try:
+                self._backend.complete(key, self.replica_id, status)
+            except Exception as e:
+                self._logger.error(f"Could not complete lease {key}: {e}")
+
+    def _stand_by(self, key: str, func: Callable[[], Any]) -> dict[str, Any]:
+        now = time.monotonic()
+        self._defer(key, func, now + self._lease_ttl, now + self._max_wait)
+        self._logger.info(f"{key} belongs to another replica, checking for a takeover in {self._lease_ttl:.0f}s")
+        return {
+            'last_successful': True,
+            'skipped': True,
+            'skip_reason': f"owned by another replica, takeover check in {self._lease_ttl:.0f}s",
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _defer(self, key: str, func: Callable[[], Any], due: float, deadline: float) -> None:
+        with self._standby_condition:
+            heapq.heappush(self._standby, (due, next(self._standby_sequence), key, func, deadline))
+            if self._standby_thread is None:
+                self._standby_thread = threading.Thread(target=self._watch_standby, name="lease-standby", daemon=True)
+                self._standby_thread.start()
+            self._standby_condition.notify()
+
+    def _watch_standby(self) -> None:
+        while True:
+            with self._standby_condition:
+                while not self._standby or self._standby[0][0] > time.monotonic():
+                    self._standby_condition.wait(self._standby[0][0] - time.monotonic() if self._standby else None)
+                _, _, key, func, deadline = heapq.heappop(self._standby)
+            self._check_takeover(key, func, deadline)
+
+    def _check_takeover(self, key: str, func: Callable[[], Any], deadline: float) -> None:
+        try:
+            if self._backend.acquire(key, self.replica_id, self._lease_ttl):
+                self._logger.warning(f"{key} was not claimed by its owning replica, taking over")
+                if self._takeover_executor is None:
+                    self._takeover_executor = ThreadPoolExecutor(thread_name_prefix="lease-takeover")
+                self._takeover_executor.submit(self._run_claimed, key, func)
+                return
+            lease = self._backend.get(key)
+        except Exception as e:
+            self._logger.error(f"Could not check lease {key} for a takeover: {e}")
+            return
+        if lease is None:
+            self._defer(key, func, time.monotonic() + 0.1, deadline)
+        elif lease["status"] != "done" and time.monotonic() < deadline:
+            self._defer(key, func, time.monotonic() + min(max(lease["expires_at"] - time.time(), 0.1), self._lease_ttl / 3), deadline)
+
+    def _claim(self, key: str) -> bool:
+        deadline = time.monotonic() + self._max_wait
+        waiting = False
+        while True:
+            if self._backend.acquire(key, self.replica_id, self._lease_ttl):
+                if waiting:
+                    self._logger.warning(f"Lease {key} expired, taking over from the previous holder")
+                return True
+            lease = self._backend.get(key)
+            if lease is None:
+                continue
+            if lease["status"] == "done" or time.monotonic() >= deadline:
+                return False
+            if not waiting:
+                self._logger.info(f"{key} is being run by replica {lease['holder']}, standing by")
+                waiting = True
+            time.sleep(min(max(lease["expires_at"] - time.time(), 0.1), self._lease_ttl / 3))
+
+    def _heartbeat(self, key: str, stop: threading.Event) -> None:
+        while not stop.wait(self._lease_ttl / 3):
+            try:
+                if not self._backend.renew(key, self.replica_id, self._lease_ttl):
+                    self._logger.warning(f"Lost lease {key} while the job was still running")
+                    return
+            except Exception as e:
+                self._logger.error(f"Could not renew lease {key}: {e}")
+
+    def _skipped_result(self, key: str) -> dict[str, Any]:
+        lease = self._backend.get(key) or {}
+        self._logger.info(f"Skipping {key}, already handled by replica {lease.get('holder')}")
+        return {
+            'last_successful': True,
+            'skipped': True,
+            'skip_reason': f"handled by replica {lease.get('holder')} ({lease.get('status')})",
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+_default_coordinator: Optional[JobCoordinator] = None
+_default_coordinator_lock = threading.Lock()
+
+
+def get_job_coordinator() -> JobCoordinator:
+    global _default_coordinator
+    with _default_coordinator_lock:
+        if _default_coordinator is None:
+            _default_coordinator = JobCoordinator.from_settings()
+        return _default_coordinator
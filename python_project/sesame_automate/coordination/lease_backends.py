@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+LEASE_RETENTION = 7 * 24 * 3600
+
+
+class SqliteLeaseBackend:
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "key TEXT PRIMARY KEY, "
+                "holder TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, "
+                "status TEXT NOT NULL, "
+                "updated_at REAL NOT NULL)"
+            )
+
+    def acquire(self, key: str, holder: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock, self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO leases (key, holder, expires_at, status, updated_at) VALUES (?, ?, ?, 'running', ?) "
+                "ON CONFLICT(key) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at, "
+                "status = 'running', updated_at = excluded.updated_at "
+                "WHERE leases.status != 'done' AND (leases.holder = excluded.holder OR leases.expires_at < excluded.updated_at)",
+                (key, holder, now + ttl, now)
+            )
+            return cursor.rowcount > 0
+
+    def renew(self, key: str, holder: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock, self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE leases SET expires_at = ?, updated_at = ? WHERE key = ? AND holder = ? AND status = 'running'",
+                (now + ttl, now, key, holder)
+            )
+            return cursor.rowcount > 0
+
+    def complete(self, key: str, holder: str, status: str) -> None:
+        now = time.time()
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "UPDATE leases SET status = ?, expires_at = ?, updated_at = ? WHERE key = ? AND holder = ?",
+                (status, now, now, key, holder)
+            )
+            connection.execute("DELETE FROM leases WHERE updated_at < ?", (now - LEASE_RETENTION,))
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock, self._connect() as connection:
+            row = connection.execute(
+                "SELECT holder, expires_at, status, updated_at FROM leases WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"holder": row[0], "expires_at": row[1], "status": row[2], "updated_at": row[3]}
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        directory = os.path.dirname(os.path.abspath(self._path))
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self._path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+class FileLeaseBackend:
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise ImportError("File leases need fcntl, which is not available on this platform. Use COORDINATION_BACKEND=sqlite instead.")
+        self._path = path
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+
+    def acquire(self, key: str, holder: str, ttl: float) -> bool:
+        now = time.time()
+        with self._locked() as leases:
+            lease = leases.get(key)
+            if lease and (lease["status"] == "done" or (lease["holder"] != holder and lease["expires_at"] >= now)):
+                return False
+            leases[key] = {"holder": holder, "expires_at": now + ttl, "status": "running", "updated_at": now}
+            return True
+
+    def renew(self, key: str, holder: str, ttl: float) -> bool:
+        now = time.time()
+        with self._locked() as leases:
+            lease = leases.get(key)
+            if not lease or lease["holder"] != holder or lease["status"] != "running":
+                return False
+            lease.update(expires_at=now + ttl, updated_at=now)
+            return True
+
+    def complete(self, key: str, holder: str, status: str) -> None:
+        now = time.time()
+        with self._locked() as leases:
+            lease = leases.get(key)
+            if lease and lease["holder"] == holder:
+                lease.update(status=status, expires_at=now, updated_at=now)
+            for stale in [k for k, v in leases.items() if v["updated_at"] < now - LEASE_RETENTION]:
+                del leases[stale]
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        with self._locked() as leases:
+            lease = leases.get(key)
+            return dict(lease) if lease else None
+
+    @contextmanager
+    def _locked(self) -> Iterator[dict[str, dict[str, Any]]]:
+        directory = os.path.dirname(os.path.abspath(self._path))
+        os.makedirs(directory, exist_ok=True)
+        with self._lock, open(self._path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                leases = self._read()
+                before = json.dumps(leases, sort_keys=True)
+                yield leases
+                if json.dumps(leases, sort_keys=True) != before:
+                    self._write(leases)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self._logger.warning(f"Ignoring unreadable lease file {self._path}: {e}")
+            return {}
+
+    def _write(self, leases: dict[str, dict[str, Any]]) -> None:
+        directory = os.path.dirname(os.path.abspath(self._path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".leases-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(leases, f)
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
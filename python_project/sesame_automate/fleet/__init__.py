@@ -0,0 +1,2 @@
+from sesame_automate.fleet.accounts_loader import load_accounts
+from sesame_automate.fleet.fleet import Fleet
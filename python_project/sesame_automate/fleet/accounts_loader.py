@@ -0,0 +1,29 @@
+import tomllib
+from typing import Any
+from sesame_automate.models.account import Account
+
+
+def load_accounts(path: str) -> list[Account]:
+    if path.endswith(".toml"):
+        with open(path, "rb") as f:
+            content = tomllib.load(f)
+    elif path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("PyYAML is not installed. Install it or use a TOML accounts file.")
+        with open(path, encoding="utf-8") as f:
+            content = yaml.safe_load(f) or {}
+    else:
+        raise ValueError(f"Unsupported accounts file '{path}', expected .toml, .yaml or .yml")
+
+    entries: list[dict[str, Any]] = content.get("accounts", []) if isinstance(content, dict) else content
+    accounts = [Account.from_dict(entry) for entry in entries]
+    if not accounts:
+        raise ValueError(f"No accounts found in '{path}'")
+
+    names = [account.name for account in accounts]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicated account names in '{path}': {', '.join(sorted(duplicates))}")
+    return accounts
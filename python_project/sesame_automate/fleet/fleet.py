@@ -0,0 +1,85 @@
+import functools
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Optional
+from sesame_automate.config.settings import get_settings
+from sesame_automate.coordination.job_coordinator import JobCoordinator, get_job_coordinator
+from sesame_automate.jobs.account_jobs import AccountJobs
+from sesame_automate.models.account import Account
+
+
+class Fleet:
+    def __init__(self, accounts: list[Account], max_workers: Optional[int] = None, coordinator: Optional[JobCoordinator] = None):
+        self.accounts = {account.name: AccountJobs(account) for account in accounts}
+        self._max_workers = max_workers or get_settings().fleet_max_workers
+        self._coordinator = coordinator or get_job_coordinator()
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="fleet")
+        self._logger = logging.getLogger(__name__)
+
+    def run(self, job_name: str, scheduled_at: Optional[datetime] = None) -> dict[str, Optional[dict[str, Any]]]:
+        started = time.perf_counter()
+        futures = {
+            name: self._executor.submit(self._run_account_job, name, job_name, scheduled_at)
+            for name in self.accounts
+        }
+        results = {name: future.result() for name, future in futures.items()}
+        failed = [name for name, result in results.items() if not result or not result.get("last_successful")]
+        elapsed = time.perf_counter() - started
+        self._logger.info(f"{job_name} finished for {len(results)} accounts in {elapsed:.2f}s, {len(failed)} failed")
+        if failed:
+            self._logger.warning(f"{job_name} failed for: {', '.join(failed)}")
+        return results
+
+    def submit(self, account_name: str, job_name: str, scheduled_at: Optional[datetime] = None) -> Future:
+        started = time.perf_counter()
+        future = self._executor.submit(self._run_account_job, account_name, job_name, scheduled_at)
+
+        def log_result(done: Future) -> None:
+            result = done.result() if not done.exception() else None
+            elapsed = time.perf_counter() - started
+            if not result or not result.get("last_successful"):
+                self._logger.warning(f"{job_name} failed for {account_name} after {elapsed:.2f}s")
+            else:
+                self._logger.info(f"{job_name} finished for {account_name} in {elapsed:.2f}s")
+
+        future.add_done_callback(log_result)
+        return future
+
+    def _run_account_job(self, account_name: str, job_name: str, scheduled_at: Optional[datetime]) -> Optional[dict[str, Any]]:
+        job = getattr(self.accounts[account_name], job_name)
+        if scheduled_at is None:
+            return job()
+        return self._coordinator.run(account_name, job_name, scheduled_at, functools.partial(job, scheduled_at=scheduled_at))
+
+    def deliver_outbox_event(self, event: dict[str, Any]) -> dict[str, Any]:
+        for jobs in self.accounts.values():
+            if jobs.account.email == event["account"]:
+                return jobs.deliver_outbox_event(event)
+        return {
+            'last_successful': False,
+            'error': f"Account {event['account']} is not part of the fleet",
+            'retryable': False
+        }
+
+    def welcome_job(self) -> dict[str, Optional[dict[str, Any]]]:
+        return self.run("welcome_job")
+
+    def calendar_job(self, scheduled_at: Optional[datetime] = None) -> dict[str, Optional[dict[str, Any]]]:
+        return self.run("calendar_job", scheduled_at)
+
+    def in_time_job(self, scheduled_at: Optional[datetime] = None) -> dict[str, Optional[dict[str, Any]]]:
+        return self.run("in_time_job", scheduled_at)
+
+    def out_time_job(self, scheduled_at: Optional[datetime] = None) -> dict[str, Optional[dict[str, Any]]]:
+        return self.run("out_time_job", scheduled_at)
+
+    def break_start_job(self, scheduled_at: Optional[datetime] = None) -> dict[str, Optional[dict[str, Any]]]:
+        return self.run("break_start_job", scheduled_at)
+
+    def break_finished_job(self, scheduled_at: Optional[datetime] = None) -> dict[str, Optional[dict[str, Any]]]:
+        return self.run("break_finished_job", scheduled_at)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,5 @@
+from sesame_automate.http_client.async_client import AsyncHttpPool, AsyncSesameClient, get_async_http_pool
+from sesame_automate.http_client.cassette import AsyncCassetteTransport, Cassette, CassetteAdapter, CassetteError, get_cassette, mount_cassette
+from sesame_automate.http_client.http_policy import CircuitBreaker, CircuitOpenError, HttpPolicy, get_http_policy, is_transient_error
+from sesame_automate.http_client.rate_limiter import TokenBucket
+from sesame_automate.http_client.session_refresher import AsyncSessionRefresher, AuthenticatedSession, SessionRefresher
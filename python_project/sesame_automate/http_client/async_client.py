@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import weakref
+from typing import Optional
+from sesame_automate.config.settings import get_settings
+from sesame_automate.http_client.cassette import AsyncCassetteTransport, get_cassette
+from sesame_automate.http_client.session_refresher import LOGIN_PATH, UNAUTHORIZED_STATUSES, AsyncSessionRefresher
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def _require_httpx() -> None:
+    if httpx is None:
+        raise ImportError("httpx is not installed. Install it with 'poetry install -E async' to use the async runnables.")
+
+
+class AsyncSesameClient(httpx.AsyncClient if httpx else object):
+    def __init__(self, refresher: Optional[AsyncSessionRefresher] = None, **kwargs):
+        _require_httpx()
+        super().__init__(**kwargs)
+        self.refresher = refresher
+
+    async def send(self, request: "httpx.Request", **kwargs) -> "httpx.Response":
+        refresher = self.refresher
+        generation = refresher.generation if refresher else 0
+        response = await super().send(request, **kwargs)
+        if response.status_code not in UNAUTHORIZED_STATUSES or refresher is None:
+            return response
+        if request.extensions.get("sesame_reauthenticated") or request.url.path.endswith(LOGIN_PATH):
+            return response
+
+        await response.aclose()
+        await refresher.refresh(generation)
+        request.headers.pop("Cookie", None)
+        self.cookies.set_cookie_header(request)
+        request.extensions["sesame_reauthenticated"] = True
+        return await super().send(request, **kwargs)
+
+
+class AsyncHttpPool:
+    def __init__(self, max_connections: Optional[int] = None, max_keepalive_connections: Optional[int] = None):
+        _require_httpx()
+        self._limits = httpx.Limits(
+            max_connections=max_connections or get_settings().async_max_connections,
+            max_keepalive_connections=max_keepalive_connections or get_settings().async_max_keepalive_connections
+        )
+        self._transports: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, "httpx.AsyncBaseTransport"] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def client(self, refresher: Optional[AsyncSessionRefresher] = None) -> AsyncSesameClient:
+        return AsyncSesameClient(refresher=refresher, transport=self._transport())
+
+    async def aclose(self) -> None:
+        with self._lock:
+            transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+    def _transport(self) -> "httpx.AsyncBaseTransport":
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                transport = httpx.AsyncHTTPTransport(limits=self._limits)
+                cassette = get_cassette()
+                if cassette is not None:
+                    transport = AsyncCassetteTransport(cassette, transport)
+                self._transports[loop] = transport
+            return transport
+
+
+_default_pool: Optional[AsyncHttpPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_async_http_pool() -> AsyncHttpPool:
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = AsyncHttpPool()
+        return _default_pool
@@ -0,0 +1,289 @@
+import atexit
+import base64
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from sesame_automate.config.settings import get_settings
+from sesame_automate.http_client.session_refresher import LOGIN_PATH
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+CASSETTE_VERSION = 1
+SCRUBBED = "<scrubbed>"
+SCRUBBED_USID = "scrubbed-usid"
+SECRET_HEADERS = ("authorization", "proxy-authorization", "cookie", "set-cookie")
+SECRET_FIELDS = ("password", "usid", "token")
+DROPPED_RESPONSE_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "connection")
+
+
+class CassetteError(Exception):
+    pass
+
+
+def interaction_key(method: str, url: str) -> str:
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {parts.path}" + (f"?{query}" if query else "")
+
+
+def _encode_body(body: Any) -> dict[str, Any]:
+    if body is None or body == b"" or body == "":
+        return {}
+    if isinstance(body, str):
+        return {"body": body}
+    try:
+        return {"body": bytes(body).decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_base64": base64.b64encode(bytes(body)).decode("ascii")}
+
+
+def _decode_body(entry: dict[str, Any]) -> bytes:
+    if "body_base64" in entry:
+        return base64.b64decode(entry["body_base64"])
+    return entry.get("body", "").encode("utf-8")
+
+
+class Cassette:
+    def __init__(self, path: Optional[str] = None, mode: Optional[str] = None):
+        self.path = path or get_settings().http_cassette_path
+        self.mode = mode or get_settings().http_cassette
+        self._interactions: list[dict[str, Any]] = []
+        self._recorded: dict[str, list[dict[str, Any]]] = {}
+        self._cursors: dict[str, int] = {}
+        self._secrets: set[str] = set()
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+        if self.mode == "replay":
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._interactions)
+
+    def play(self, method: str, url: str) -> dict[str, Any]:
+        key = interaction_key(method, url)
+        with self._lock:
+            responses = self._recorded.get(key)
+            if not responses:
+                raise CassetteError(f"No recorded response for {key} in {self.path}")
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+        return responses[cursor % len(responses)]
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        request_headers: dict[str, str],
+        request_body: Any,
+        status: int,
+        reason: Optional[str],
+        response_headers: dict[str, str],
+        response_body: bytes
+    ) -> None:
+        key = interaction_key(method, url)
+        interaction = {
+            "request": {
+                "method": method.upper(),
+                "url": url,
+                "key": key,
+                "headers": self._scrub_headers(request_headers),
+                **_encode_body(self._scrub_body(request_body))
+            },
+            "response": {
+                "status": status,
+                "reason": reason,
+                "headers": self._scrub_headers(
+                    {name: value for name, value in response_headers.items() if name.lower() not in DROPPED_RESPONSE_HEADERS}
+                ),
+                **_encode_body(self._scrub_body(response_body, login=key.split("?")[0].endswith(LOGIN_PATH)))
+            }
+        }
+        with self._lock:
+            self._interactions.append(interaction)
+            self._recorded.setdefault(key, []).append(interaction["response"])
+
+    def save(self) -> None:
+        with self._lock:
+            content = json.dumps({"version": CASSETTE_VERSION, "interactions": self._interactions}, indent=1)
+            secrets = sorted(self._secrets, key=len, reverse=True)
+        for secret in secrets:
+            content = content.replace(secret, SCRUBBED)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".cassette-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                encoded = content.encode("utf-8")
+                f.write(gzip.compress(encoded) if self.path.endswith(".gz") else encoded)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._logger.info(f"Recorded {len(self._interactions)} HTTP interactions to {self.path}")
+
+    def _load(self) -> None:
+        try:
+            opener = gzip.open if self.path.endswith(".gz") else open
+            with opener(self.path, "rt", encoding="utf-8") as f:
+                content = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CassetteError(f"Cannot replay cassette {self.path}: {e}") from e
+        if content.get("version") != CASSETTE_VERSION:
+            raise CassetteError(f"Unsupported cassette version {content.get('version')} in {self.path}")
+        self._interactions = content.get("interactions", [])
+        for interaction in self._interactions:
+            self._recorded.setdefault(interaction["request"]["key"], []).append(interaction["response"])
+
+    def _scrub_headers(self, headers: dict[str, str]) -> dict[str, str]:
+        scrubbed = {}
+        for name, value in headers.items():
+            if name.lower() in SECRET_HEADERS:
+                self._remember_cookie_values(value)
+                value = SCRUBBED
+            scrubbed[name] = value
+        return scrubbed
+
+    def _remember_cookie_values(self, header: str) -> None:
+        for part in header.replace(",", ";").split(";"):
+            _, separator, value = part.partition("=")
+            if separator and len(value.strip()) >= 8:
+                with self._lock:
+                    self._secrets.add(value.strip())
+
+    def _scrub_body(self, body: Any, login: bool = False) -> Any:
+        if not body:
+            return body
+        try:
+            content = json.loads(body)
+        except (TypeError, ValueError):
+            return body
+        if login and isinstance(content, dict) and isinstance(content.get("data"), str):
+            with self._lock:
+                self._secrets.add(content["data"])
+            content["data"] = SCRUBBED_USID
+        return json.dumps(self._scrub_fields(content))
+
+    def _scrub_fields(self, content: Any) -> Any:
+        if isinstance(content, dict):
+            scrubbed = {}
+            for name, value in content.items():
+                if name.lower() in SECRET_FIELDS and isinstance(value, str):
+                    with self._lock:
+                        self._secrets.add(value)
+                    value = SCRUBBED
+                scrubbed[name] = self._scrub_fields(value)
+            return scrubbed
+        if isinstance(content, list):
+            return [self._scrub_fields(value) for value in content]
+        return content
+
+
+class CassetteAdapter(HTTPAdapter):
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.cassette.mode == "replay":
+            return self._replayed_response(request, self.cassette.play(request.method, request.url))
+
+        response = super().send(request, **kwargs)
+        self.cassette.record(
+            request.method,
+            request.url,
+            dict(request.headers),
+            request.body,
+            response.status_code,
+            response.reason,
+            dict(response.headers),
+            response.content
+        )
+        return response
+
+    def _replayed_response(self, request: requests.PreparedRequest, recorded: dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded.get("reason")
+        response.headers = CaseInsensitiveDict(recorded.get("headers", {}))
+        response._content = _decode_body(recorded)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport if httpx else object):
+    def __init__(self, cassette: Cassette, transport: Optional["httpx.AsyncBaseTransport"] = None):
+        self.cassette = cassette
+        self._transport = transport
+
+    async def handle_async_request(self, request: "httpx.Request") -> "httpx.Response":
+        if self.cassette.mode == "replay":
+            recorded = self.cassette.play(request.method, str(request.url))
+            return httpx.Response(
+                recorded["status"],
+                headers=recorded.get("headers", {}),
+                content=_decode_body(recorded),
+                request=request
+            )
+
+        response = await self._transport.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in DROPPED_RESPONSE_HEADERS}
+        self.cassette.record(
+            request.method,
+            str(request.url),
+            dict(request.headers),
+            request.content,
+            response.status_code,
+            response.reason_phrase,
+            headers,
+            content
+        )
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self) -> None:
+        if self._transport is not None:
+            await self._transport.aclose()
+
+
+def mount_cassette(session: requests.Session) -> requests.Session:
+    cassette = get_cassette()
+    if cassette is not None:
+        adapter = CassetteAdapter(cassette)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+    return session
+
+
+_default_cassette: Optional[Cassette] = None
+_default_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    global _default_cassette
+    if get_settings().http_cassette == "off":
+        return None
+    with _default_cassette_lock:
+        if _default_cassette is None:
+            _default_cassette = Cassette()
+            if _default_cassette.mode == "record":
+                atexit.register(_default_cassette.save)
+        return _default_cassette
@@ -0,0 +1,319 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from typing import Any, Optional
+from urllib.parse import urlsplit
+import requests
+from urllib3.exceptions import NewConnectionError
+from sesame_automate.config.settings import Settings, get_settings
+from sesame_automate.http_client.rate_limiter import TokenBucket
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# Statuses where the server did not process the request, so even a POST can be sent again
+UNPROCESSED_STATUSES = {429, 503}
+
+# Origins whose concurrency slot the current thread or task already holds. The login replayed by a
+# session refresher on a 401/403 runs inside the rejected request, so it must not wait for a second slot.
+_held_origins: ContextVar[frozenset[str]] = ContextVar("sesame_http_held_origins", default=frozenset())
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+def is_transient_error(error: Exception) -> bool:
+    if isinstance(error, CircuitOpenError):
+        return True
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUSES
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if httpx is not None:
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in RETRYABLE_STATUSES
+        if isinstance(error, httpx.TransportError):
+            return True
+    return False
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.state = self.CLOSED
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self._reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class HttpPolicy:
+    def __init__(
+        self,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 15.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        rate_limit: Optional[float] = None,
+        rate_burst: float = 1.0,
+        max_concurrency: Optional[int] = None
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._rate_limit = rate_limit
+        self._rate_burst = rate_burst
+        self._max_concurrency = max_concurrency
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._buckets: dict[str, TokenBucket] = {}
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._async_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]] = weakref.WeakKeyDictionary()
+        self._breakers_lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Settings] = None) -> "HttpPolicy":
+        settings = settings or get_settings()
+        return cls(
+            connect_timeout=settings.http_connect_timeout,
+            read_timeout=settings.http_read_timeout,
+            max_retries=settings.http_max_retries,
+            backoff_base=settings.http_backoff_base,
+            backoff_max=settings.http_backoff_max,
+            failure_threshold=settings.circuit_failure_threshold,
+            reset_timeout=settings.circuit_reset_timeout,
+            rate_limit=settings.http_rate_limit,
+            rate_burst=settings.http_rate_burst,
+            max_concurrency=settings.http_max_concurrency
+        )
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        origin = self._origin(url)
+        with self._breakers_lock:
+            breaker = self._breakers.get(origin)
+            if breaker is None:
+                breaker = self._breakers[origin] = CircuitBreaker(self._failure_threshold, self._reset_timeout)
+            return breaker
+
+    def bucket(self, url: str) -> Optional[TokenBucket]:
+        if not self._rate_limit:
+            return None
+        origin = self._origin(url)
+        with self._breakers_lock:
+            bucket = self._buckets.get(origin)
+            if bucket is None:
+                bucket = self._buckets[origin] = TokenBucket(self._rate_limit, self._rate_burst)
+            return bucket
+
+    def semaphore(self, url: str) -> Optional[threading.BoundedSemaphore]:
+        if not self._max_concurrency:
+            return None
+        origin = self._origin(url)
+        with self._breakers_lock:
+            semaphore = self._semaphores.get(origin)
+            if semaphore is None:
+                semaphore = self._semaphores[origin] = threading.BoundedSemaphore(self._max_concurrency)
+            return semaphore
+
+    def asemaphore(self, url: str) -> Optional[asyncio.Semaphore]:
+        if not self._max_concurrency:
+            return None
+        origin = self._origin(url)
+        loop = asyncio.get_running_loop()
+        with self._breakers_lock:
+            semaphores = self._async_semaphores.setdefault(loop, {})
+            semaphore = semaphores.get(origin)
+            if semaphore is None:
+                semaphore = semaphores[origin] = asyncio.Semaphore(self._max_concurrency)
+            return semaphore
+
+    def _origin(self, url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def request(self, session: requests.Session, method: str, url: str, idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        idempotent = method.upper() in IDEMPOTENT_METHODS if idempotent is None else idempotent
+        kwargs.setdefault("timeout", (self.connect_timeout, self.read_timeout))
+        breaker = self.breaker(url)
+        bucket = self.bucket(url)
+        semaphore = self.semaphore(url)
+
+        for attempt in range(self.max_retries + 1):
+            self._check_circuit(breaker, url)
+            if bucket:
+                bucket.acquire()
+            try:
+                response = self._send(session, method, url, semaphore, **kwargs)
+            except requests.RequestException as e:
+                breaker.record_failure()
+                if attempt >= self.max_retries or not self._retryable_error(e, idempotent):
+                    raise
+                delay = self._backoff(attempt)
+                self._logger.warning(f"{method} {url} failed ({e.__class__.__name__}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            except BaseException:
+                breaker.release_trial()
+                raise
+
+            self._record_status(breaker, response.status_code)
+            if attempt >= self.max_retries or not self._retryable_status(response.status_code, idempotent):
+                return response
+            delay = self._backoff(attempt, response.headers.get("Retry-After"))
+            self._logger.warning(f"{method} {url} answered {response.status_code}, retrying in {delay:.2f}s")
+            response.close()
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def arequest(self, session: Any, method: str, url: str, idempotent: Optional[bool] = None, **kwargs) -> Any:
+        idempotent = method.upper() in IDEMPOTENT_METHODS if idempotent is None else idempotent
+        kwargs.setdefault("timeout", httpx.Timeout(self.read_timeout, connect=self.connect_timeout))
+        breaker = self.breaker(url)
+        bucket = self.bucket(url)
+        semaphore = self.asemaphore(url)
+
+        for attempt in range(self.max_retries + 1):
+            self._check_circuit(breaker, url)
+            if bucket:
+                await bucket.aacquire()
+            try:
+                response = await self._asend(session, method, url, semaphore, **kwargs)
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                if attempt >= self.max_retries or not self._aretryable_error(e, idempotent):
+                    raise
+                delay = self._backoff(attempt)
+                self._logger.warning(f"{method} {url} failed ({e.__class__.__name__}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                breaker.release_trial()
+                raise
+
+            self._record_status(breaker, response.status_code)
+            if attempt >= self.max_retries or not self._retryable_status(response.status_code, idempotent):
+                return response
+            delay = self._backoff(attempt, response.headers.get("Retry-After"))
+            self._logger.warning(f"{method} {url} answered {response.status_code}, retrying in {delay:.2f}s")
+            await response.aclose()
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def _send(self, session: requests.Session, method: str, url: str, semaphore: Optional[threading.BoundedSemaphore], **kwargs) -> requests.Response:
+        origin = self._origin(url)
+        if semaphore is None or origin in _held_origins.get():
+            return session.request(method, url, **kwargs)
+        with semaphore:
+            token = _held_origins.set(_held_origins.get() | {origin})
+            try:
+                return session.request(method, url, **kwargs)
+            finally:
+                _held_origins.reset(token)
+
+    async def _asend(self, session: Any, method: str, url: str, semaphore: Optional[asyncio.Semaphore], **kwargs) -> Any:
+        origin = self._origin(url)
+        if semaphore is None or origin in _held_origins.get():
+            return await session.request(method, url, **kwargs)
+        async with semaphore:
+            token = _held_origins.set(_held_origins.get() | {origin})
+            try:
+                return await session.request(method, url, **kwargs)
+            finally:
+                _held_origins.reset(token)
+
+    def _check_circuit(self, breaker: CircuitBreaker, url: str) -> None:
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {url}, backend considered unavailable")
+
+    def _record_status(self, breaker: CircuitBreaker, status: int) -> None:
+        if status >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def _retryable_status(self, status: int, idempotent: bool) -> bool:
+        return status in (RETRYABLE_STATUSES if idempotent else UNPROCESSED_STATUSES)
+
+    def _retryable_error(self, error: requests.RequestException, idempotent: bool) -> bool:
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+            if isinstance(getattr(error.args[0], "reason", None), NewConnectionError):
+                return True
+        return idempotent and isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+    def _aretryable_error(self, error: Exception, idempotent: bool) -> bool:
+        if isinstance(error, (httpx.ConnectTimeout, httpx.ConnectError)):
+            return True
+        return idempotent
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+_default_policy: Optional[HttpPolicy] = None
+_default_policy_lock = threading.Lock()
+
+
+def get_http_policy() -> HttpPolicy:
+    global _default_policy
+    with _default_policy_lock:
+        if _default_policy is None:
+            _default_policy = HttpPolicy.from_settings()
+        return _default_policy
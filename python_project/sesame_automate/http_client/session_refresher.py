@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Awaitable, Callable, Optional
+import requests
+
+UNAUTHORIZED_STATUSES = (401, 403)
+LOGIN_PATH = "/security/login"
+
+
+class SessionRefresher:
+    def __init__(self, refresh: Callable[[], None]):
+        self._refresh = refresh
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def refresh(self, seen_generation: int) -> int:
+        with self._lock:
+            if self._generation != seen_generation:
+                self._logger.debug("Session already refreshed by a concurrent request, replaying")
+                return self._generation
+            self._refresh()
+            self._generation += 1
+            return self._generation
+
+
+class AsyncSessionRefresher:
+    def __init__(self, refresh: Callable[[], Awaitable[None]]):
+        self._refresh = refresh
+        self._locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = weakref.WeakKeyDictionary()
+        self._locks_lock = threading.Lock()
+        self._generation = 0
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    async def refresh(self, seen_generation: int) -> int:
+        with self._locks_lock:
+            lock = self._locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+        async with lock:
+            if self._generation != seen_generation:
+                self._logger.debug("Session already refreshed by a concurrent request, replaying")
+                return self._generation
+            await self._refresh()
+            self._generation += 1
+            return self._generation
+
+
+class AuthenticatedSession(requests.Session):
+    def __init__(self, refresher: Optional[SessionRefresher] = None):
+        super().__init__()
+        self.refresher = refresher
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        refresher = self.refresher
+        generation = refresher.generation if refresher else 0
+        response = super().send(request, **kwargs)
+        if refresher is None or response.status_code not in UNAUTHORIZED_STATUSES:
+            return response
+        if getattr(request, '_reauthenticated', False) or request.path_url.split("?")[0].endswith(LOGIN_PATH):
+            return response
+
+        response.close()
+        refresher.refresh(generation)
+        retry_request = request.copy()
+        retry_request.headers.pop('Cookie', None)
+        retry_request.prepare_cookies(self.cookies)
+        retry_request._reauthenticated = True
+        return super().send(retry_request, **kwargs)
@@ -0,0 +1 @@
+from sesame_automate.jobs.account_jobs import AccountJobs
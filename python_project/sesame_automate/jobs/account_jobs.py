@@ -0,0 +1,207 @@
+import functools
+import logging
+import time
+from contextvars import ContextVar
+from datetime import date, datetime
+from typing import Any, Callable, Optional
+from sesame_automate.config.settings import get_settings
+from sesame_automate.logging_pipeline.log_context import log_context
+from sesame_automate.models.account import Account
+from sesame_automate.models.day_plan import DayPlan
+from sesame_automate.models.enums.state import State
+from sesame_automate.models.runnable_graph import RunnableGraph
+from sesame_automate.models.runnable_parallel import RunnableParallel
+from sesame_automate.runnables import *
+from sesame_automate.scheduling.working_calendar import get_working_calendar
+from sesame_automate.status.job_history import get_job_history
+
+
+_scheduled_at: ContextVar[Optional[datetime]] = ContextVar("sesame_scheduled_at", default=None)
+
+
+def _job(job_name: str) -> Callable:
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self: "AccountJobs", *args, scheduled_at: Optional[datetime] = None, **kwargs):
+            with log_context(account=self.account.name, job=job_name), \
+                    get_job_history().track(self.account.name, job_name) as run:
+                started = time.perf_counter()
+                token = _scheduled_at.set(scheduled_at)
+                try:
+                    result = method(self, *args, **kwargs)
+                    run.finish(result)
+                    return result
+                finally:
+                    _scheduled_at.reset(token)
+                    duration = time.perf_counter() - started
+                    self._logger.info(f"[{self.account.name}] {job_name} finished in {duration:.3f}s", extra={'duration': duration})
+        return wrapper
+    return decorator
+
+
+class AccountJobs:
+    def __init__(self, account: Account):
+        self.account = account
+        self._login = SesameTimeLoginRunnable(email=account.email, password=account.password)
+        self._me = SesameTimeMeInfoRunnable()
+        self._work_break = SesameTimeWorkBreakRunnable(break_name=account.break_name)
+        self._assigned_work_check_types = SesameTimeAssignedWorkCheckTypesRunnable()
+        self._check_status = SesameTimeCheckStatusRunnable()
+        self._check_in = SesameTimeCheckInRunnable(remote_work_days=account.remote_work_days)
+        self._check_out = SesameTimeCheckOutRunnable(remote_work_days=account.remote_work_days)
+        self._day_plan = SesameTimeDayPlanRunnable(self._assigned_work_check_types, self._work_break, remote_work_days=account.remote_work_days)
+        self._working_calendar = get_working_calendar()
+        self._calendar = SesameTimeCalendarRunnable(account.name, calendar=self._working_calendar)
+        self._calendar_source = get_settings().calendar_source
+        self._outbox_delivery = SesameTimeOutboxDeliveryRunnable()
+        self._logger = logging.getLogger(__name__)
+
+    @_job("welcome_job")
+    def welcome_job(self) -> dict[str, Any]:
+        runnable = (
+            RunnableGraph()
+            .add("login", self._login)
+            .add("me", self._me, depends_on=["login"])
+            .add("work_break", self._work_break, depends_on=["me"])
+            .add("assigned_work_check_types", self._assigned_work_check_types, depends_on=["me"])
+            .add("day_plan", self._day_plan, depends_on=["work_break", "assigned_work_check_types"])
+        )
+        if self._calendar_source == "api":
+            runnable.add("calendar", self._calendar, depends_on=["me"])
+        result = runnable.invoke({
+            "is_welcome": True
+        })
+        self._logger.info(f"[{self.account.name}] Welcome critical path: {' -> '.join(result['critical_path'])} ({result['critical_path_duration']:.3f}s)")
+        return result
+
+    @_job("calendar_job")
+    def calendar_job(self) -> Optional[dict[str, Any]]:
+        if self._calendar_source != "api":
+            return None
+        try:
+            self._logger.info(f"[{self.account.name}] Executing Calendar Job")
+            runnable = self._login | self._me | self._calendar
+            return runnable.invoke()
+        except Exception as e:
+            self._logger.error(f"[{self.account.name}] Error during Calendar Job: {e}", exc_info=True)
+            return None
+
+    @_job("plan_job")
+    def plan_job(self, day: Optional[date] = None) -> Optional[dict[str, Any]]:
+        try:
+            runnable = self._login | self._me | RunnableParallel(self._assigned_work_check_types, self._work_break)
+            result = runnable.invoke()
+            if not result.get('last_successful'):
+                return result
+            plan = DayPlan.build(
+                result.get('account'),
+                result.get("user_info", {}).get("user_id"),
+                result.get("check_types", []),
+                result.get("work_break_id"),
+                self.account.remote_work_days,
+                day
+            )
+            return {
+                'last_successful': True,
+                'day_plan': plan.to_dict(),
+                'day_off': self._working_calendar.day_off_reason(self.account.name, plan.day),
+                'timestamp': datetime.now().isoformat()
+            }
+        except Exception as e:
+            self._logger.error(f"[{self.account.name}] Error during Plan Job: {e}", exc_info=True)
+            return None
+
+    def _day_off_result(self, job_name: str) -> Optional[dict[str, Any]]:
+        scheduled_at = _scheduled_at.get()
+        day = scheduled_at.date() if scheduled_at else date.today()
+        reason = self._working_calendar.day_off_reason(self.account.name, day)
+        if reason is None:
+            return None
+        self._logger.info(f"[{self.account.name}] Skipping {job_name}, {day.isoformat()} is a day off ({reason})")
+        return {
+            'last_successful': True,
+            'skipped': True,
+            'skip_reason': f'day off: {reason}',
+            'timestamp': datetime.now().isoformat()
+        }
+
+    @_job("in_time_job")
+    def in_time_job(self) -> Optional[dict[str, Any]]:
+        day_off = self._day_off_result("Check In Job")
+        if day_off:
+            return day_off
+        try:
+            self._logger.info(f"[{self.account.name}] Executing Check In Job")
+            current_state = State.WORKING
+            runnable = self._login | self._me | self._check_status | self._day_plan | self._check_in
+            result = runnable.invoke({
+                "current_state": current_state,
+                "scheduled_at": _scheduled_at.get()
+            })
+            return result
+        except Exception as e:
+            self._logger.error(f"[{self.account.name}] Error during Check In Job: {e}", exc_info=True)
+            return None
+
+    @_job("out_time_job")
+    def out_time_job(self) -> Optional[dict[str, Any]]:
+        day_off = self._day_off_result("Check Out Job")
+        if day_off:
+            return day_off
+        try:
+            self._logger.info(f"[{self.account.name}] Executing Check Out Job")
+            current_state = State.WORKING
+            runnable = self._login | self._me | self._check_status | self._day_plan | self._check_out
+            result = runnable.invoke({
+                "current_state": current_state,
+                "scheduled_at": _scheduled_at.get()
+            })
+            return result
+        except Exception as e:
+            self._logger.error(f"[{self.account.name}] Error during Check Out Job: {e}", exc_info=True)
+            return None
+
+    @_job("break_start_job")
+    def break_start_job(self) -> Optional[dict[str, Any]]:
+        day_off = self._day_off_result("Break Start Job")
+        if day_off:
+            return day_off
+        try:
+            self._logger.info(f"[{self.account.name}] Executing Break Start Job")
+            runnable = (
+                self._login
+                | self._me
+                | RunnableParallel(self._check_status, self._day_plan)
+                | SesameTimeBreakTransitionRunnable(self._check_out, self._check_in, State.WORKING, State.BREAK)
+            )
+            result = runnable.invoke({"scheduled_at": _scheduled_at.get()})
+            return result
+        except Exception as e:
+            self._logger.error(f"[{self.account.name}] Error during Break Start Job: {e}", exc_info=True)
+            return None
+
+    @_job("break_finished_job")
+    def break_finished_job(self) -> Optional[dict[str, Any]]:
+        day_off = self._day_off_result("Break Finished Job")
+        if day_off:
+            return day_off
+        try:
+            self._logger.info(f"[{self.account.name}] Executing Break Finished Job")
+            runnable = (
+                self._login
+                | self._me
+                | RunnableParallel(self._check_status, self._day_plan)
+                | SesameTimeBreakTransitionRunnable(self._check_out, self._check_in, State.BREAK, State.WORKING)
+            )
+            result = runnable.invoke({"scheduled_at": _scheduled_at.get()})
+            return result
+        except Exception as e:
+            self._logger.error(f"[{self.account.name}] Error during Break Finished Job: {e}", exc_info=True)
+            return None
+
+    @_job("deliver_outbox_event")
+    def deliver_outbox_event(self, event: dict[str, Any]) -> dict[str, Any]:
+        runnable = self._login | self._me | self._check_status | self._outbox_delivery
+        return runnable.invoke({
+            "outbox_event": event
+        })
@@ -0,0 +1,3 @@
+from sesame_automate.logging_pipeline.json_formatter import JsonLinesFormatter
+from sesame_automate.logging_pipeline.log_context import ContextFilter, LogContextHook, bind, current_context, log_context
+from sesame_automate.logging_pipeline.logging_pipeline import LoggingPipeline, gzip_namer, gzip_rotator, setup_logging, shutdown_logging
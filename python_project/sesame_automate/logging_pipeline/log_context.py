@@ -0,0 +1,59 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Iterator, Optional
+from sesame_automate.models.runnable_sequence import Runnable, RunnableHook
+
+CONTEXT_FIELDS = ("account", "job", "step", "trace_id")
+
+_context: ContextVar[dict[str, Any]] = ContextVar("sesame_log_context", default={})
+
+
+def current_context() -> dict[str, Any]:
+    return _context.get()
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    token = bind(**fields)
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def bind(**fields: Any) -> Token:
+    return _context.set({**_context.get(), **{key: value for key, value in fields.items() if value is not None}})
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field))
+        return True
+
+
+class LogContextHook(RunnableHook):
+    def __init__(self):
+        self._logger = logging.getLogger(__name__)
+
+    def before_step(self, step: Runnable, data: dict[str, Any], context: dict[str, Any]) -> None:
+        context['log_context_token'] = bind(step=context['step'], trace_id=context['trace_id'])
+
+    def after_step(self, step: Runnable, data: dict[str, Any], step_result: Any, duration: float, context: dict[str, Any]) -> None:
+        self._logger.debug(f"Step {context['step']} finished in {duration * 1000:.1f}ms", extra={'duration': duration})
+        self._reset(context)
+
+    def on_error(self, step: Runnable, data: dict[str, Any], error: Exception, duration: float, context: dict[str, Any]) -> None:
+        self._reset(context)
+
+    def _reset(self, context: dict[str, Any]) -> None:
+        token: Optional[Token] = context.pop('log_context_token', None)
+        if token is None:
+            return
+        try:
+            _context.reset(token)
+        except ValueError:
+            pass
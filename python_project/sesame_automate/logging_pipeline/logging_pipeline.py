@@ -0,0 +1,130 @@
+import copy
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+from typing import Optional
+from sesame_automate.config.settings import Settings, SettingsError, get_settings
+from sesame_automate.logging_pipeline.json_formatter import JsonLinesFormatter
+from sesame_automate.logging_pipeline.log_context import ContextFilter
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def gzip_namer(name: str) -> str:
+    return name + ".gz"
+
+
+def gzip_rotator(source: str, dest: str) -> None:
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class LoggingPipeline:
+    def __init__(self, settings: Settings):
+        self._settings = settings
+        self._queue: queue.Queue = queue.Queue(settings.log_queue_size)
+        self.queue_handler = DroppingQueueHandler(self._queue)
+        self.queue_handler.addFilter(ContextFilter())
+        self._listener = logging.handlers.QueueListener(self._queue, *self._handlers(), respect_handler_level=True)
+        self._started = False
+
+    def start(self) -> None:
+        root = logging.getLogger()
+        root.setLevel(self._settings.log_level.upper())
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.queue_handler)
+        self._listener.start()
+        self._started = True
+
+    def stop(self) -> None:
+        if not self._started:
+            return
+        self._started = False
+        logging.getLogger().removeHandler(self.queue_handler)
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        if self.queue_handler.dropped:
+            logging.getLogger(__name__).warning(f"{self.queue_handler.dropped} log records were dropped because the log queue was full")
+
+    def _handlers(self) -> list[logging.Handler]:
+        formatter = JsonLinesFormatter() if self._settings.log_format == "json" else logging.Formatter(TEXT_FORMAT)
+        handlers: list[logging.Handler] = [logging.StreamHandler()]
+        if self._settings.log_dir:
+            handlers.append(self._file_handler())
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        return handlers
+
+    def _file_handler(self) -> logging.Handler:
+        settings = self._settings
+        os.makedirs(settings.log_dir, exist_ok=True)
+        extension = "jsonl" if settings.log_format == "json" else "log"
+        path = os.path.join(settings.log_dir, f"sesame_automate.{extension}")
+        if settings.log_rotation == "time":
+            handler = logging.handlers.TimedRotatingFileHandler(
+                path, when=settings.log_rotation_when, backupCount=settings.log_backup_count, encoding="utf-8"
+            )
+        else:
+            handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=settings.log_max_bytes, backupCount=settings.log_backup_count, encoding="utf-8"
+            )
+        if settings.log_compress:
+            handler.namer = gzip_namer
+            handler.rotator = gzip_rotator
+        return handler
+
+
+_default_pipeline: Optional[LoggingPipeline] = None
+_default_pipeline_lock = threading.Lock()
+
+
+def setup_logging(settings: Optional[Settings] = None) -> LoggingPipeline:
+    global _default_pipeline
+    if settings is None:
+        try:
+            settings = get_settings()
+        except SettingsError:
+            settings = Settings()
+    with _default_pipeline_lock:
+        if _default_pipeline is not None:
+            _default_pipeline.stop()
+        _default_pipeline = LoggingPipeline(settings)
+        _default_pipeline.start()
+        return _default_pipeline
+
+
+def shutdown_logging() -> None:
+    global _default_pipeline
+    with _default_pipeline_lock:
+        if _default_pipeline is not None:
+            _default_pipeline.stop()
+            _default_pipeline = None
@@ -1,163 +1,296 @@
-import os
-import traceback
+import atexit
+import functools
 import logging
-from apscheduler.schedulers.blocking import BlockingScheduler
-from apscheduler.triggers.cron import CronTrigger
-from sesame_automate.models.enums.state import State
-from sesame_automate.runnables import *
+import threading
+from typing import TYPE_CHECKING, Any, Optional
+from sesame_automate.config import get_settings
+
+if TYPE_CHECKING:
+    from apscheduler.schedulers.blocking import BlockingScheduler
+    from sesame_automate.config import Settings
+    from sesame_automate.fleet import Fleet
+    from sesame_automate.jobs import AccountJobs
 
 def setup_logging():
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    
-    logs_dir = 'logs'
-    if not os.path.exists(logs_dir):
-        os.makedirs(logs_dir)
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format=log_format,
-        handlers=[
-            logging.FileHandler(f'{logs_dir}/sesame_automate.log', encoding='utf-8'),
-            logging.StreamHandler()
-        ]
-    )
-    
-    return logging.getLogger('SesameAutomate')
+    from sesame_automate.logging_pipeline import setup_logging as setup_logging_pipeline, shutdown_logging
 
-logger = setup_logging()
+    pipeline = setup_logging_pipeline()
+    atexit.register(shutdown_logging)
+    return pipeline
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-    logger.info("Environment variables loaded from .env file")
-except ImportError:
-    logger.warning("python-dotenv not installed. Make sure to set environment variables manually.")
+logger = logging.getLogger('SesameAutomate')
 
-current_state: State = State.UNKNOWN
+def load_environment() -> bool:
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+        return True
+    except ImportError:
+        return False
 
-def main():
-    login = SesameTimeLoginRunnable()
-    me = SesameTimeMeInfoRunnable()
-    work_break = SesameTimeWorkBreakRunnable()
-    assigned_work_check_types = SesameTimeAssignedWorkCheckTypesRunnable()
-    check_in = SesameTimeCheckInRunnable()
-    check_out = SesameTimeCheckOutRunnable()
+_runtime: "AccountJobs | Fleet | None" = None
+
+def run_scheduled_job(job_name: str, cron: Optional[str] = None):
+    from sesame_automate.coordination import get_job_coordinator, scheduled_slot
+    from sesame_automate.fleet import Fleet
+
+    trigger = get_settings().cron_triggers.get(cron) if cron else None
+    scheduled_at = scheduled_slot(trigger) if trigger else None
+    if isinstance(_runtime, Fleet):
+        return _runtime.run(job_name, scheduled_at)
+    job = getattr(_runtime, job_name)
+    if scheduled_at is None:
+        return job()
+    return get_job_coordinator().run(_runtime.account.name, job_name, scheduled_at, functools.partial(job, scheduled_at=scheduled_at))
+
+def in_time_job(cron: Optional[str] = None):
+    return run_scheduled_job('in_time_job', cron)
+
+def out_time_job(cron: Optional[str] = None):
+    return run_scheduled_job('out_time_job', cron)
+
+def break_start_job(cron: Optional[str] = None):
+    return run_scheduled_job('break_start_job', cron)
+
+def break_finished_job(cron: Optional[str] = None):
+    return run_scheduled_job('break_finished_job', cron)
+
+def calendar_job(cron: Optional[str] = None):
+    return run_scheduled_job('calendar_job', cron)
+
+def run_account_job(account_name: str, job_name: str, cron: Optional[str] = None):
+    from sesame_automate.coordination import scheduled_slot
+
+    trigger = get_settings().cron_triggers.get(cron) if cron else None
+    return _runtime.submit(account_name, job_name, scheduled_slot(trigger) if trigger else None)
+
+def cron_job_specs(settings: "Settings", func, cron: str, name: str, job_id: str) -> list[dict[str, Any]]:
+    from sesame_automate.fleet import Fleet
+    from sesame_automate.scheduling import spread_trigger
+
+    trigger = settings.cron_trigger(cron)
+    spread_mode = settings.schedule_spread_mode
+    spread_window = settings.schedule_spread_window
+    if not isinstance(_runtime, Fleet) or spread_mode == "none" or spread_window <= 0:
+        return [dict(func=func, kwargs=dict(cron=cron), trigger=trigger, id=job_id, name=name)]
+
+    return [
+        dict(
+            func=run_account_job,
+            args=[account_name, func.__name__],
+            kwargs=dict(cron=cron),
+            trigger=spread_trigger(trigger, account_name, func.__name__, spread_mode, spread_window),
+            id=f'{job_id}:{account_name}',
+            name=f'{name} [{account_name}]'
+        )
+        for account_name in _runtime.accounts
+    ]
+
+def job_specs(settings: "Settings") -> dict[str, dict[str, Any]]:
+    from apscheduler.triggers.interval import IntervalTrigger
+
+    specs = []
+    for index, cron in enumerate(settings.in_time_crons):
+        specs += cron_job_specs(settings, in_time_job, cron, 'Check In Job', f'in_time_job:{index}')
+
+    for index, cron in enumerate(settings.out_time_crons):
+        specs += cron_job_specs(settings, out_time_job, cron, 'Check Out Job', f'out_time_job:{index}')
+
+    specs += cron_job_specs(settings, break_start_job, settings.break_start_cron, 'Break Start Job', 'break_start_job:0')
+
+    specs += cron_job_specs(settings, break_finished_job, settings.break_end_cron, 'Break End Job', 'break_finished_job:0')
+
+    if settings.calendar_source == "api":
+        specs += cron_job_specs(settings, calendar_job, settings.calendar_refresh_cron, 'Calendar Job', 'calendar_job:0')
+
+    if settings.metrics_file:
+        specs.append(dict(
+            func=export_metrics_job,
+            trigger=IntervalTrigger(seconds=settings.metrics_export_interval),
+            id='export_metrics_job',
+            name='Export Metrics Job'
+        ))
+    return {spec['id']: spec for spec in specs}
+
+def schedule_jobs(scheduler: "BlockingScheduler", settings: "Settings"):
+    specs = job_specs(settings)
+    for job in scheduler.get_jobs():
+        if job.id.endswith(':catch-up'):
+            continue
+        spec = specs.pop(job.id, None)
+        if spec is None:
+            scheduler.remove_job(job.id)
+            logger.info(f"Removed {job.name}")
+        elif str(spec['trigger']) != str(job.trigger):
+            scheduler.modify_job(job.id, kwargs=spec.get('kwargs', {}))
+            scheduler.reschedule_job(job.id, trigger=spec['trigger'])
+            logger.info(f"Rescheduled {job.name}: {spec['trigger']}")
+
+    for spec in specs.values():
+        scheduler.add_job(**spec)
+        if scheduler.running:
+            logger.info(f"Added {spec['name']}: {spec['trigger']}")
+
+def export_metrics_job():
+    from sesame_automate.metrics import get_metrics_collector
+    get_metrics_collector().write_openmetrics(get_settings().metrics_file)
+
+def setup_instrumentation():
+    from sesame_automate.logging_pipeline import LogContextHook
+    from sesame_automate.metrics import TraceFileHook, get_metrics_collector
+    from sesame_automate.models.runnable_sequence import register_hook
+    from sesame_automate.status import get_job_history
+
+    register_hook(get_metrics_collector())
+    register_hook(LogContextHook())
+    register_hook(get_job_history())
+    trace_file = get_settings().trace_file
+    if trace_file:
+        register_hook(TraceFileHook(trace_file))
+        logger.info(f"Writing step traces to {trace_file}")
 
+def build_runtime() -> "AccountJobs | Fleet":
+    from sesame_automate.fleet import Fleet, load_accounts
+    from sesame_automate.jobs import AccountJobs
+    from sesame_automate.models.account import Account
+
+    accounts_file = get_settings().accounts_file
+    if accounts_file:
+        accounts = load_accounts(accounts_file)
+        logger.info(f"Fleet mode enabled with {len(accounts)} accounts from {accounts_file}")
+        return Fleet(accounts)
+    return AccountJobs(Account.from_env())
+
+def run_welcome_job():
     logger.info("Welcome, Sesame Time Automate is starting...")
-    runnable = login | me | work_break | assigned_work_check_types
-    runnable.invoke({
-        "is_welcome": True
-    })
+    try:
+        _runtime.welcome_job()
+    except Exception as e:
+        logger.error(f"Error during welcome: {e}")
 
-    logger.info("Background jobs starting...")
+def create_scheduler(settings: "Settings") -> "BlockingScheduler":
+    from apscheduler.executors.pool import ThreadPoolExecutor
+    from apscheduler.schedulers.blocking import BlockingScheduler
 
-    scheduler = BlockingScheduler(timezone=os.getenv("TIME_ZONE"))
-    if not os.getenv("IN_TIME_CRON"):
-        logger.warning("IN_TIME_CRON not set. Please set it in the environment variables to schedule check in jobs.")
-        exit(1)
+    return BlockingScheduler(
+        timezone=settings.time_zone,
+        executors={"default": ThreadPoolExecutor(settings.scheduler_max_workers)},
+        job_defaults={
+            "misfire_grace_time": settings.scheduler_misfire_grace_time,
+            "coalesce": settings.scheduler_coalesce,
+            "max_instances": settings.scheduler_max_instances
+        }
+    )
 
-    if not os.getenv("OUT_TIME_CRON"):
-        logger.warning("OUT_TIME_CRON not set. Please set it in the environment variables to schedule check out jobs.")
-        exit(1)
+def load_settings() -> "Settings":
+    from sesame_automate.config import SettingsError
 
-    if not os.getenv("BREAK_START_CRON"):
-        logger.warning("BREAK_START_CRON not set. Please set it in the environment variables to schedule break start jobs.")
+    try:
+        settings = get_settings()
+    except SettingsError as e:
+        logger.error(str(e))
         exit(1)
 
-    if not os.getenv("BREAK_END_CRON"):
-        logger.warning("BREAK_END_CRON not set. Please set it in the environment variables to schedule break end jobs.")
+    missing = settings.missing_schedules()
+    for variable, jobs in missing.items():
+        logger.warning(f"{variable} not set. Please set it in the environment variables to schedule {jobs} jobs.")
+    if missing:
         exit(1)
-    
-    def in_time_job():
-        try:
-            logger.info("Executing Check In Job")
-            current_state = State.WORKING
-            runnable = login | me | assigned_work_check_types | check_in
-            runnable.invoke({
-                "current_state": current_state,
-            })
-            logger.info("Check In Job Executed")
-        except Exception as e:
-            logger.error(f"Error during Check In Job: {e}")
-            traceback.print_exc()
-    
-    def out_time_job():
-        try:
-            logger.info("Executing Check Out Job")
-            current_state = State.WORKING
-            runnable = login | me | assigned_work_check_types | check_out
-            runnable.invoke({
-                "current_state": current_state,
-            })
-            logger.info("Check Out Job Executed")
-        except Exception as e:
-            logger.error(f"Error during Check Out Job: {e}")
-            traceback.print_exc()
-
-    def break_start_job():
-        try:
-            logger.info("Executing Break Start Job")
-            current_state = State.WORKING
-            base_runnable = login | me | assigned_work_check_types | work_break
-            runnable = base_runnable | check_out
-            runnable.invoke({
-                "current_state": current_state,
-            })
-            current_state = State.BREAK
-            runnable = base_runnable | check_in
-            runnable.invoke({
-                "current_state": current_state,
-            })
-            logger.info("Break Start Job Executed")
-        except Exception as e:
-            logger.error(f"Error during Break Start Job: {e}")
-            traceback.print_exc()
-
-    def break_finished_job():
-        try:
-            logger.info("Executing Break Finished Job")
-            current_state = State.BREAK
-            base_runnable = login | me | assigned_work_check_types | work_break
-            runnable = base_runnable | check_out
-            runnable.invoke({
-                "current_state": current_state,
-            })
-            current_state = State.WORKING
-            runnable = base_runnable | check_in
-            runnable.invoke({
-                "current_state": current_state,
-            })
-            logger.info("Break Finished Job Executed")
-        except Exception as e:
-            logger.error(f"Error during Break Finished Job: {e}")
-            traceback.print_exc()
-
-    for cron in os.getenv("IN_TIME_CRON", "").split(','):
-        scheduler.add_job(
-            func=in_time_job,
-            trigger=CronTrigger.from_crontab(cron),
-            name='Check In Job'
-        )
-    
-    for cron in os.getenv("OUT_TIME_CRON", "").split(','):
-        scheduler.add_job(
-            func=out_time_job,
-            trigger=CronTrigger.from_crontab(cron),
-            name='Check Out Job'
-        )
+    return settings
+
+def watch_settings(scheduler: "BlockingScheduler", settings: "Settings"):
+    from sesame_automate.config import SettingsWatcher
+
+    watcher = SettingsWatcher(
+        [settings.settings_file, '.env'],
+        lambda new_settings: schedule_jobs(scheduler, new_settings),
+        settings.settings_reload_interval
+    )
+    watcher.start()
+    return watcher
+
+def start_outbox_drainer(settings: "Settings"):
+    from sesame_automate.scheduling import OutboxDrainer
+    from sesame_automate.stores import get_clock_outbox
 
-    scheduler.add_job(
-        func=break_start_job,
-        trigger=CronTrigger.from_crontab(os.getenv("BREAK_START_CRON")),
-        name='Break Start Job'
+    drainer = OutboxDrainer(
+        get_clock_outbox(),
+        _runtime.deliver_outbox_event,
+        settings.outbox_drain_interval,
+        settings.outbox_max_concurrency,
+        settings.outbox_rate_limit,
+        settings.outbox_max_age
     )
+    drainer.start()
+    return drainer
 
-    scheduler.add_job(
-        func=break_finished_job,
-        trigger=CronTrigger.from_crontab(os.getenv("BREAK_END_CRON")),
-        name='Break End Job'
+def start_status_server(scheduler: "BlockingScheduler", settings: "Settings"):
+    from sesame_automate.coordination import get_job_coordinator
+    from sesame_automate.fleet import Fleet
+    from sesame_automate.status import StatusServer, get_job_history
+
+    accounts = list(_runtime.accounts) if isinstance(_runtime, Fleet) else [_runtime.account.name]
+    server = StatusServer(
+        scheduler,
+        get_job_history(),
+        [account for account in accounts if get_job_coordinator().owns(account)],
+        settings.status_host,
+        settings.status_port,
+        settings.status_login_grace
     )
+    server.start()
+    return server
+
+def prepare_scheduler() -> "BlockingScheduler":
+    global _runtime
+    from sesame_automate.scheduling import RunHistoryListener, schedule_catch_ups
+    from sesame_automate.stores import get_run_history
+
+    settings = load_settings()
+    setup_instrumentation()
+    _runtime = build_runtime()
+
+    if settings.fast_start:
+        threading.Thread(target=run_welcome_job, name="welcome", daemon=True).start()
+    else:
+        run_welcome_job()
+
+    logger.info("Background jobs starting...")
+
+    scheduler = create_scheduler(settings)
+    run_history = get_run_history()
+    history_listener = RunHistoryListener(run_history)
+    history_listener.attach(scheduler)
+
+    schedule_jobs(scheduler, settings)
+
+    schedule_catch_ups(
+        scheduler,
+        history_listener,
+        run_history,
+        settings.catch_up_jobs,
+        settings.catch_up_max_delay
+    )
+
+    if settings.clock_outbox != "off":
+        start_outbox_drainer(settings)
+
+    if settings.status_port is not None:
+        start_status_server(scheduler, settings)
+
+    if settings.settings_hot_reload:
+        watch_settings(scheduler, settings)
+    return scheduler
+
+def main():
+    environment_loaded = load_environment()
+    setup_logging()
+    if environment_loaded:
+        logger.info("Environment variables loaded from .env file")
+    else:
+        logger.warning("python-dotenv not installed. Make sure to set environment variables manually.")
+    scheduler = prepare_scheduler()
 
     logger.info("Waiting for scheduled jobs to run...")
     
-    scheduler.start()
\ No newline at end of file
+    scheduler.start()
@@ -0,0 +1,2 @@
+from sesame_automate.metrics.metrics_collector import MetricsCollector, get_metrics_collector
+from sesame_automate.metrics.trace_file_hook import TraceFileHook
@@ -0,0 +1,164 @@
+import os
+import tempfile
+import threading
+import weakref
+from collections import defaultdict
+from typing import Any, Optional
+from sesame_automate.models.runnable_sequence import Runnable, RunnableHook
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+
+class MetricsCollector(RunnableHook):
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._step_durations: dict[str, _Histogram] = {}
+        self._step_failures: dict[str, int] = defaultdict(int)
+        self._http_requests: dict[tuple[str, str], int] = defaultdict(int)
+        self._http_request_bytes = 0
+        self._http_response_bytes = 0
+        self._instrumented_sessions: weakref.WeakSet = weakref.WeakSet()
+
+    def before_step(self, step: Runnable, data: dict[str, Any], context: dict[str, Any]) -> None:
+        self.instrument_session(data.get('session'))
+        self.instrument_session(data.get('async_session'))
+
+    def after_step(self, step: Runnable, data: dict[str, Any], step_result: Any, duration: float, context: dict[str, Any]) -> None:
+        self.instrument_session(data.get('session'))
+        self.instrument_session(data.get('async_session'))
+        if isinstance(step_result, dict):
+            self.instrument_session(step_result.get('session'))
+            self.instrument_session(step_result.get('async_session'))
+        failed = isinstance(step_result, dict) and (
+            step_result.get('last_successful') is False or step_result.get('login_successful') is False
+        )
+        self._observe_step(context['step'], duration, failed)
+
+    def on_error(self, step: Runnable, data: dict[str, Any], error: Exception, duration: float, context: dict[str, Any]) -> None:
+        self._observe_step(context['step'], duration, True)
+
+    def instrument_session(self, session: Any) -> None:
+        if session is None or session in self._instrumented_sessions:
+            return
+        with self._lock:
+            if session in self._instrumented_sessions:
+                return
+            hooks = getattr(session, 'hooks', None)
+            event_hooks = getattr(session, 'event_hooks', None)
+            if isinstance(hooks, dict):
+                hooks['response'].append(self._observe_response)
+            elif isinstance(event_hooks, dict):
+                event_hooks['response'].append(self._aobserve_response)
+            else:
+                return
+            self._instrumented_sessions.add(session)
+
+    def _observe_step(self, step: str, duration: float, failed: bool) -> None:
+        with self._lock:
+            histogram = self._step_durations.get(step)
+            if histogram is None:
+                histogram = self._step_durations[step] = _Histogram(self._buckets)
+            histogram.observe(duration)
+            if failed:
+                self._step_failures[step] += 1
+
+    def _observe_response(self, response: Any, *args, **kwargs) -> Any:
+        self._observe_http(response.request.method, response.status_code, response.request.body, response.headers, lambda: len(response.content or b''))
+        return response
+
+    async def _aobserve_response(self, response: Any) -> None:
+        self._observe_http(response.request.method, response.status_code, response.request.content, response.headers, lambda: 0)
+
+    def _observe_http(self, method: str, status: int, body: Any, headers: Any, content_length: Any) -> None:
+        length = headers.get('Content-Length')
+        response_bytes = int(length) if length and length.isdigit() else content_length()
+        request_bytes = len(body) if isinstance(body, (bytes, str)) else 0
+        with self._lock:
+            self._http_requests[(method, str(status))] += 1
+            self._http_request_bytes += request_bytes
+            self._http_response_bytes += response_bytes
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                'steps': {
+                    step: {
+                        'count': histogram.count,
+                        'sum': histogram.sum,
+                        'failures': self._step_failures.get(step, 0)
+                    }
+                    for step, histogram in self._step_durations.items()
+                },
+                'http_requests': {f"{method} {status}": count for (method, status), count in self._http_requests.items()},
+                'http_request_bytes': self._http_request_bytes,
+                'http_response_bytes': self._http_response_bytes
+            }
+
+    def to_openmetrics(self) -> str:
+        lines = [
+            "# TYPE sesame_step_duration_seconds histogram",
+            "# UNIT sesame_step_duration_seconds seconds",
+            "# HELP sesame_step_duration_seconds Duration of each runnable step."
+        ]
+        with self._lock:
+            for step, histogram in sorted(self._step_durations.items()):
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'sesame_step_duration_seconds_bucket{{step="{step}",le="{bound}"}} {count}')
+                lines.append(f'sesame_step_duration_seconds_bucket{{step="{step}",le="+Inf"}} {histogram.count}')
+                lines.append(f'sesame_step_duration_seconds_count{{step="{step}"}} {histogram.count}')
+                lines.append(f'sesame_step_duration_seconds_sum{{step="{step}"}} {histogram.sum}')
+
+            lines.append("# TYPE sesame_step_failures counter")
+            lines.append("# HELP sesame_step_failures Runnable steps that reported a failure or raised.")
+            for step, count in sorted(self._step_failures.items()):
+                lines.append(f'sesame_step_failures_total{{step="{step}"}} {count}')
+
+            lines.append("# TYPE sesame_http_requests counter")
+            lines.append("# HELP sesame_http_requests HTTP requests sent to the Sesame API.")
+            for (method, status), count in sorted(self._http_requests.items()):
+                lines.append(f'sesame_http_requests_total{{method="{method}",status="{status}"}} {count}')
+
+            lines.append("# TYPE sesame_http_request_bytes counter")
+            lines.append("# UNIT sesame_http_request_bytes bytes")
+            lines.append(f"sesame_http_request_bytes_total {self._http_request_bytes}")
+            lines.append("# TYPE sesame_http_response_bytes counter")
+            lines.append("# UNIT sesame_http_response_bytes bytes")
+            lines.append(f"sesame_http_response_bytes_total {self._http_response_bytes}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_openmetrics(self, path: str) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(self.to_openmetrics())
+        os.replace(tmp_path, path)
+
+
+_default_collector: Optional[MetricsCollector] = None
+_default_collector_lock = threading.Lock()
+
+
+def get_metrics_collector() -> MetricsCollector:
+    global _default_collector
+    with _default_collector_lock:
+        if _default_collector is None:
+            _default_collector = MetricsCollector()
+        return _default_collector
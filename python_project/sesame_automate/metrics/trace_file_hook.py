@@ -0,0 +1,40 @@
+import json
+import threading
+import time
+from typing import Any, Optional
+from sesame_automate.models.runnable_sequence import Runnable, RunnableHook
+
+
+class TraceFileHook(RunnableHook):
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+
+    def after_step(self, step: Runnable, data: dict[str, Any], step_result: Any, duration: float, context: dict[str, Any]) -> None:
+        ok = not (isinstance(step_result, dict) and (
+            step_result.get('last_successful') is False or step_result.get('login_successful') is False
+        ))
+        self._write(context, duration, ok, step_result.get('error') if isinstance(step_result, dict) and not ok else None)
+
+    def on_error(self, step: Runnable, data: dict[str, Any], error: Exception, duration: float, context: dict[str, Any]) -> None:
+        self._write(context, duration, False, str(error))
+
+    def on_skip(self, step: Runnable, data: dict[str, Any], reason: str, context: dict[str, Any]) -> None:
+        self._write(context, 0.0, True, None, reason)
+
+    def _write(self, context: dict[str, Any], duration: float, ok: bool, error: Any, skip_reason: Optional[str] = None) -> None:
+        span = {
+            'trace_id': context['trace_id'],
+            'step': context['step'],
+            'index': context['index'],
+            'start': time.time() - duration,
+            'duration': duration,
+            'ok': ok,
+            'error': error
+        }
+        if skip_reason is not None:
+            span['skipped'] = skip_reason
+        line = json.dumps(span, default=str) + "\n"
+        with self._lock:
+            with open(self._path, "a", encoding="utf-8") as f:
+                f.write(line)
@@ -0,0 +1,44 @@
+import os
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from sesame_automate.config.settings import get_settings
+
+
+@dataclass(frozen=True)
+class Account:
+    name: str
+    email: str
+    password: str = field(repr=False)
+    remote_work_days: Optional[list[str]] = None
+    break_name: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "Account":
+        settings = get_settings()
+        email = settings.email or ""
+        return cls(
+            name=email,
+            email=email,
+            password=settings.password or ""
+        )
+
+    @classmethod
+    def from_dict(cls, values: dict[str, Any]) -> "Account":
+        email = values.get("email")
+        if not email:
+            raise ValueError("Every account needs an 'email'")
+        password = values.get("password")
+        if not password and values.get("password_env"):
+            password = os.getenv(values["password_env"])
+        if not password:
+            raise ValueError(f"Account '{email}' needs a 'password' or a 'password_env' that is set")
+        remote_work_days = values.get("remote_work_days")
+        if isinstance(remote_work_days, str):
+            remote_work_days = remote_work_days.split(",")
+        return cls(
+            name=values.get("name", email),
+            email=email,
+            password=password,
+            remote_work_days=[day.strip() for day in remote_work_days] if remote_work_days is not None else None,
+            break_name=values.get("break_name")
+        )
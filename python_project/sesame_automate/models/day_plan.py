@@ -0,0 +1,90 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Iterable, Optional
+from sesame_automate.config.settings import WEEKDAYS, get_settings, parse_work_days
+from sesame_automate.models.enums.state import State
+
+CHECK_IN_ENDPOINT = "/api/v3/employees/{}/check-in"
+CHECK_OUT_ENDPOINT = "/api/v3/employees/{}/check-out"
+
+
+@dataclass(frozen=True)
+class DayPlan:
+    account: str
+    day: date
+    remote: bool
+    check_in_url: str
+    check_out_url: str
+    work_check_type_id: Optional[str]
+    work_break_id: Optional[str]
+    payloads: dict[State, dict[str, Any]] = field(repr=False, compare=False)
+
+    @classmethod
+    def build(
+        cls,
+        account: str,
+        user_id: Optional[str],
+        check_types: list[dict[str, Any]],
+        work_break_id: Optional[str] = None,
+        remote_work_days: Optional[Iterable[str]] = None,
+        day: Optional[date] = None,
+        base_url: Optional[str] = None
+    ) -> "DayPlan":
+        base_url = base_url or get_settings().base_url
+        if not base_url:
+            raise ValueError("Please set BASE_URL in your environment variables.")
+        if not user_id:
+            raise ValueError("User ID is required to compile the day plan")
+
+        day = day or date.today()
+        remote_days = parse_work_days(remote_work_days) if remote_work_days is not None else get_settings().remote_work_days
+        remote = WEEKDAYS[day.weekday()] in remote_days
+        work_check_type_id = None
+        if remote:
+            remote_checks = [x for x in check_types if x.get("workType") == "remote" and x.get("status") == "active"]
+            work_check_type_id = remote_checks[0].get("id") if remote_checks else None
+
+        payloads = {State.BREAK: {"coordinates": {}, "origin": "web", "workCheckTypeId": work_break_id}}
+        if not remote or work_check_type_id:
+            payloads[State.WORKING] = {"coordinates": {}, "origin": "web", "workCheckTypeId": work_check_type_id}
+
+        return cls(
+            account=account,
+            day=day,
+            remote=remote,
+            check_in_url=base_url + CHECK_IN_ENDPOINT.format(user_id),
+            check_out_url=base_url + CHECK_OUT_ENDPOINT.format(user_id),
+            work_check_type_id=work_check_type_id,
+            work_break_id=work_break_id,
+            payloads=payloads
+        )
+
+    @property
+    def missing_remote_check_type(self) -> bool:
+        return self.remote and State.WORKING not in self.payloads
+
+    def payload(self, state: State) -> dict[str, Any]:
+        if state == State.WORKING and self.missing_remote_check_type:
+            raise ValueError("No remote work check type found")
+        if state not in self.payloads:
+            raise ValueError(f"Current state is {state}, cannot build a clock payload")
+        return self.payloads[state]
+
+    def mode(self, state: State) -> str:
+        if state == State.BREAK:
+            return "BREAK"
+        return "REMOTE" if self.remote else "NORMAL"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "account": self.account,
+            "day": self.day.isoformat(),
+            "weekday": WEEKDAYS[self.day.weekday()],
+            "remote": self.remote,
+            "check_in_url": self.check_in_url,
+            "check_out_url": self.check_out_url,
+            "work_check_type_id": self.work_check_type_id,
+            "missing_remote_check_type": self.missing_remote_check_type,
+            "work_break_id": self.work_break_id,
+            "payloads": {str(state): payload for state, payload in self.payloads.items()}
+        }
@@ -3,4 +3,5 @@ from enum import StrEnum
 class State(StrEnum):
     UNKNOWN = "unknown"
     WORKING = "working"
-    BREAK = "break"
\ No newline at end of file
+    BREAK = "break"
+    OFFLINE = "offline"
\ No newline at end of file
@@ -0,0 +1,58 @@
+import logging
+from typing import Any, Callable, Optional
+from sesame_automate.models.runnable_sequence import Runnable, step_name
+
+
+class RunnableBranch(Runnable):
+    def __init__(
+        self,
+        *branches: tuple[Callable[[dict[str, Any]], Any], Runnable],
+        default: Optional[Runnable] = None,
+        name: Optional[str] = None
+    ):
+        if not branches and default is None:
+            raise ValueError("RunnableBranch needs at least one branch or a default")
+        for i, branch in enumerate(branches):
+            if not isinstance(branch, tuple) or len(branch) != 2 or not callable(branch[0]):
+                raise TypeError(f"Branch {i} must be a (condition, runnable) tuple")
+            if not isinstance(branch[1], Runnable):
+                raise TypeError(f"Branch {i} must route to a Runnable, got {type(branch[1]).__name__}")
+        if default is not None and not isinstance(default, Runnable):
+            raise TypeError(f"Default branch must be a Runnable, got {type(default).__name__}")
+        self.branches = branches
+        self.default = default
+        self.name = name
+        self._logger = logging.getLogger(__name__)
+
+    def select(self, data: dict[str, Any]) -> Optional[Runnable]:
+        for condition, runnable in self.branches:
+            if condition(data):
+                return runnable
+        return self.default
+
+    def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        data = data if data is not None else {}
+        runnable = self.select(data)
+        if runnable is None:
+            return self._no_branch_result()
+        return self._branch_result(runnable, runnable.execute(data))
+
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        data = data if data is not None else {}
+        runnable = self.select(data)
+        if runnable is None:
+            return self._no_branch_result()
+        return self._branch_result(runnable, await runnable.aexecute(data))
+
+    def _no_branch_result(self) -> dict[str, Any]:
+        return {
+            'branch_taken': None,
+            'skipped_steps': [{'step': step_name(self), 'reason': 'no branch condition matched'}]
+        }
+
+    def _branch_result(self, runnable: Runnable, result: Any) -> dict[str, Any]:
+        branch = step_name(runnable)
+        self._logger.debug(f"{step_name(self)} routed to {branch}")
+        if not isinstance(result, dict):
+            return {'branch_taken': branch, f'{runnable.__class__.__name__}_result': result}
+        return {**result, 'branch_taken': branch}
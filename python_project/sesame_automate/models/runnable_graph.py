@@ -0,0 +1,185 @@
+import asyncio
+import contextvars
+import logging
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Iterable, Optional
+from sesame_automate.models.runnable_sequence import Runnable, RunnableHook, run_hooks, step_failed
+
+
+class RunnableGraph(Runnable):
+    def __init__(self, max_workers: Optional[int] = None, hooks: Optional[list[RunnableHook]] = None):
+        self._nodes: dict[str, Runnable] = {}
+        self._dependencies: dict[str, tuple[str, ...]] = {}
+        self._max_workers = max_workers
+        self.hooks = list(hooks or [])
+        self._logger = logging.getLogger(__name__)
+
+    def add(self, name: str, runnable: Runnable, depends_on: Iterable[str] = ()) -> "RunnableGraph":
+        if not isinstance(runnable, Runnable):
+            raise TypeError(f"Node '{name}' must be an instance of Runnable, got {type(runnable).__name__}")
+        if name in self._nodes:
+            raise ValueError(f"Node '{name}' is already defined")
+        depends_on = tuple(depends_on)
+        unknown = [dependency for dependency in depends_on if dependency not in self._nodes]
+        if unknown:
+            raise ValueError(f"Node '{name}' depends on undefined nodes: {', '.join(unknown)}")
+        self._nodes[name] = runnable
+        self._dependencies[name] = depends_on
+        return self
+
+    def invoke(self, initial_data: Any = None) -> dict[str, Any]:
+        result = self._initial_result(initial_data)
+        started = time.perf_counter()
+        timings: dict[str, dict[str, float]] = {}
+        trace = self._start_trace(result)
+        pending = list(self._nodes)
+        done: set[str] = set()
+
+        with ThreadPoolExecutor(max_workers=self._max_workers or max(len(self._nodes), 1), thread_name_prefix="runnable-graph") as executor:
+            running = {}
+            while pending or running:
+                for name in self._ready(pending, done, result, trace):
+                    pending.remove(name)
+                    timings[name] = {'start': time.perf_counter() - started}
+                    running[executor.submit(contextvars.copy_context().run, self._run_node, name, dict(result))] = name
+                if not running:
+                    continue
+
+                completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    name = running.pop(future)
+                    timings[name]['end'] = time.perf_counter() - started
+                    self._merge(result, trace, name, future.result())
+                    done.add(name)
+
+        return self._with_timings(result, timings)
+
+    async def ainvoke(self, initial_data: Any = None) -> dict[str, Any]:
+        result = self._initial_result(initial_data)
+        started = time.perf_counter()
+        timings: dict[str, dict[str, float]] = {}
+        trace = self._start_trace(result)
+        pending = list(self._nodes)
+        done: set[str] = set()
+
+        running = {}
+        while pending or running:
+            for name in self._ready(pending, done, result, trace):
+                pending.remove(name)
+                timings[name] = {'start': time.perf_counter() - started}
+                running[asyncio.ensure_future(self._arun_node(name, dict(result)))] = name
+            if not running:
+                continue
+
+            completed, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in completed:
+                name = running.pop(task)
+                timings[name]['end'] = time.perf_counter() - started
+                self._merge(result, trace, name, task.result())
+                done.add(name)
+
+        return self._with_timings(result, timings)
+
+    def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        return self.invoke(data)
+
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        return await self.ainvoke(data)
+
+    def _run_node(self, name: str, data: dict[str, Any]) -> Any:
+        context = self._context(data, name)
+        run_hooks(self.hooks, 'before_step', self._nodes[name], data, context)
+        started = time.perf_counter()
+        try:
+            node_result = self._nodes[name].execute(data)
+        except Exception as e:
+            run_hooks(self.hooks, 'on_error', self._nodes[name], data, e, time.perf_counter() - started, context)
+            raise
+        run_hooks(self.hooks, 'after_step', self._nodes[name], data, node_result, time.perf_counter() - started, context)
+        return node_result
+
+    async def _arun_node(self, name: str, data: dict[str, Any]) -> Any:
+        context = self._context(data, name)
+        run_hooks(self.hooks, 'before_step', self._nodes[name], data, context)
+        started = time.perf_counter()
+        try:
+            node_result = await self._nodes[name].aexecute(data)
+        except Exception as e:
+            run_hooks(self.hooks, 'on_error', self._nodes[name], data, e, time.perf_counter() - started, context)
+            raise
+        run_hooks(self.hooks, 'after_step', self._nodes[name], data, node_result, time.perf_counter() - started, context)
+        return node_result
+
+    def _ready(self, pending: list[str], done: set[str], result: dict[str, Any], trace: dict[str, Any]) -> list[str]:
+        ready = []
+        for name in list(pending):
+            blocked = next((dependency for dependency in self._dependencies[name] if dependency in trace['blocked']), None)
+            if blocked is not None:
+                # Nodes are added after their dependencies, so one pass also skips transitive dependents
+                pending.remove(name)
+                trace['blocked'].add(name)
+                self._skip(result, trace, name, f"dependency {blocked} did not complete")
+            elif all(dependency in done for dependency in self._dependencies[name]):
+                ready.append(name)
+        return ready
+
+    def _skip(self, result: dict[str, Any], trace: dict[str, Any], name: str, reason: str) -> None:
+        trace['skipped_steps'].append({'step': name, 'reason': reason})
+        run_hooks(self.hooks, 'on_skip', self._nodes[name], result, reason, self._context(result, name))
+        self._publish_trace(result, trace)
+
+    def _context(self, data: dict[str, Any], name: str) -> dict[str, Any]:
+        return {'trace_id': data['trace_id'], 'step': name, 'index': list(self._nodes).index(name)}
+
+    def _initial_result(self, initial_data: Any) -> dict[str, Any]:
+        result = initial_data if initial_data is not None else {}
+        if not isinstance(result, dict):
+            result = {'initial_data': result}
+        result.setdefault('trace_id', uuid.uuid4().hex)
+        return result
+
+    def _start_trace(self, result: dict[str, Any]) -> dict[str, Any]:
+        trace = {'skipped_steps': list(result.get('skipped_steps', [])), 'errors': [], 'blocked': set()}
+        self._publish_trace(result, trace)
+        return trace
+
+    def _merge(self, result: dict[str, Any], trace: dict[str, Any], name: str, node_result: Any) -> None:
+        if not isinstance(node_result, dict):
+            result[f'{name}_result'] = node_result
+            return
+        result.update(node_result)
+        trace['skipped_steps'].extend(
+            skipped for skipped in node_result.get('skipped_steps', [])
+            if skipped not in trace['skipped_steps']
+        )
+        if step_failed(node_result):
+            trace['errors'].append({'step': name, 'error': node_result.get('error')})
+            trace['blocked'].add(name)
+            self._logger.warning(f"Node {name} failed, skipping its dependents: {node_result.get('error')}")
+        self._publish_trace(result, trace)
+
+    def _publish_trace(self, result: dict[str, Any], trace: dict[str, Any]) -> None:
+        # A sibling finishing after a failed node must not overwrite the failure
+        result['skipped_steps'] = trace['skipped_steps']
+        if trace['errors']:
+            result['errors'] = trace['errors']
+            result['error'] = trace['errors'][0]['error']
+            result['last_successful'] = False
+
+    def _with_timings(self, result: dict[str, Any], timings: dict[str, dict[str, float]]) -> dict[str, Any]:
+        for timing in timings.values():
+            timing['duration'] = timing['end'] - timing['start']
+
+        critical_path = []
+        node = max(timings, key=lambda name: timings[name]['end'], default=None)
+        while node is not None:
+            critical_path.append(node)
+            node = max(self._dependencies[node], key=lambda name: timings[name]['end'], default=None)
+        critical_path.reverse()
+
+        result['graph_timings'] = timings
+        result['critical_path'] = critical_path
+        result['critical_path_duration'] = timings[critical_path[-1]]['end'] if critical_path else 0.0
+        return result
@@ -0,0 +1,50 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from sesame_automate.models.runnable_sequence import Runnable
+
+
+class RunnableParallel(Runnable):
+    def __init__(self, *steps: Runnable):
+        if not steps:
+            raise ValueError("RunnableParallel needs at least one step")
+        for i, step in enumerate(steps):
+            if not isinstance(step, Runnable):
+                raise TypeError(f"Step {i} must be an instance of Runnable, got {type(step).__name__}")
+        self.steps = steps
+
+    def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        data = data or {}
+        if len(self.steps) == 1:
+            return self._merge([self.steps[0].execute(dict(data))])
+
+        with ThreadPoolExecutor(max_workers=len(self.steps) - 1, thread_name_prefix="runnable-parallel") as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, step.execute, dict(data))
+                for step in self.steps[1:]
+            ]
+            first_result = self.steps[0].execute(dict(data))
+            return self._merge([first_result] + [future.result() for future in futures])
+
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        data = data or {}
+        results = await asyncio.gather(*(step.aexecute(dict(data)) for step in self.steps))
+        return self._merge(list(results))
+
+    def _merge(self, results: list[Any]) -> dict[str, Any]:
+        merged: dict[str, Any] = {}
+        errors = []
+        for step, step_result in zip(self.steps, results):
+            if not isinstance(step_result, dict):
+                merged[f'{step.__class__.__name__}_result'] = step_result
+                continue
+            merged.update(step_result)
+            if step_result.get('last_successful') is False:
+                errors.append(step_result.get('error'))
+
+        if any(isinstance(step_result, dict) and 'last_successful' in step_result for step_result in results):
+            merged['last_successful'] = not errors
+        if errors:
+            merged['error'] = errors[0]
+        return merged
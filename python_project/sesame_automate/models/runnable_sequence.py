@@ -1,39 +1,231 @@
+import asyncio
+import logging
+import time
+import uuid
 from abc import abstractmethod
-from typing import Any
+from datetime import datetime
+from typing import Any, Callable, Optional
 
 class Runnable:
     def __or__(self, other) -> "RunnableSequence":
         return RunnableSequence(self, other)
+
+    def skip_if(self, condition: Callable[[dict[str, Any]], Any], reason: Optional[str] = None) -> "RunnableSkipIf":
+        return RunnableSkipIf(self, condition, reason)
     
     @abstractmethod
     def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
         raise NotImplementedError()
 
-class RunnableSequence:
-    def __init__(self, *steps: Runnable):
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        return await asyncio.to_thread(self.execute, data)
+
+class RunnableHook:
+    def before_step(self, step: Runnable, data: dict[str, Any], context: dict[str, Any]) -> None:
+        pass
+
+    def after_step(self, step: Runnable, data: dict[str, Any], step_result: Any, duration: float, context: dict[str, Any]) -> None:
+        pass
+
+    def on_error(self, step: Runnable, data: dict[str, Any], error: Exception, duration: float, context: dict[str, Any]) -> None:
+        pass
+
+    def on_skip(self, step: Runnable, data: dict[str, Any], reason: str, context: dict[str, Any]) -> None:
+        pass
+
+_global_hooks: list[RunnableHook] = []
+
+def register_hook(hook: RunnableHook) -> None:
+    if hook not in _global_hooks:
+        _global_hooks.append(hook)
+
+def unregister_hook(hook: RunnableHook) -> None:
+    if hook in _global_hooks:
+        _global_hooks.remove(hook)
+
+def step_name(step: Runnable) -> str:
+    return getattr(step, 'name', None) or step.__class__.__name__
+
+def run_hooks(hooks: list[RunnableHook], method: str, *args) -> None:
+    for hook in _global_hooks + hooks:
+        try:
+            getattr(hook, method)(*args)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Hook {hook.__class__.__name__}.{method} failed: {e}")
+
+def step_failed(step_result: Any) -> bool:
+    return isinstance(step_result, dict) and (
+        step_result.get('last_successful') is False or step_result.get('login_successful') is False
+    )
+
+class RunnableSkipIf(Runnable):
+    def __init__(self, runnable: Runnable, condition: Callable[[dict[str, Any]], Any], reason: Optional[str] = None):
+        if not isinstance(runnable, Runnable):
+            raise TypeError(f"Cannot skip non-Runnable object of type {type(runnable).__name__}")
+        self.runnable = runnable
+        self.condition = condition
+        self.reason = reason
+        self.name = step_name(runnable)
+
+    def skip_reason(self, data: dict[str, Any]) -> Optional[str]:
+        outcome = self.condition(data)
+        if not outcome:
+            return None
+        if isinstance(outcome, str):
+            return outcome
+        return self.reason or f"skip condition of {self.name} met"
+
+    def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        data = data if data is not None else {}
+        reason = self.skip_reason(data)
+        if reason:
+            return {'skipped_steps': [{'step': self.name, 'reason': reason}]}
+        return self.runnable.execute(data)
+
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        data = data if data is not None else {}
+        reason = self.skip_reason(data)
+        if reason:
+            return {'skipped_steps': [{'step': self.name, 'reason': reason}]}
+        return await self.runnable.aexecute(data)
+
+class RunnableSequence(Runnable):
+    def __init__(self, *steps: Runnable, hooks: Optional[list[RunnableHook]] = None, short_circuit: bool = True):
         for i, step in enumerate(steps):
             if not isinstance(step, Runnable):
                 raise TypeError(f"Step {i} must be an instance of Runnable, got {type(step).__name__}")
         self.steps = steps
+        self.hooks = list(hooks or [])
+        self.short_circuit = short_circuit
+        self._logger = logging.getLogger(__name__)
     
     def __or__(self, other: Runnable) -> 'RunnableSequence':
         if not isinstance(other, Runnable):
             raise TypeError(f"Cannot chain non-Runnable object of type {type(other).__name__}")
-        return RunnableSequence(*self.steps, other)
+        return RunnableSequence(*self.steps, other, hooks=self.hooks, short_circuit=self.short_circuit)
+
+    def with_hooks(self, *hooks: RunnableHook) -> 'RunnableSequence':
+        return RunnableSequence(*self.steps, hooks=self.hooks + list(hooks), short_circuit=self.short_circuit)
+
+    def without_short_circuit(self) -> 'RunnableSequence':
+        return RunnableSequence(*self.steps, hooks=self.hooks, short_circuit=False)
     
     def invoke(self, initial_data: Any = None) -> Any:
+        result = self._initial_result(initial_data)
+        trace = self._start_trace(result)
+        
+        for index, step in enumerate(self.steps):
+            context = self._context(result, step, index)
+            runnable = self._runnable_or_skip(result, trace, step, context)
+            if runnable is None:
+                continue
+            self._run_hooks('before_step', step, result, context)
+            started = time.perf_counter()
+            try:
+                step_result = runnable.execute(result)
+            except Exception as e:
+                self._run_hooks('on_error', step, result, e, time.perf_counter() - started, context)
+                raise
+            self._run_hooks('after_step', step, result, step_result, time.perf_counter() - started, context)
+            self._merge(result, step, step_result)
+            self._record_outcome(result, trace, step, step_result)
+                
+        return result
+
+    async def ainvoke(self, initial_data: Any = None) -> Any:
+        result = self._initial_result(initial_data)
+        trace = self._start_trace(result)
+
+        for index, step in enumerate(self.steps):
+            context = self._context(result, step, index)
+            runnable = self._runnable_or_skip(result, trace, step, context)
+            if runnable is None:
+                continue
+            self._run_hooks('before_step', step, result, context)
+            started = time.perf_counter()
+            try:
+                step_result = await runnable.aexecute(result)
+            except Exception as e:
+                self._run_hooks('on_error', step, result, e, time.perf_counter() - started, context)
+                raise
+            self._run_hooks('after_step', step, result, step_result, time.perf_counter() - started, context)
+            self._merge(result, step, step_result)
+            self._record_outcome(result, trace, step, step_result)
+
+        return result
+
+    def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        return self.invoke(data)
+
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        return await self.ainvoke(data)
+
+    def _initial_result(self, initial_data: Any) -> dict[str, Any]:
         result = initial_data if initial_data is not None else {}
         
         if not isinstance(result, dict):
             result = {'initial_data': result}
-        
-        for step in self.steps:
-            step_result = step.execute(result)
-            
-            if isinstance(step_result, dict):
-                result.update(step_result)
-            else:
-                step_name = step.__class__.__name__
-                result[f'{step_name}_result'] = step_result
-                
+        result.setdefault('trace_id', uuid.uuid4().hex)
         return result
+
+    def _start_trace(self, result: dict[str, Any]) -> dict[str, Any]:
+        trace = {'executed_steps': [], 'skipped_steps': [], 'error_chain': [], 'failed_step': None}
+        self._publish_trace(result, trace)
+        return trace
+
+    def _publish_trace(self, result: dict[str, Any], trace: dict[str, Any]) -> None:
+        result['executed_steps'] = trace['executed_steps']
+        result['skipped_steps'] = trace['skipped_steps']
+        result['error_chain'] = trace['error_chain']
+
+    def _runnable_or_skip(self, result: dict[str, Any], trace: dict[str, Any], step: Runnable, context: dict[str, Any]) -> Optional[Runnable]:
+        if self.short_circuit and trace['failed_step'] is not None:
+            reason = f"short-circuited after {trace['failed_step']} failed"
+        elif isinstance(step, RunnableSkipIf):
+            reason = step.skip_reason(result)
+            if reason is None:
+                return step.runnable
+        else:
+            return step
+
+        trace['skipped_steps'].append({'step': step_name(step), 'reason': reason})
+        self._run_hooks('on_skip', step, result, reason, context)
+        return None
+
+    def _record_outcome(self, result: dict[str, Any], trace: dict[str, Any], step: Runnable, step_result: Any) -> None:
+        name = step_name(step)
+        trace['executed_steps'].append(name)
+        if isinstance(step_result, dict):
+            trace['skipped_steps'].extend(
+                skipped for skipped in step_result.get('skipped_steps', [])
+                if skipped not in trace['skipped_steps']
+            )
+        if step_failed(step_result):
+            trace['error_chain'].append({
+                'step': name,
+                'error': step_result.get('error'),
+                'timestamp': datetime.now().isoformat()
+            })
+            if trace['failed_step'] is None:
+                trace['failed_step'] = name
+                result['last_successful'] = False
+                if self.short_circuit and step is not self.steps[-1]:
+                    self._logger.warning(f"Step {name} failed, skipping the remaining steps: {step_result.get('error')}")
+        self._publish_trace(result, trace)
+
+    def _context(self, result: dict[str, Any], step: Runnable, index: int) -> dict[str, Any]:
+        return {
+            'trace_id': result['trace_id'],
+            'step': step_name(step),
+            'index': index
+        }
+
+    def _run_hooks(self, method: str, *args) -> None:
+        run_hooks(self.hooks, method, *args)
+
+    def _merge(self, result: dict[str, Any], step: Runnable, step_result: Any) -> None:
+        if isinstance(step_result, dict):
+            result.update(step_result)
+        else:
+            step_name = step.__class__.__name__
+            result[f'{step_name}_result'] = step_result
@@ -0,0 +1 @@
+from sesame_automate.planning.day_planner import DayPlanner, get_day_planner
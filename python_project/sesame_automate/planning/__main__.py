@@ -0,0 +1,3 @@
+from sesame_automate.planning.plan_cli import main
+
+main()
@@ -0,0 +1,56 @@
+import logging
+import threading
+from datetime import date
+from typing import Any, Iterable, Optional
+from sesame_automate.models.day_plan import DayPlan
+
+
+class DayPlanner:
+    def __init__(self):
+        self._plans: dict[str, DayPlan] = {}
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+
+    def get(self, account: str, day: Optional[date] = None) -> Optional[DayPlan]:
+        with self._lock:
+            plan = self._plans.get(account)
+        if plan is None or plan.day != (day or date.today()):
+            return None
+        return plan
+
+    def compile(
+        self,
+        account: str,
+        user_id: Optional[str],
+        check_types: list[dict[str, Any]],
+        work_break_id: Optional[str] = None,
+        remote_work_days: Optional[Iterable[str]] = None,
+        day: Optional[date] = None
+    ) -> DayPlan:
+        plan = DayPlan.build(account, user_id, check_types, work_break_id, remote_work_days, day)
+        if plan.missing_remote_check_type:
+            self._logger.warning(f"[{account}] No remote work check type found, only break payloads are available until the plan is recompiled")
+        else:
+            with self._lock:
+                self._plans[account] = plan
+        self._logger.info(
+            f"[{account}] Day plan for {plan.day.isoformat()} compiled: "
+            f"{'remote' if plan.remote else 'office'}, check type {plan.work_check_type_id}, break {plan.work_break_id}"
+        )
+        return plan
+
+    def invalidate(self, account: str) -> None:
+        with self._lock:
+            self._plans.pop(account, None)
+
+
+_default_planner: Optional[DayPlanner] = None
+_default_planner_lock = threading.Lock()
+
+
+def get_day_planner() -> DayPlanner:
+    global _default_planner
+    with _default_planner_lock:
+        if _default_planner is None:
+            _default_planner = DayPlanner()
+        return _default_planner
@@ -0,0 +1,37 @@
+import argparse
+import json
+import logging
+import sys
+from datetime import date
+from typing import Optional
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compile and print the day plan of the configured accounts")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="Day to plan (YYYY-MM-DD), defaults to today")
+    parser.add_argument("--account", help="Only plan this account")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    from sesame_automate.fleet import Fleet
+    from sesame_automate.main import build_runtime, load_environment
+
+    load_environment()
+    runtime = build_runtime()
+    accounts = runtime.accounts if isinstance(runtime, Fleet) else {runtime.account.name: runtime}
+    if args.account:
+        if args.account not in accounts:
+            parser.error(f"Unknown account '{args.account}', expected one of {', '.join(accounts)}")
+        accounts = {args.account: accounts[args.account]}
+
+    plans = {name: jobs.plan_job(args.date) for name, jobs in accounts.items()}
+    json.dump(plans, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+    if isinstance(runtime, Fleet):
+        runtime.shutdown()
+    if not all(plan and plan.get('last_successful') for plan in plans.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
 from sesame_automate.runnables.sesame_time_assigned_work_check_types_runnable import SesameTimeAssignedWorkCheckTypesRunnable
+from sesame_automate.runnables.sesame_time_break_transition_runnable import SesameTimeBreakTransitionRunnable
+from sesame_automate.runnables.sesame_time_calendar_runnable import SesameTimeCalendarRunnable
 from sesame_automate.runnables.sesame_time_check_in_runnable import SesameTimeCheckInRunnable
 from sesame_automate.runnables.sesame_time_check_out_runnable import SesameTimeCheckOutRunnable
+from sesame_automate.runnables.sesame_time_check_status_runnable import SesameTimeCheckStatusRunnable
+from sesame_automate.runnables.sesame_time_clock_runnable import SesameTimeClockRunnable
+from sesame_automate.runnables.sesame_time_day_plan_runnable import SesameTimeDayPlanRunnable
 from sesame_automate.runnables.sesame_time_login_runnable import SesameTimeLoginRunnable
 from sesame_automate.runnables.sesame_time_me_info_runnable import SesameTimeMeInfoRunnable
+from sesame_automate.runnables.sesame_time_outbox_delivery_runnable import SesameTimeOutboxDeliveryRunnable
 from sesame_automate.runnables.sesame_time_work_break_runnable import SesameTimeWorkBreakRunnable
\ No newline at end of file
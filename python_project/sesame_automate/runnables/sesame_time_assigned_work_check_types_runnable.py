@@ -1,54 +1,77 @@
 from datetime import datetime
 import logging
-import os
-import traceback
 from typing import Any, Dict, Optional, override
 import requests
+from sesame_automate.config.settings import get_settings
 from sesame_automate.models.runnable_sequence import Runnable
+from sesame_automate.stores.reference_cache import ReferenceCache, get_reference_cache
 
 class SesameTimeAssignedWorkCheckTypesRunnable(Runnable):
-    def __init__(self):
-        self._base_url = os.getenv("BASE_URL")
+    def __init__(self, reference_cache: Optional[ReferenceCache] = None):
+        self._base_url = get_settings().base_url
         self._check_types_endpoint = "/api/v3/employees/{0}/assigned-work-check-types"
+        self._reference_cache = reference_cache or get_reference_cache()
         self._logger = logging.getLogger(__name__)
     
     @override
     def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
         if not data or not data.get('login_successful'):
-            return {
-                'last_successful': False,
-                'error': 'Login failed, cannot proceed with work break',
-                'previous_error': data.get('error') if data else None
-            }
+            return self._login_failed_result(data)
         
         try:
-            check_types = self._check_types(data['session'], data.get("user_info", {}).get("user_id"))
-            if data.get("is_welcome", False) and len(check_types) > 0:
-                self._logger.info("Assigned Work Check types retrieved:")
-                for ct in check_types:
-                    self._logger.info(f"Check type '{ct.get('name')}'")
-            
-            return {
-                'last_successful': True,
-                'timestamp': datetime.now().isoformat(),
-                "check_types": check_types
-            }
+            check_types = self._check_types(data['session'], data.get("user_info", {}).get("user_id"), data.get('account'))
+            return self._check_types_result(data, check_types)
         except Exception as e:
-            traceback.print_exc()
-            self._logger.error(f"Failed to fetch check types: {e}")
-            return {
-                'last_successful': False,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            }
+            return self._error_result(e)
+
+    @override
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        if not data or not data.get('login_successful'):
+            return self._login_failed_result(data)
+
+        try:
+            check_types = await self._acheck_types(data['async_session'], data.get("user_info", {}).get("user_id"), data.get('account'))
+            return self._check_types_result(data, check_types)
+        except Exception as e:
+            return self._error_result(e)
+
+    def _login_failed_result(self, data: dict[str, Any] | None) -> dict[str, Any]:
+        return {
+            'last_successful': False,
+            'error': 'Login failed, cannot proceed with work break',
+            'previous_error': data.get('error') if data else None
+        }
+
+    def _error_result(self, error: Exception) -> dict[str, Any]:
+        self._logger.error(f"Failed to fetch check types: {error}", exc_info=error)
+        return {
+            'last_successful': False,
+            'error': str(error),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _check_types_result(self, data: dict[str, Any], check_types: list) -> dict[str, Any]:
+        if data.get("is_welcome", False) and len(check_types) > 0:
+            self._logger.info("Assigned Work Check types retrieved:")
+            for ct in check_types:
+                self._logger.info(f"Check type '{ct.get('name')}'")
+        
+        return {
+            'last_successful': True,
+            'timestamp': datetime.now().isoformat(),
+            "check_types": check_types
+        }
         
-    def _check_types(self, session: requests.Session, employee_id: Optional[str] = None) -> list:
+    def _check_types(self, session: requests.Session, employee_id: Optional[str] = None, account: Optional[str] = None) -> list:
+        response = self._reference_cache.get_json(session, self._check_types_url(employee_id), account)
+        return response.get("data",[])
+
+    async def _acheck_types(self, session: Any, employee_id: Optional[str] = None, account: Optional[str] = None) -> list:
+        response = await self._reference_cache.aget_json(session, self._check_types_url(employee_id), account)
+        return response.get("data",[])
+
+    def _check_types_url(self, employee_id: Optional[str]) -> str:
         if not self._base_url:
             raise ValueError("Please set BASE_URL in your environment variables.")
         
-        check_types_url = self._base_url + self._check_types_endpoint.format(employee_id)
-        
-        response = session.get(check_types_url)
-        response.raise_for_status()
-        response = response.json()
-        return response.get("data",[])
+        return self._base_url + self._check_types_endpoint.format(employee_id)
@@ -0,0 +1,107 @@
+from datetime import datetime
+import logging
+import time
+from typing import Any, Optional, override
+from sesame_automate.models.enums.state import State
+from sesame_automate.models.runnable_sequence import Runnable
+from sesame_automate.runnables.sesame_time_check_in_runnable import SesameTimeCheckInRunnable
+from sesame_automate.runnables.sesame_time_check_out_runnable import SesameTimeCheckOutRunnable
+
+class SesameTimeBreakTransitionRunnable(Runnable):
+    def __init__(self, check_out: SesameTimeCheckOutRunnable, check_in: SesameTimeCheckInRunnable, from_state: State, to_state: State):
+        self._check_out = check_out
+        self._check_in = check_in
+        self._from_state = from_state
+        self._to_state = to_state
+        self._logger = logging.getLogger(__name__)
+
+    @override
+    def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        if not data or not data.get('login_successful'):
+            return self._login_failed_result(data)
+        if data.get('server_state') == self._to_state:
+            return self._skipped_result(f"already in {self._to_state}")
+        if data.get('server_state') == State.OFFLINE:
+            return self._skipped_result("not clocked in")
+
+        check_out_started = time.perf_counter()
+        check_out_result = self._check_out.execute(dict(data, current_state=self._from_state))
+        check_out_finished = time.perf_counter()
+        if not check_out_result.get('last_successful'):
+            return self._transition_result(check_out_result, None, check_out_started, check_out_finished, None)
+
+        check_in_result = self._check_in.execute(self._check_in_data(data, check_out_result))
+        return self._transition_result(check_out_result, check_in_result, check_out_started, check_out_finished, time.perf_counter())
+
+    @override
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        if not data or not data.get('login_successful'):
+            return self._login_failed_result(data)
+        if data.get('server_state') == self._to_state:
+            return self._skipped_result(f"already in {self._to_state}")
+        if data.get('server_state') == State.OFFLINE:
+            return self._skipped_result("not clocked in")
+
+        check_out_started = time.perf_counter()
+        check_out_result = await self._check_out.aexecute(dict(data, current_state=self._from_state))
+        check_out_finished = time.perf_counter()
+        if not check_out_result.get('last_successful'):
+            return self._transition_result(check_out_result, None, check_out_started, check_out_finished, None)
+
+        check_in_result = await self._check_in.aexecute(self._check_in_data(data, check_out_result))
+        return self._transition_result(check_out_result, check_in_result, check_out_started, check_out_finished, time.perf_counter())
+
+    def _login_failed_result(self, data: dict[str, Any] | None) -> dict[str, Any]:
+        return {
+            'last_successful': False,
+            'error': 'Login failed, cannot proceed with break transition',
+            'previous_error': data.get('error') if data else None
+        }
+
+    def _skipped_result(self, reason: str) -> dict[str, Any]:
+        self._logger.info(f"Skipping break transition, {reason}")
+        return {
+            'last_successful': True,
+            'skipped': True,
+            'skip_reason': reason,
+            'transition_gap_ms': None,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _check_in_data(self, data: dict[str, Any], check_out_result: dict[str, Any]) -> dict[str, Any]:
+        return dict(
+            data,
+            current_state=self._to_state,
+            server_state=check_out_result.get('server_state', data.get('server_state'))
+        )
+
+    def _transition_result(
+        self,
+        check_out_result: dict[str, Any],
+        check_in_result: Optional[dict[str, Any]],
+        check_out_started: float,
+        check_out_finished: float,
+        check_in_finished: Optional[float]
+    ) -> dict[str, Any]:
+        if check_in_result is None:
+            return {
+                'last_successful': False,
+                'error': f"Check-out failed, check-in skipped: {check_out_result.get('error')}",
+                'check_out_successful': False,
+                'check_in_successful': False,
+                'transition_gap_ms': None,
+                'timestamp': datetime.now().isoformat()
+            }
+
+        gap_ms = (check_in_finished - check_out_finished) * 1000
+        self._logger.info(f"Break transition {self._from_state} -> {self._to_state} completed with a {gap_ms:.0f} ms gap between check-out and check-in")
+        return {
+            'last_successful': bool(check_in_result.get('last_successful')),
+            'error': check_in_result.get('error'),
+            'server_state': check_in_result.get('server_state', check_out_result.get('server_state')),
+            'check_out_successful': True,
+            'check_in_successful': bool(check_in_result.get('last_successful')),
+            'check_out_ms': (check_out_finished - check_out_started) * 1000,
+            'transition_gap_ms': gap_ms,
+            'timestamp': datetime.now().isoformat()
+        }
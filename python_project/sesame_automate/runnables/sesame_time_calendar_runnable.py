@@ -0,0 +1,97 @@
+from datetime import date, datetime, timedelta
+import logging
+from typing import Any, Optional, override
+from sesame_automate.config.settings import get_settings
+from sesame_automate.http_client.http_policy import HttpPolicy, get_http_policy
+from sesame_automate.models.runnable_sequence import Runnable
+from sesame_automate.scheduling.working_calendar import WorkingCalendar, expand_days_off, get_working_calendar
+
+class SesameTimeCalendarRunnable(Runnable):
+    def __init__(
+        self,
+        account_name: str,
+        calendar: Optional[WorkingCalendar] = None,
+        lookahead_days: Optional[int] = None,
+        http_policy: Optional[HttpPolicy] = None
+    ):
+        self._base_url = get_settings().base_url
+        self._holidays_endpoint = "/api/v3/employees/{0}/calendar-holidays"
+        self._absences_endpoint = "/api/v3/employees/{0}/absences"
+        self._account_name = account_name
+        self._calendar = calendar or get_working_calendar()
+        self._lookahead_days = lookahead_days if lookahead_days is not None else get_settings().calendar_lookahead_days
+        self._http_policy = http_policy or get_http_policy()
+        self._logger = logging.getLogger(__name__)
+
+    @override
+    def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        if not data or not data.get('login_successful'):
+            return self._login_failed_result(data)
+
+        try:
+            responses = [
+                self._http_policy.request(data['session'], "GET", url, params=params)
+                for url, params in self._calendar_requests(data)
+            ]
+            for response in responses:
+                response.raise_for_status()
+            return self._calendar_result([response.json() for response in responses])
+        except Exception as e:
+            return self._error_result(e)
+
+    @override
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        if not data or not data.get('login_successful'):
+            return self._login_failed_result(data)
+
+        try:
+            responses = [
+                await self._http_policy.arequest(data['async_session'], "GET", url, params=params)
+                for url, params in self._calendar_requests(data)
+            ]
+            for response in responses:
+                response.raise_for_status()
+            return self._calendar_result([response.json() for response in responses])
+        except Exception as e:
+            return self._error_result(e)
+
+    def _login_failed_result(self, data: dict[str, Any] | None) -> dict[str, Any]:
+        return {
+            'last_successful': False,
+            'error': 'Login failed, cannot fetch the working calendar',
+            'previous_error': data.get('error') if data else None
+        }
+
+    def _error_result(self, error: Exception) -> dict[str, Any]:
+        self._logger.warning(f"[{self._account_name}] Failed to refresh the working calendar, keeping the previous one: {error}")
+        return {
+            'last_successful': False,
+            'error': str(error),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _calendar_requests(self, data: dict[str, Any]) -> list[tuple[str, dict[str, str]]]:
+        if not self._base_url:
+            raise ValueError("Please set BASE_URL in your environment variables.")
+        user_id: Optional[str] = data.get("user_info", {}).get("user_id")
+        if not user_id:
+            raise ValueError("User ID is required to fetch the working calendar")
+
+        today = date.today()
+        params = {"from": today.isoformat(), "to": (today + timedelta(days=self._lookahead_days)).isoformat()}
+        return [
+            (self._base_url + self._holidays_endpoint.format(user_id), params),
+            (self._base_url + self._absences_endpoint.format(user_id), params)
+        ]
+
+    def _calendar_result(self, responses: list[dict[str, Any]]) -> dict[str, Any]:
+        days_off: dict[date, str] = {}
+        for response in responses:
+            days_off.update(expand_days_off(response.get("data", [])))
+        self._calendar.update(self._account_name, days_off)
+        self._logger.info(f"[{self._account_name}] Working calendar refreshed, {len(days_off)} days off in the next {self._lookahead_days} days")
+        return {
+            'last_successful': True,
+            'days_off': len(days_off),
+            'timestamp': datetime.now().isoformat()
+        }
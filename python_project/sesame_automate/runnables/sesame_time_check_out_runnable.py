@@ -1,83 +1,21 @@
-from datetime import datetime
-import json
-import logging
-import os
-import traceback
-from typing import Any, Dict, Optional, override
-import requests
+from typing import Any, Optional, override
+from sesame_automate.models.day_plan import DayPlan
 from sesame_automate.models.enums.state import State
-from sesame_automate.models.runnable_sequence import Runnable
+from sesame_automate.runnables.sesame_time_clock_runnable import SesameTimeClockRunnable
+
+class SesameTimeCheckOutRunnable(SesameTimeClockRunnable):
+    operation = "check-out"
+
+    @override
+    def _target_state(self, data: dict[str, Any]) -> State:
+        return State.OFFLINE
 
-class SesameTimeCheckOutRunnable(Runnable):
-    def __init__(self):
-        self._base_url = os.getenv("BASE_URL")
-        self._check_out_endpoint = "/api/v3/employees/{}/check-out"
-        self._logger = logging.getLogger(__name__)
-        
     @override
-    def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
-        if not data or not data.get('login_successful'):
-            return {
-                'last_successful': False,
-                'error': 'Login failed, cannot proceed with check-out',
-                'previous_error': data.get('error') if data else None
-            }
-        
-        try:
-            self._check_out(data)
-            return {
-                'last_successful': True,
-                'timestamp': datetime.now().isoformat()
-            }
-        except Exception as e:
-            self._logger.error(f"Check-out failed: {str(e)}")
-            traceback.print_exc() 
-            return {
-                'last_successful': False,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            }
-    
-    def _check_out(self, data: dict[str, Any]) -> None:
-        if not self._base_url:
-            raise ValueError("Please set BASE_URL in your environment variables.")
-        session: requests.Session = data['session']
-        user_id: Optional[str] = data.get("user_info", {}).get("user_id")
-        if not user_id:
-            raise ValueError("User ID is required to perform check-out")
-        current_state: State = data.get("current_state", State.UNKNOWN)
-        if current_state == State.UNKNOWN:
-            raise ValueError("Current state is unknown, cannot perform check-out")
-        
-        check_out_url = self._base_url + self._check_out_endpoint.format(user_id)
-        
-        headers = {'Content-Type': 'application/json'}
-        
-        work_check_type_id: Optional[str] = None
-        if current_state == State.BREAK:
-            work_check_type_id = data.get("work_break_id")
-            self._logger.info("Performing check-out BREAK")
-        elif current_state == State.WORKING:
-            if os.getenv("REMOTE_WORK_DAYS") != "" and datetime.now().strftime("%A") in os.getenv("REMOTE_WORK_DAYS", "").split(","):
-                check_types = data.get("check_types", [])
-                remote_checks = [x for x in check_types if x.get("workType") == "remote" and x.get("status") == "active"]
-                if len(remote_checks) == 0:
-                    raise ValueError("No remote work check type found")
-                self._logger.info("Performing check-out REMOTE")
-                work_check = remote_checks[0]
-                work_check_type_id = work_check.get("id")
-            else:
-                self._logger.info("Performing check-out NORMAL")
-                work_check_type_id = None
+    def _skip_reason(self, data: dict[str, Any]) -> Optional[str]:
+        if data.get("server_state") == State.OFFLINE:
+            return "already checked out"
+        return None
 
-        payload = {
-            "coordinates": {},
-            "origin": "web",
-            "workCheckTypeId" : work_check_type_id
-        }
-        self._logger.info(f"Trying check out")
-        
-        response = session.post(check_out_url, json=payload, headers=headers)
-        response.raise_for_status()
-        
-        self._logger.info(f"Check-out successful at {datetime.now()}")
+    @override
+    def _clock_url(self, plan: DayPlan) -> str:
+        return plan.check_out_url
@@ -0,0 +1,88 @@
+from datetime import datetime
+import logging
+from typing import Any, Optional, override
+from sesame_automate.config.settings import get_settings
+from sesame_automate.http_client.http_policy import HttpPolicy, get_http_policy
+from sesame_automate.models.enums.state import State
+from sesame_automate.models.runnable_sequence import Runnable
+from sesame_automate.stores.state_store import StateStore, get_state_store
+
+WORK_STATUS_STATES = {
+    "online": State.WORKING,
+    "paused": State.BREAK,
+    "offline": State.OFFLINE
+}
+
+class SesameTimeCheckStatusRunnable(Runnable):
+    def __init__(self, state_store: Optional[StateStore] = None, http_policy: Optional[HttpPolicy] = None):
+        self._base_url = get_settings().base_url
+        self._employee_endpoint = "/api/v3/employees/{}"
+        self._state_store = state_store or get_state_store()
+        self._http_policy = http_policy or get_http_policy()
+        self._logger = logging.getLogger(__name__)
+
+    @override
+    def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        if not data or not data.get('login_successful'):
+            return self._login_failed_result(data)
+
+        try:
+            response = self._http_policy.request(data['session'], "GET", self._employee_url(data))
+            response.raise_for_status()
+            return self._status_result(data, response.json())
+        except Exception as e:
+            return self._fallback_result(data, e)
+
+    @override
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        if not data or not data.get('login_successful'):
+            return self._login_failed_result(data)
+
+        try:
+            response = await self._http_policy.arequest(data['async_session'], "GET", self._employee_url(data))
+            response.raise_for_status()
+            return self._status_result(data, response.json())
+        except Exception as e:
+            return self._fallback_result(data, e)
+
+    def _login_failed_result(self, data: dict[str, Any] | None) -> dict[str, Any]:
+        return {
+            'last_successful': False,
+            'error': 'Login failed, cannot fetch check status',
+            'previous_error': data.get('error') if data else None
+        }
+
+    def _employee_url(self, data: dict[str, Any]) -> str:
+        if not self._base_url:
+            raise ValueError("Please set BASE_URL in your environment variables.")
+        user_id: Optional[str] = data.get("user_info", {}).get("user_id")
+        if not user_id:
+            raise ValueError("User ID is required to fetch the check status")
+        return self._base_url + self._employee_endpoint.format(user_id)
+
+    def _status_result(self, data: dict[str, Any], response: dict[str, Any]) -> dict[str, Any]:
+        employee = response.get("data", {})
+        if isinstance(employee, list):
+            employee = employee[0] if employee else {}
+        server_state = WORK_STATUS_STATES.get(employee.get("workStatus"), State.UNKNOWN)
+        if data.get('account'):
+            self._state_store.set(data['account'], server_state, "server")
+        self._logger.info(f"Current check status is {server_state}")
+        return {
+            'last_successful': True,
+            'server_state': server_state,
+            'state_store': self._state_store,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _fallback_result(self, data: dict[str, Any], error: Exception) -> dict[str, Any]:
+        stored_state = self._state_store.get(data['account']) if data.get('account') else None
+        self._logger.warning(f"Failed to fetch check status, clock events will be posted without reconciliation: {error}")
+        return {
+            'last_successful': True,
+            'server_state': State.UNKNOWN,
+            'last_known_state': stored_state['state'] if stored_state else State.UNKNOWN,
+            'state_store': self._state_store,
+            'status_error': str(error),
+            'timestamp': datetime.now().isoformat()
+        }
@@ -0,0 +1,193 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+import logging
+import uuid
+from sesame_automate.models.enums.state import State
+from typing import Any, Optional, override
+import requests
+from sesame_automate.http_client.http_policy import RETRYABLE_STATUSES, HttpPolicy, get_http_policy
+from sesame_automate.models.day_plan import DayPlan
+from sesame_automate.models.runnable_sequence import Runnable
+from sesame_automate.planning.day_planner import DayPlanner, get_day_planner
+from sesame_automate.stores.clock_outbox import ClockOutbox, get_clock_outbox
+from sesame_automate.stores.reference_cache import ReferenceCache, get_reference_cache
+
+class SesameTimeClockRunnable(Runnable, ABC):
+    operation = "clock"
+
+    def __init__(
+        self,
+        reference_cache: Optional[ReferenceCache] = None,
+        remote_work_days: Optional[list[str]] = None,
+        http_policy: Optional[HttpPolicy] = None,
+        day_planner: Optional[DayPlanner] = None,
+        clock_outbox: Optional[ClockOutbox] = None
+    ):
+        self._reference_cache = reference_cache or get_reference_cache()
+        self._remote_work_days = remote_work_days
+        self._http_policy = http_policy or get_http_policy()
+        self._day_planner = day_planner or get_day_planner()
+        self._clock_outbox = clock_outbox or get_clock_outbox()
+        self._logger = logging.getLogger(type(self).__module__)
+
+    @override
+    def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        if not data or not data.get('login_successful'):
+            return self._login_failed_result(data)
+
+        try:
+            skip_reason = self._skip_reason(data)
+            if skip_reason:
+                return self._skipped_result(skip_reason)
+            event_id = self._clock(data)
+            return self._posted_result(data, event_id)
+        except Exception as e:
+            return self._error_result(e)
+
+    @override
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        if not data or not data.get('login_successful'):
+            return self._login_failed_result(data)
+
+        try:
+            skip_reason = self._skip_reason(data)
+            if skip_reason:
+                return self._skipped_result(skip_reason)
+            event_id = await self._aclock(data)
+            return self._posted_result(data, event_id)
+        except Exception as e:
+            return self._error_result(e)
+
+    @property
+    def _event_type(self) -> str:
+        return self.operation.replace("-", "_")
+
+    @abstractmethod
+    def _target_state(self, data: dict[str, Any]) -> State:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _skip_reason(self, data: dict[str, Any]) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _clock_url(self, plan: DayPlan) -> str:
+        raise NotImplementedError
+
+    def _skipped_result(self, skip_reason: str) -> dict[str, Any]:
+        self._logger.info(f"Skipping {self.operation}: {skip_reason}")
+        return {
+            'last_successful': True,
+            'skipped': True,
+            'skip_reason': skip_reason,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _record_state(self, data: dict[str, Any]) -> State:
+        target_state = self._target_state(data)
+        if data.get("state_store") and data.get("account"):
+            data["state_store"].set(data["account"], target_state, "local")
+        return target_state
+
+    def _posted_result(self, data: dict[str, Any], event_id: Optional[str]) -> dict[str, Any]:
+        if event_id:
+            return {
+                'last_successful': True,
+                'server_state': data.get('server_state', State.UNKNOWN),
+                'queued': True,
+                'queued_state': self._target_state(data),
+                'outbox_event_id': event_id,
+                'timestamp': datetime.now().isoformat()
+            }
+        return {
+            'last_successful': True,
+            'server_state': self._record_state(data),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _enqueue(self, data: dict[str, Any], url: str, payload: dict[str, Any]) -> str:
+        event_id = self._clock_outbox.enqueue(
+            data.get("account"), self._event_type, self._target_state(data), url, payload, data.get("scheduled_at")
+        )
+        self._logger.info(f"{self.operation.capitalize()} queued in the outbox as {event_id}")
+        return event_id
+
+    def _login_failed_result(self, data: dict[str, Any] | None) -> dict[str, Any]:
+        return {
+            'last_successful': False,
+            'error': f'Login failed, cannot proceed with {self.operation}',
+            'previous_error': data.get('error') if data else None
+        }
+
+    def _error_result(self, error: Exception) -> dict[str, Any]:
+        self._logger.error(f"{self.operation.capitalize()} failed: {str(error)}", exc_info=error)
+        return {
+            'last_successful': False,
+            'error': str(error),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _clock(self, data: dict[str, Any]) -> Optional[str]:
+        session: requests.Session = data['session']
+        url, payload = self._prepare(data)
+        if self._clock_outbox.should_queue(data.get("account")):
+            return self._enqueue(data, url, payload)
+        headers = {'Content-Type': 'application/json', 'Idempotency-Key': str(uuid.uuid4())}
+
+        self._logger.info(f"Trying {self.operation}")
+
+        try:
+            response = self._http_policy.request(session, "POST", url, json=payload, headers=headers)
+            self._invalidate_on_rejection(data, response.status_code)
+            response.raise_for_status()
+        except Exception as e:
+            if not self._clock_outbox.accepts(e):
+                raise
+            self._logger.warning(f"{self.operation.capitalize()} failed, keeping it for delivery once the backend recovers: {e}")
+            return self._enqueue(data, url, payload)
+
+        self._logger.info(f"{self.operation.capitalize()} successful at {datetime.now()}")
+        return None
+
+    async def _aclock(self, data: dict[str, Any]) -> Optional[str]:
+        session = data['async_session']
+        url, payload = self._prepare(data)
+        if self._clock_outbox.should_queue(data.get("account")):
+            return self._enqueue(data, url, payload)
+
+        self._logger.info(f"Trying {self.operation}")
+
+        try:
+            response = await self._http_policy.arequest(session, "POST", url, json=payload, headers={'Idempotency-Key': str(uuid.uuid4())})
+            self._invalidate_on_rejection(data, response.status_code)
+            response.raise_for_status()
+        except Exception as e:
+            if not self._clock_outbox.accepts(e):
+                raise
+            self._logger.warning(f"{self.operation.capitalize()} failed, keeping it for delivery once the backend recovers: {e}")
+            return self._enqueue(data, url, payload)
+
+        self._logger.info(f"{self.operation.capitalize()} successful at {datetime.now()}")
+        return None
+
+    def _invalidate_on_rejection(self, data: dict[str, Any], status_code: int) -> None:
+        if status_code >= 400 and status_code not in RETRYABLE_STATUSES:
+            self._reference_cache.invalidate(data.get("account"))
+            self._day_planner.invalidate(data.get("account"))
+
+    def _prepare(self, data: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+        current_state: State = data.get("current_state", State.UNKNOWN)
+        if current_state == State.UNKNOWN:
+            raise ValueError(f"Current state is unknown, cannot perform {self.operation}")
+
+        plan: Optional[DayPlan] = data.get("day_plan")
+        if plan is None:
+            plan = DayPlan.build(
+                data.get("account"),
+                data.get("user_info", {}).get("user_id"),
+                data.get("check_types", []),
+                data.get("work_break_id"),
+                self._remote_work_days
+            )
+        self._logger.info(f"Performing {self.operation} {plan.mode(current_state)}")
+        return self._clock_url(plan), plan.payload(current_state)
@@ -0,0 +1,87 @@
+from datetime import datetime
+import logging
+from typing import Any, Optional, override
+from sesame_automate.models.day_plan import DayPlan
+from sesame_automate.models.runnable_parallel import RunnableParallel
+from sesame_automate.models.runnable_sequence import Runnable
+from sesame_automate.planning.day_planner import DayPlanner, get_day_planner
+
+class SesameTimeDayPlanRunnable(Runnable):
+    def __init__(
+        self,
+        assigned_work_check_types: Runnable,
+        work_break: Runnable,
+        remote_work_days: Optional[list[str]] = None,
+        day_planner: Optional[DayPlanner] = None
+    ):
+        self._references = RunnableParallel(assigned_work_check_types, work_break)
+        self._remote_work_days = remote_work_days
+        self._day_planner = day_planner or get_day_planner()
+        self._logger = logging.getLogger(__name__)
+
+    @override
+    def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        if not data or not data.get('login_successful'):
+            return self._login_failed_result(data)
+
+        try:
+            plan = self._day_planner.get(data.get('account'))
+            if plan is None:
+                references = data if self._has_references(data) else self._references.execute(data)
+                if not references.get('last_successful', True):
+                    return self._error_result(references.get('error'))
+                plan = self._compile(data, references)
+            return self._plan_result(plan)
+        except Exception as e:
+            return self._error_result(e)
+
+    @override
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        if not data or not data.get('login_successful'):
+            return self._login_failed_result(data)
+
+        try:
+            plan = self._day_planner.get(data.get('account'))
+            if plan is None:
+                references = data if self._has_references(data) else await self._references.aexecute(data)
+                if not references.get('last_successful', True):
+                    return self._error_result(references.get('error'))
+                plan = self._compile(data, references)
+            return self._plan_result(plan)
+        except Exception as e:
+            return self._error_result(e)
+
+    def _login_failed_result(self, data: dict[str, Any] | None) -> dict[str, Any]:
+        return {
+            'last_successful': False,
+            'error': 'Login failed, cannot compile the day plan',
+            'previous_error': data.get('error') if data else None
+        }
+
+    def _error_result(self, error: Any) -> dict[str, Any]:
+        self._logger.error(f"Failed to compile the day plan: {error}")
+        return {
+            'last_successful': False,
+            'error': str(error),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _has_references(self, data: dict[str, Any]) -> bool:
+        return 'check_types' in data and 'work_break_id' in data
+
+    def _compile(self, data: dict[str, Any], references: dict[str, Any]) -> DayPlan:
+        return self._day_planner.compile(
+            data.get('account'),
+            data.get("user_info", {}).get("user_id"),
+            references.get("check_types", []),
+            references.get("work_break_id"),
+            self._remote_work_days
+        )
+
+    def _plan_result(self, plan: DayPlan) -> dict[str, Any]:
+        return {
+            'last_successful': True,
+            'day_plan': plan,
+            'work_break_id': plan.work_break_id,
+            'timestamp': datetime.now().isoformat()
+        }
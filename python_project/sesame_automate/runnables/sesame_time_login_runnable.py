@@ -1,40 +1,169 @@
+import asyncio
 import logging
-import os
-import traceback
-from typing import Any, Dict, override
-import requests
+import threading
+import weakref
+from typing import Any, Dict, Optional, override
+from sesame_automate.config.settings import get_settings
+from sesame_automate.http_client.async_client import AsyncSesameClient, get_async_http_pool
+from sesame_automate.http_client.cassette import mount_cassette
+from sesame_automate.http_client.http_policy import HttpPolicy, get_http_policy
+from sesame_automate.http_client.session_refresher import AsyncSessionRefresher, AuthenticatedSession, SessionRefresher
 from sesame_automate.models.runnable_sequence import Runnable
+from sesame_automate.stores.session_store import SessionStore, get_session_store
 
 
 class SesameTimeLoginRunnable(Runnable):
 
-    def __init__(self):
-        self.session = requests.Session()
-        self._base_url = os.getenv("BASE_URL")
+    def __init__(self, session_store: Optional[SessionStore] = None, email: Optional[str] = None, password: Optional[str] = None, http_policy: Optional[HttpPolicy] = None):
+        self.session = mount_cassette(AuthenticatedSession(SessionRefresher(self._refresh_session)))
+        self._async_refresher = AsyncSessionRefresher(self._arefresh_session)
+        self._async_sessions: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncSesameClient] = weakref.WeakKeyDictionary()
+        self._async_sessions_lock = threading.Lock()
+        self._base_url = get_settings().base_url
         self._login_url = "/api/v3/security/login"
-        self._email = os.getenv("SESAME_EMAIL")
-        self._password = os.getenv("SESAME_PASSWORD")
+        self._email = email or get_settings().email
+        self._password = password or get_settings().password
+        self._session_store = session_store or get_session_store()
+        self._http_policy = http_policy or get_http_policy()
         self._logger = logging.getLogger(__name__)
+
+    @property
+    def async_session(self) -> Optional[AsyncSesameClient]:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        with self._async_sessions_lock:
+            return self._async_sessions.get(loop)
         
     @override
     def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
         try:
-            self._login()
-            return {
+            stored_session = self._restore_session()
+            if stored_session is None:
+                self._login()
+            result = {
                 'session': self.session,
-                'login_successful': True
+                'login_successful': True,
+                'session_reused': stored_session is not None,
+                'session_store': self._session_store,
+                'account': self._email
             }
+            if stored_session and stored_session.get('user_info'):
+                result['user_info'] = stored_session['user_info']
+            return result
         except Exception as e:
-            self._logger.error(f"Login failed: {e}")
-            self._logger.error(f"Traceback: {traceback.format_exc()}")
+            self._logger.error(f"Login failed: {e}", exc_info=True)
             return {
                 'session': None,
                 'login_successful': False,
                 'error': str(e)
             }
+
+    @override
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        try:
+            loop = asyncio.get_running_loop()
+            with self._async_sessions_lock:
+                if loop not in self._async_sessions:
+                    self._async_sessions[loop] = get_async_http_pool().client(refresher=self._async_refresher)
+            stored_session = self._restore_async_session()
+            if stored_session is None:
+                await self._alogin()
+            result = {
+                'async_session': self.async_session,
+                'login_successful': True,
+                'session_reused': stored_session is not None,
+                'session_store': self._session_store,
+                'account': self._email
+            }
+            if stored_session and stored_session.get('user_info'):
+                result['user_info'] = stored_session['user_info']
+            return result
+        except Exception as e:
+            self._logger.error(f"Login failed: {e}", exc_info=True)
+            return {
+                'async_session': None,
+                'login_successful': False,
+                'error': str(e)
+            }
+
+    def _restore_session(self) -> Optional[dict[str, Any]]:
+        if not self._email:
+            return None
+        stored_session = self._session_store.load(self._email)
+        if not stored_session or not stored_session.get('usid'):
+            return None
+        if self.session.cookies.get('USID') != stored_session['usid']:
+            self._set_session_cookie(stored_session['usid'])
+            self._logger.info("Reusing stored session")
+        return stored_session
+
+    def _restore_async_session(self) -> Optional[dict[str, Any]]:
+        if not self._email:
+            return None
+        stored_session = self._session_store.load(self._email)
+        if not stored_session or not stored_session.get('usid'):
+            return None
+        if self.async_session.cookies.get('USID') != stored_session['usid']:
+            self.async_session.cookies.set('USID', stored_session['usid'], domain=get_settings().cookie_domain or "", path='/')
+            self._logger.info("Reusing stored session")
+        return stored_session
+
+    def _refresh_session(self) -> None:
+        stored_usid = self._newer_stored_usid(self.session.cookies.get('USID'))
+        if stored_usid:
+            self._set_session_cookie(stored_usid)
+            return
+        self._logger.info("Session rejected, logging in again")
+        if self._email:
+            self._session_store.invalidate(self._email)
+        self._login()
+
+    async def _arefresh_session(self) -> None:
+        stored_usid = self._newer_stored_usid(self.async_session.cookies.get('USID'))
+        if stored_usid:
+            self.async_session.cookies.set('USID', stored_usid, domain=get_settings().cookie_domain or "", path='/')
+            return
+        self._logger.info("Session rejected, logging in again")
+        if self._email:
+            self._session_store.invalidate(self._email)
+        await self._alogin()
+
+    def _newer_stored_usid(self, rejected_usid: Optional[str]) -> Optional[str]:
+        if not self._email:
+            return None
+        stored_session = self._session_store.load(self._email)
+        if not stored_session or not stored_session.get('usid') or stored_session['usid'] == rejected_usid:
+            return None
+        self._logger.info("Session rejected, reusing the session stored by another login")
+        return stored_session['usid']
     
     def _login(self) -> None:
+        full_login_url, payload = self._prepare_login()
         
+        response = self._http_policy.request(self.session, "POST", full_login_url, idempotent=True, json=payload)
+        response.raise_for_status()
+        session_id = self._session_id(response.json())
+        self._set_session_cookie(session_id)
+        self._session_store.save_session(self._email, session_id)
+
+        from datetime import datetime
+        self._logger.info(f"Login successful at {datetime.now()}")
+
+    async def _alogin(self) -> None:
+        full_login_url, payload = self._prepare_login()
+
+        response = await self._http_policy.arequest(self.async_session, "POST", full_login_url, idempotent=True, json=payload)
+        response.raise_for_status()
+        session_id = self._session_id(response.json())
+        self.async_session.cookies.set('USID', session_id, domain=get_settings().cookie_domain or "", path='/')
+        self._session_store.save_session(self._email, session_id)
+
+        from datetime import datetime
+        self._logger.info(f"Login successful at {datetime.now()}")
+
+    def _prepare_login(self) -> tuple[str, dict[str, Any]]:
         if not self._base_url or not self._login_url:
             raise ValueError("Please set BASE_URL and LOGIN_URL in your environment variables.")
         if not self._email or not self._password:
@@ -51,24 +180,22 @@ class SesameTimeLoginRunnable(Runnable):
             "email": self._email,
             "password": self._password
         }
-        
-        response = self.session.post(full_login_url, json=payload)
-        response.raise_for_status()
-        response_data = response.json()
-        if 'data' in response_data:
-            session_id = response_data['data']
-            from datetime import datetime, timedelta
-            expires = datetime.now() + timedelta(days=365)
-            expires_ts = int(expires.timestamp())
-            
-            self.session.cookies.set(
-                name='USID',
-                value=session_id,
-                domain=os.getenv("COOKIE_DOMAIN"),
-                path='/',
-                expires=expires_ts
-            )
-            
-            self._logger.info(f"Login successful at {datetime.now()}")
-        else:
+        return full_login_url, payload
+
+    def _session_id(self, response_data: dict[str, Any]) -> str:
+        if 'data' not in response_data:
             raise ValueError("Unexpected response format: 'data' field not found")
+        return response_data['data']
+
+    def _set_session_cookie(self, session_id: str) -> None:
+        from datetime import datetime, timedelta
+        expires = datetime.now() + timedelta(days=365)
+        expires_ts = int(expires.timestamp())
+
+        self.session.cookies.set(
+            name='USID',
+            value=session_id,
+            domain=get_settings().cookie_domain,
+            path='/',
+            expires=expires_ts
+        )
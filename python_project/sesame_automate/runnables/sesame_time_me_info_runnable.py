@@ -1,18 +1,48 @@
 import logging
-import os
-import traceback
-from typing import Any, Dict, override
+from typing import Any, Dict, Optional, override
 import requests
+from sesame_automate.config.settings import get_settings
 from sesame_automate.models.runnable_sequence import Runnable
+from sesame_automate.stores.reference_cache import ReferenceCache, get_reference_cache
 
 class SesameTimeMeInfoRunnable(Runnable):
-    def __init__(self):
-        self._base_url = os.getenv("BASE_URL")
+    def __init__(self, reference_cache: Optional[ReferenceCache] = None):
+        self._base_url = get_settings().base_url
         self._me_info_endpoint = "/api/v3/security/me"
+        self._reference_cache = reference_cache or get_reference_cache()
         self._logger = logging.getLogger(__name__)
         
     @override
     def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        early_result = self._early_result(data)
+        if early_result is not None:
+            return early_result
+
+        try:
+            return self._user_info_result(data, self._fetch_me_info(data['session'], data.get('account')))
+        except Exception as e:
+            self._logger.error(f"Failed to fetch user info: {e}")
+            return {
+                'last_successful': False,
+                'error': str(e)
+            }
+
+    @override
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        early_result = self._early_result(data)
+        if early_result is not None:
+            return early_result
+
+        try:
+            return self._user_info_result(data, await self._afetch_me_info(data['async_session'], data.get('account')))
+        except Exception as e:
+            self._logger.error(f"Failed to fetch user info: {e}")
+            return {
+                'last_successful': False,
+                'error': str(e)
+            }
+
+    def _early_result(self, data: dict[str, Any] | None) -> Optional[dict[str, Any]]:
         if not data or not data.get('login_successful'):
             return {
                 'last_successful': False,
@@ -20,43 +50,49 @@ class SesameTimeMeInfoRunnable(Runnable):
                 'previous_error': data.get('error') if data else None
             }
         
-        try:
-            user_info = self._fetch_me_info(data['session'])
-            
-            if len(user_info.get("data",[])) == 0:
-                return {
-                    'last_successful': False,
-                    'error': 'Failed to retrieve user info'
-                }
-            user_info = user_info.get("data",[])[0]
-
+        if data.get('user_info'):
+            cached_user_info = data['user_info']
             if data.get("is_welcome", False):
-                self._logger.info(f"User info retrieved for {user_info.get('firstName')} {user_info.get('lastName')} in company {user_info.get('companyName')}")
-            
+                self._logger.info(f"User info restored for {cached_user_info.get('full_name')} in company {cached_user_info.get('company_name')}")
             return {
                 'last_successful': True,
-                'user_info': {
-                    "company_id": user_info.get('companyId'),
-                    "user_id": user_info.get('id'),
-                    "full_name": user_info.get('firstName') + ' ' + user_info.get('lastName'),
-                    "company_name": user_info.get('companyName')
-                }
+                'user_info': cached_user_info
             }
-        except Exception as e:
-            self._logger.error(f"Failed to fetch user info: {e}")
+        return None
+
+    def _user_info_result(self, data: dict[str, Any], user_info: Dict[str, Any]) -> dict[str, Any]:
+        if len(user_info.get("data",[])) == 0:
             return {
                 'last_successful': False,
-                'error': str(e)
+                'error': 'Failed to retrieve user info'
             }
+        user_info = user_info.get("data",[])[0]
+
+        if data.get("is_welcome", False):
+            self._logger.info(f"User info retrieved for {user_info.get('firstName')} {user_info.get('lastName')} in company {user_info.get('companyName')}")
+        
+        user_info = {
+            "company_id": user_info.get('companyId'),
+            "user_id": user_info.get('id'),
+            "full_name": user_info.get('firstName') + ' ' + user_info.get('lastName'),
+            "company_name": user_info.get('companyName')
+        }
+        if data.get('session_store') and data.get('account'):
+            data['session_store'].save_user_info(data['account'], user_info)
+
+        return {
+            'last_successful': True,
+            'user_info': user_info
+        }
     
-    def _fetch_me_info(self, session: requests.Session) -> Dict[str, Any]:
+    def _fetch_me_info(self, session: requests.Session, account: Optional[str] = None) -> Dict[str, Any]:
+        return self._reference_cache.get_json(session, self._me_info_url(), account)
+
+    async def _afetch_me_info(self, session: Any, account: Optional[str] = None) -> Dict[str, Any]:
+        return await self._reference_cache.aget_json(session, self._me_info_url(), account)
+
+    def _me_info_url(self) -> str:
         if not self._base_url:
             raise ValueError("Please set BASE_URL in your environment variables.")
         
-        me_info_url = self._base_url + self._me_info_endpoint
-        
-        response = session.get(me_info_url)
-        response.raise_for_status()
-        
-        return response.json()
-
+        return self._base_url + self._me_info_endpoint
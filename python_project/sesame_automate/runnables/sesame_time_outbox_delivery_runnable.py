@@ -0,0 +1,84 @@
+from datetime import datetime
+import logging
+from typing import Any, Optional, override
+from sesame_automate.http_client.http_policy import HttpPolicy, get_http_policy, is_transient_error
+from sesame_automate.models.runnable_sequence import Runnable
+
+class SesameTimeOutboxDeliveryRunnable(Runnable):
+    def __init__(self, http_policy: Optional[HttpPolicy] = None):
+        self._http_policy = http_policy or get_http_policy()
+        self._logger = logging.getLogger(__name__)
+
+    @override
+    def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        if not data or not data.get('login_successful'):
+            return self._login_failed_result(data)
+
+        event = data['outbox_event']
+        if data.get('server_state') == event['target_state']:
+            return self._duplicate_result(data, event)
+        try:
+            response = self._http_policy.request(
+                data['session'], "POST", event['url'], json=event['payload'],
+                headers={'Content-Type': 'application/json', 'Idempotency-Key': event['id']}
+            )
+            response.raise_for_status()
+            return self._delivered_result(data, event)
+        except Exception as e:
+            return self._error_result(event, e)
+
+    @override
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        if not data or not data.get('login_successful'):
+            return self._login_failed_result(data)
+
+        event = data['outbox_event']
+        if data.get('server_state') == event['target_state']:
+            return self._duplicate_result(data, event)
+        try:
+            response = await self._http_policy.arequest(
+                data['async_session'], "POST", event['url'], json=event['payload'],
+                headers={'Idempotency-Key': event['id']}
+            )
+            response.raise_for_status()
+            return self._delivered_result(data, event)
+        except Exception as e:
+            return self._error_result(event, e)
+
+    def _login_failed_result(self, data: dict[str, Any] | None) -> dict[str, Any]:
+        return {
+            'last_successful': False,
+            'error': 'Login failed, cannot deliver the queued clock event',
+            'previous_error': data.get('error') if data else None,
+            'retryable': True
+        }
+
+    def _duplicate_result(self, data: dict[str, Any], event: dict[str, Any]) -> dict[str, Any]:
+        self._logger.info(f"Queued {event['event_type']} {event['id']} already accepted, server state is {event['target_state']}")
+        return {
+            'last_successful': True,
+            'delivery_status': 'duplicate',
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _delivered_result(self, data: dict[str, Any], event: dict[str, Any]) -> dict[str, Any]:
+        if data.get('state_store') and data.get('account'):
+            data['state_store'].set(data['account'], event['target_state'], "local")
+        delay = datetime.now().timestamp() - event['scheduled_at']
+        self._logger.info(f"Queued {event['event_type']} {event['id']} delivered {delay:.0f}s after it was scheduled")
+        return {
+            'last_successful': True,
+            'delivery_status': 'sent',
+            'server_state': event['target_state'],
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _error_result(self, event: dict[str, Any], error: Exception) -> dict[str, Any]:
+        retryable = is_transient_error(error)
+        self._logger.warning(f"Could not deliver queued {event['event_type']} {event['id']}{', will retry' if retryable else ''}: {error}")
+        return {
+            'last_successful': False,
+            'error': str(error),
+            'retryable': retryable,
+            'timestamp': datetime.now().isoformat()
+        }
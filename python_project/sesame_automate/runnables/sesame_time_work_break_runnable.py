@@ -1,57 +1,85 @@
 from datetime import datetime
 import logging
-import os
-import traceback
 from typing import Any, Dict, Optional, override
 import requests
+from sesame_automate.config.settings import get_settings
 from sesame_automate.models.runnable_sequence import Runnable
+from sesame_automate.stores.reference_cache import ReferenceCache, get_reference_cache
 
 class SesameTimeWorkBreakRunnable(Runnable):
     
-    def __init__(self):
-        self._base_url = os.getenv("BASE_URL")
+    def __init__(self, reference_cache: Optional[ReferenceCache] = None, break_name: Optional[str] = None):
+        self._base_url = get_settings().base_url
         self._work_break_endpoint = "/api/v3/companies/{0}/work-breaks"
+        self._reference_cache = reference_cache or get_reference_cache()
+        self._break_name = break_name
         self._logger = logging.getLogger(__name__)
 
     @override
     def execute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
         if not data or not data.get('login_successful'):
-            return {
-                'last_successful': False,
-                'error': 'Login failed, cannot proceed with work break',
-                'previous_error': data.get('error') if data else None
-            }
+            return self._login_failed_result(data)
         
         try:
-            work_break_info = self._work_break(data['session'], data.get("user_info", {}).get("company_id"))
-            if work_break_info and data.get("is_welcome", False):
-                self._logger.info(f"Work break '{work_break_info.get('name')}' found with ID: {work_break_info.get('id')}")
-
-            return {
-                'last_successful': True,
-                'timestamp': datetime.now().isoformat(),
-                "work_break_id": work_break_info.get("id") if work_break_info else None
-            }
+            work_break_info = self._work_break(data['session'], data.get("user_info", {}).get("company_id"), data.get('account'))
+            return self._work_break_result(data, work_break_info)
         except Exception as e:
-            return {
-                'last_successful': False,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            }
+            return self._error_result(e)
+
+    @override
+    async def aexecute(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
+        if not data or not data.get('login_successful'):
+            return self._login_failed_result(data)
+
+        try:
+            work_break_info = await self._awork_break(data['async_session'], data.get("user_info", {}).get("company_id"), data.get('account'))
+            return self._work_break_result(data, work_break_info)
+        except Exception as e:
+            return self._error_result(e)
+
+    def _login_failed_result(self, data: dict[str, Any] | None) -> dict[str, Any]:
+        return {
+            'last_successful': False,
+            'error': 'Login failed, cannot proceed with work break',
+            'previous_error': data.get('error') if data else None
+        }
+
+    def _error_result(self, error: Exception) -> dict[str, Any]:
+        return {
+            'last_successful': False,
+            'error': str(error),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _work_break_result(self, data: dict[str, Any], work_break_info: Optional[dict[str, Any]]) -> dict[str, Any]:
+        if work_break_info and data.get("is_welcome", False):
+            self._logger.info(f"Work break '{work_break_info.get('name')}' found with ID: {work_break_info.get('id')}")
+
+        return {
+            'last_successful': True,
+            'timestamp': datetime.now().isoformat(),
+            "work_break_id": work_break_info.get("id") if work_break_info else None
+        }
     
-    def _work_break(self, session: requests.Session, company_id: Optional[str] = None) -> None:
+    def _work_break(self, session: requests.Session, company_id: Optional[str] = None, account: Optional[str] = None) -> Optional[dict[str, Any]]:
+        response = self._reference_cache.get_json(session, self._work_break_url(company_id), account)
+        return self._select_work_break(response)
+
+    async def _awork_break(self, session: Any, company_id: Optional[str] = None, account: Optional[str] = None) -> Optional[dict[str, Any]]:
+        response = await self._reference_cache.aget_json(session, self._work_break_url(company_id), account)
+        return self._select_work_break(response)
+
+    def _work_break_url(self, company_id: Optional[str]) -> str:
         if not self._base_url:
             raise ValueError("Please set BASE_URL in your environment variables.")
         
         if not company_id:
             raise ValueError("Company ID is required to fetch work break info")
         
-        work_break_url = self._base_url + self._work_break_endpoint.format(company_id)
-        
-        response = session.get(work_break_url)
-        response.raise_for_status()
-        response = response.json()
+        return self._base_url + self._work_break_endpoint.format(company_id)
+
+    def _select_work_break(self, response: dict[str, Any]) -> Optional[dict[str, Any]]:
         if len(response.get("data",[])) == 0:
             raise ValueError("Failed to retrieve work break info")
-        work_break_info = filter(lambda wb: wb.get("name") == os.getenv("BREAK_NAME"), response.get("data",[]))
+        work_break_info = filter(lambda wb: wb.get("name") == (self._break_name or get_settings().break_name), response.get("data",[]))
         return next(work_break_info, None)
@@ -0,0 +1,4 @@
+from sesame_automate.scheduling.spread_trigger import SpreadTrigger, account_offset, spread_trigger
+from sesame_automate.scheduling.catch_up import RunHistoryListener, last_fire_time, schedule_catch_ups
+from sesame_automate.scheduling.working_calendar import WorkingCalendar, expand_days_off, get_working_calendar
+from sesame_automate.scheduling.outbox_drainer import OutboxDrainer
@@ -0,0 +1,94 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED, JobExecutionEvent
+from apscheduler.schedulers.base import BaseScheduler
+from apscheduler.triggers.base import BaseTrigger
+from sesame_automate.stores.run_history import RunHistory
+
+EVENT_STATUSES = {
+    EVENT_JOB_EXECUTED: "executed",
+    EVENT_JOB_ERROR: "error",
+    EVENT_JOB_MISSED: "missed",
+    EVENT_JOB_MAX_INSTANCES: "max_instances",
+}
+
+
+class RunHistoryListener:
+    def __init__(self, run_history: RunHistory):
+        self._run_history = run_history
+        self._catch_ups: dict[str, tuple[str, datetime]] = {}
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+
+    def attach(self, scheduler: BaseScheduler) -> None:
+        scheduler.add_listener(self, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES)
+
+    def track_catch_up(self, catch_up_id: str, job_id: str, scheduled_at: datetime) -> None:
+        with self._lock:
+            self._catch_ups[catch_up_id] = (job_id, scheduled_at)
+
+    def __call__(self, event: JobExecutionEvent) -> None:
+        job_id, scheduled_at = event.job_id, event.scheduled_run_time
+        with self._lock:
+            job_id, scheduled_at = self._catch_ups.pop(job_id, (job_id, scheduled_at))
+        status = EVENT_STATUSES[event.code]
+        if status != "executed":
+            self._logger.warning(f"Job {job_id} scheduled at {scheduled_at} finished with status {status}")
+        try:
+            self._run_history.record(job_id, scheduled_at, status, str(event.exception) if event.exception else None)
+        except Exception as e:
+            self._logger.error(f"Could not record run of {job_id}: {e}")
+
+
+def last_fire_time(trigger: BaseTrigger, since: datetime, now: datetime) -> Optional[datetime]:
+    last = None
+    fire_time = trigger.get_next_fire_time(None, since)
+    while fire_time is not None and fire_time <= now:
+        last = fire_time
+        fire_time = trigger.get_next_fire_time(fire_time, fire_time + timedelta(microseconds=1))
+    return last
+
+
+def schedule_catch_ups(
+    scheduler: BaseScheduler,
+    listener: RunHistoryListener,
+    run_history: RunHistory,
+    job_names: Iterable[str],
+    max_delay: float,
+    now: Optional[datetime] = None
+) -> list[str]:
+    logger = logging.getLogger(__name__)
+    job_names = set(job_names)
+    if max_delay <= 0 or not job_names:
+        return []
+
+    now = now or datetime.now(scheduler.timezone)
+    scheduled = []
+    for job in scheduler.get_jobs():
+        if job.id.split(":")[0] not in job_names:
+            continue
+        missed = last_fire_time(job.trigger, now - timedelta(seconds=max_delay), now)
+        if missed is None:
+            continue
+        last_run = run_history.last_run(job.id)
+        tolerance = timedelta(seconds=getattr(job.trigger, "jitter", None) or 0)
+        if last_run and last_run["status"] != "missed" and last_run["scheduled_at"] >= (missed - tolerance).timestamp():
+            continue
+
+        catch_up_id = f"{job.id}:catch-up"
+        listener.track_catch_up(catch_up_id, job.id, missed)
+        scheduler.add_job(
+            func=job.func,
+            args=job.args,
+            kwargs=job.kwargs,
+            trigger="date",
+            run_date=now,
+            id=catch_up_id,
+            name=f"{job.name} (catch-up)",
+            replace_existing=True
+        )
+        logger.info(f"{job.name} missed its run at {missed}, catching up now ({(now - missed).total_seconds():.0f}s late)")
+        scheduled.append(catch_up_id)
+    return scheduled
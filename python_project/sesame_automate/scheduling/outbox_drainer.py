@@ -0,0 +1,95 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from sesame_automate.coordination.job_coordinator import JobCoordinator, get_job_coordinator
+from sesame_automate.http_client.rate_limiter import TokenBucket
+from sesame_automate.stores.clock_outbox import ClockOutbox
+
+RETRY_BACKOFF_BASE = 30.0
+RETRY_BACKOFF_MAX = 900.0
+
+
+class OutboxDrainer:
+    def __init__(
+        self,
+        outbox: ClockOutbox,
+        deliver: Callable[[dict[str, Any]], Optional[dict[str, Any]]],
+        interval: float = 30.0,
+        max_concurrency: int = 4,
+        rate_limit: float = 2.0,
+        max_age: float = 28800.0,
+        coordinator: Optional[JobCoordinator] = None
+    ):
+        self._outbox = outbox
+        self._deliver = deliver
+        self._interval = interval
+        self._max_concurrency = max_concurrency
+        self._bucket = TokenBucket(rate_limit, burst=max_concurrency)
+        self._max_age = max_age
+        self._coordinator = coordinator or get_job_coordinator()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="outbox")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._logger = logging.getLogger(__name__)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="outbox-drainer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def drain(self) -> int:
+        expired = self._outbox.expire(self._max_age)
+        if expired:
+            self._logger.error(f"{expired} queued clock events expired after {self._max_age:.0f}s without being delivered")
+
+        events = self._outbox.due(limit=self._max_concurrency * 4)
+        if not events:
+            return 0
+        self._logger.info(f"Delivering {len(events)} queued clock events")
+        futures = [(event, self._executor.submit(self._deliver_one, event)) for event in events]
+        return sum(1 for event, future in futures if future.result())
+
+    def _deliver_one(self, event: dict[str, Any]) -> bool:
+        with self._coordinator.hold(f"outbox:{event['account']}") as held:
+            if not held:
+                self._logger.info(f"Queued clock events for {event['account']} are being delivered by another replica")
+                return False
+            if not self._outbox.is_pending(event['id']):
+                return False
+            return self._deliver_held(event)
+
+    def _deliver_held(self, event: dict[str, Any]) -> bool:
+        self._bucket.acquire()
+        try:
+            result = self._deliver(event)
+        except Exception as e:
+            result = {'last_successful': False, 'error': str(e)}
+        result = result or {'last_successful': False, 'error': 'delivery returned no result'}
+
+        if result.get('last_successful'):
+            self._outbox.mark_delivered(event['id'], result.get('delivery_status', 'sent'))
+            return True
+        if result.get('retryable', True):
+            delay = min(RETRY_BACKOFF_BASE * 2 ** event['attempts'], RETRY_BACKOFF_MAX)
+            self._outbox.mark_failed(event['id'], str(result.get('error')), time.time() + delay)
+        else:
+            self._logger.error(f"Queued {event['event_type']} {event['id']} for {event['account']} was rejected: {result.get('error')}")
+            self._outbox.mark_failed(event['id'], str(result.get('error')))
+        return False
+
+    def _run(self) -> None:
+        timeout = 0.0
+        while not self._stop.wait(timeout):
+            try:
+                delivered = self.drain()
+            except Exception as e:
+                self._logger.error(f"Outbox drain failed: {e}", exc_info=True)
+                delivered = 0
+            timeout = 0.0 if delivered else self._interval
@@ -0,0 +1,46 @@
+import hashlib
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+from apscheduler.triggers.base import BaseTrigger
+from sesame_automate.config.settings import SPREAD_MODES
+
+
+class SpreadTrigger(BaseTrigger):
+    def __init__(self, trigger: BaseTrigger, offset: float = 0.0, jitter: float = 0.0):
+        self.trigger = trigger
+        self.offset = offset
+        self.jitter = jitter
+
+    def get_next_fire_time(self, previous_fire_time: Optional[datetime], now: datetime) -> Optional[datetime]:
+        shift = timedelta(seconds=self.offset)
+        previous = previous_fire_time - shift if previous_fire_time else None
+        next_fire_time = self.trigger.get_next_fire_time(previous, now - shift)
+        if next_fire_time is None:
+            return None
+        if self.jitter:
+            shift += timedelta(seconds=random.uniform(0, self.jitter))
+        return next_fire_time + shift
+
+    def __str__(self) -> str:
+        return f"spread[{self.trigger}, offset={self.offset:.1f}s, jitter={self.jitter:.1f}s]"
+
+    def __repr__(self) -> str:
+        return f"<SpreadTrigger (trigger={self.trigger!r}, offset={self.offset}, jitter={self.jitter})>"
+
+
+def account_offset(account_name: str, job_name: str, window: float) -> float:
+    if window <= 0:
+        return 0.0
+    digest = hashlib.sha256(f"{account_name}:{job_name}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % int(window * 1000) / 1000
+
+
+def spread_trigger(trigger: BaseTrigger, account_name: str, job_name: str, mode: str, window: float) -> BaseTrigger:
+    if mode not in SPREAD_MODES:
+        raise ValueError(f"Unknown spread mode '{mode}', expected one of {', '.join(SPREAD_MODES)}")
+    if mode == "none" or window <= 0:
+        return trigger
+    if mode == "deterministic":
+        return SpreadTrigger(trigger, offset=account_offset(account_name, job_name, window))
+    return SpreadTrigger(trigger, jitter=window)
@@ -0,0 +1,109 @@
+import json
+import logging
+import os
+import threading
+import tomllib
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable, Optional
+from sesame_automate.config.settings import get_settings
+
+ALL_ACCOUNTS = "*"
+
+
+def parse_day(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def expand_days_off(entries: Iterable[dict[str, Any]]) -> dict[date, str]:
+    days_off: dict[date, str] = {}
+    for entry in entries:
+        start = parse_day(entry.get("date") or entry.get("startDate") or entry.get("start"))
+        end = parse_day(entry.get("end") or entry.get("endDate") or start)
+        reason = str(entry.get("reason") or entry.get("name") or "day off")
+        while start <= end:
+            days_off[start] = reason
+            start += timedelta(days=1)
+    return days_off
+
+
+class WorkingCalendar:
+    def __init__(self, path: Optional[str] = None):
+        self._path = path if path is not None else get_settings().calendar_file
+        self._lock = threading.Lock()
+        self._index: dict[str, dict[date, str]] = {}
+        self._refreshed_on: dict[str, date] = {}
+        self._file_index: dict[str, dict[date, str]] = {}
+        self._file_mtime: Optional[float] = None
+        self._logger = logging.getLogger(__name__)
+
+    def day_off_reason(self, account: str, day: Optional[date] = None) -> Optional[str]:
+        day = day or date.today()
+        self._reload_file()
+        with self._lock:
+            for index in (self._file_index.get(ALL_ACCOUNTS), self._file_index.get(account), self._index.get(account)):
+                if index and day in index:
+                    return index[day]
+        return None
+
+    def is_working_day(self, account: str, day: Optional[date] = None) -> bool:
+        return self.day_off_reason(account, day) is None
+
+    def needs_refresh(self, account: str, day: Optional[date] = None) -> bool:
+        with self._lock:
+            return self._refreshed_on.get(account) != (day or date.today())
+
+    def update(self, account: str, days_off: dict[date, str], day: Optional[date] = None) -> None:
+        with self._lock:
+            self._index[account] = dict(days_off)
+            self._refreshed_on[account] = day or date.today()
+
+    def _reload_file(self) -> None:
+        if not self._path:
+            return
+        try:
+            mtime = os.stat(self._path).st_mtime
+        except OSError as e:
+            self._logger.warning(f"Calendar file '{self._path}' is not readable: {e}")
+            return
+        if mtime == self._file_mtime:
+            return
+
+        file_index: dict[str, dict[date, str]] = {}
+        try:
+            for entry in self._load_entries():
+                for account in entry.get("accounts") or [ALL_ACCOUNTS]:
+                    file_index.setdefault(account, {}).update(expand_days_off([entry]))
+        except Exception as e:
+            self._logger.error(f"Failed to load calendar file '{self._path}': {e}")
+            return
+        with self._lock:
+            self._file_index = file_index
+            self._file_mtime = mtime
+        self._logger.info(f"Loaded {sum(len(days) for days in file_index.values())} days off from {self._path}")
+
+    def _load_entries(self) -> list[dict[str, Any]]:
+        if self._path.endswith(".toml"):
+            with open(self._path, "rb") as f:
+                content = tomllib.load(f)
+        elif self._path.endswith(".json"):
+            with open(self._path, encoding="utf-8") as f:
+                content = json.load(f)
+        else:
+            raise ValueError(f"Unsupported calendar file '{self._path}', expected .toml or .json")
+        return content.get("days_off", []) if isinstance(content, dict) else content
+
+
+_default_calendar: Optional[WorkingCalendar] = None
+_default_calendar_lock = threading.Lock()
+
+
+def get_working_calendar() -> WorkingCalendar:
+    global _default_calendar
+    with _default_calendar_lock:
+        if _default_calendar is None:
+            _default_calendar = WorkingCalendar()
+        return _default_calendar
@@ -0,0 +1,4 @@
+from sesame_automate.simulation.mock_sesame_server import MockSesameServer
+
+from sesame_automate.simulation.soak_simulation import run_soak
+from sesame_automate.simulation.virtual_clock import VirtualClock
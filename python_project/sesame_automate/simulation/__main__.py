@@ -0,0 +1,3 @@
+from sesame_automate.simulation.soak_simulation import main
+
+main()
@@ -0,0 +1,278 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+
+class MockSesameServer:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[float] = None,
+        break_names: tuple[str, ...] = ("Lunch", "Comiendo"),
+        holidays: tuple[str, ...] = (),
+        absences: tuple[str, ...] = (),
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.break_names = break_names
+        self.holidays = holidays
+        self.absences = absences
+        self._host = host
+        self._port = port
+        self._lock = threading.Lock()
+        self._employees: dict[str, dict[str, Any]] = {}
+        self._sessions: dict[str, str] = {}
+        self._tokens = rate_limit or 0.0
+        self._tokens_updated = time.monotonic()
+        self.request_counts: Counter = Counter()
+        self.bytes_sent = 0
+        self.clock_events: list[dict[str, Any]] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        if not self._server:
+            raise RuntimeError("Mock server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.request_counts.values())
+
+    def start(self) -> str:
+        handler = type("MockSesameHandler", (_MockSesameHandler,), {"mock": self})
+        self._server = ThreadingHTTPServer((self._host, self._port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-sesame-server", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockSesameServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.request_counts.clear()
+            self.bytes_sent = 0
+            self.clock_events.clear()
+
+    def expire_sessions(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def employee(self, email: str) -> dict[str, Any]:
+        with self._lock:
+            return self._employee(email)
+
+    def _employee(self, email: str) -> dict[str, Any]:
+        if email not in self._employees:
+            index = len(self._employees) + 1
+            self._employees[email] = {
+                "id": str(uuid.uuid5(uuid.NAMESPACE_DNS, email)),
+                "companyId": "company-1",
+                "companyName": "Mock Company",
+                "firstName": email.split("@")[0],
+                "lastName": f"Employee{index}",
+                "email": email,
+                "workStatus": "offline"
+            }
+        return self._employees[email]
+
+    def _take_token(self) -> bool:
+        if not self.rate_limit:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._tokens_updated) * self.rate_limit)
+            self._tokens_updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class _MockSesameHandler(BaseHTTPRequestHandler):
+    mock: MockSesameServer
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    _routes = [
+        ("POST", re.compile(r"^/api/v3/security/login$"), "login", "_login"),
+        ("GET", re.compile(r"^/api/v3/security/me$"), "me", "_me"),
+        ("GET", re.compile(r"^/api/v3/companies/(?P<company_id>[^/]+)/work-breaks$"), "work-breaks", "_work_breaks"),
+        ("GET", re.compile(r"^/api/v3/employees/(?P<employee_id>[^/]+)$"), "employee", "_employee_detail"),
+        ("GET", re.compile(r"^/api/v3/employees/(?P<employee_id>[^/]+)/assigned-work-check-types$"), "assigned-work-check-types", "_check_types"),
+        ("GET", re.compile(r"^/api/v3/employees/(?P<employee_id>[^/]+)/calendar-holidays$"), "calendar-holidays", "_holidays"),
+        ("GET", re.compile(r"^/api/v3/employees/(?P<employee_id>[^/]+)/absences$"), "absences", "_absences"),
+        ("POST", re.compile(r"^/api/v3/employees/(?P<employee_id>[^/]+)/check-in$"), "check-in", "_check_in"),
+        ("POST", re.compile(r"^/api/v3/employees/(?P<employee_id>[^/]+)/check-out$"), "check-out", "_check_out"),
+    ]
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        body = self._read_body()
+        path = self.path.split("?")[0]
+        for route_method, pattern, name, handler_name in self._routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                break
+        else:
+            with self.mock._lock:
+                self.mock.request_counts[f"{method} unknown"] += 1
+            return self._send(404, {"error": "Not found"})
+
+        with self.mock._lock:
+            self.mock.request_counts[f"{method} {name}"] += 1
+
+        delay = self.mock.latency + random.uniform(0, self.mock.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if not self.mock._take_token():
+            return self._send(429, {"error": "Too many requests"}, {"Retry-After": "1"})
+        if self.mock.error_rate and random.random() < self.mock.error_rate:
+            return self._send(500, {"error": "Injected failure"})
+
+        employee = None
+        if name != "login":
+            employee = self._authenticated_employee()
+            if employee is None:
+                return self._send(401, {"error": "Unauthorized"})
+        getattr(self, handler_name)(employee, body, **match.groupdict())
+
+    def _login(self, employee: None, body: dict[str, Any]) -> None:
+        email = body.get("email")
+        if not email or not body.get("password"):
+            return self._send(400, {"error": "Missing credentials"})
+        token = uuid.uuid4().hex
+        with self.mock._lock:
+            self.mock._employee(email)
+            self.mock._sessions[token] = email
+        self._send(200, {"data": token})
+
+    def _me(self, employee: dict[str, Any], body: dict[str, Any]) -> None:
+        self._send_cacheable({"data": [employee]})
+
+    def _employee_detail(self, employee: dict[str, Any], body: dict[str, Any], employee_id: str) -> None:
+        if employee_id != employee["id"]:
+            return self._send(403, {"error": "Forbidden"})
+        with self.mock._lock:
+            payload = {"data": dict(employee)}
+        self._send(200, payload)
+
+    def _work_breaks(self, employee: dict[str, Any], body: dict[str, Any], company_id: str) -> None:
+        breaks = [
+            {"id": f"break-{index}", "name": name}
+            for index, name in enumerate(self.mock.break_names, start=1)
+        ]
+        self._send_cacheable({"data": breaks})
+
+    def _check_types(self, employee: dict[str, Any], body: dict[str, Any], employee_id: str) -> None:
+        self._send_cacheable({"data": [
+            {"id": "check-type-office", "name": "Office", "workType": "office", "status": "active"},
+            {"id": "check-type-remote", "name": "Remote", "workType": "remote", "status": "active"}
+        ]})
+
+    def _holidays(self, employee: dict[str, Any], body: dict[str, Any], employee_id: str) -> None:
+        self._send_cacheable({"data": [{"date": day, "name": "Holiday"} for day in self.mock.holidays]})
+
+    def _absences(self, employee: dict[str, Any], body: dict[str, Any], employee_id: str) -> None:
+        self._send_cacheable({"data": [{"startDate": day, "endDate": day, "name": "Vacation"} for day in self.mock.absences]})
+
+    def _check_in(self, employee: dict[str, Any], body: dict[str, Any], employee_id: str) -> None:
+        self._clock(employee, body, employee_id, "check-in")
+
+    def _check_out(self, employee: dict[str, Any], body: dict[str, Any], employee_id: str) -> None:
+        self._clock(employee, body, employee_id, "check-out")
+
+    def _clock(self, employee: dict[str, Any], body: dict[str, Any], employee_id: str, event_type: str) -> None:
+        if employee_id != employee["id"]:
+            return self._send(403, {"error": "Forbidden"})
+        with self.mock._lock:
+            event = {
+                "type": event_type,
+                "employeeId": employee_id,
+                "workCheckTypeId": body.get("workCheckTypeId"),
+                "at": time.time()
+            }
+            self.mock.clock_events.append(event)
+            if event_type == "check-out":
+                employee["workStatus"] = "offline"
+            elif str(body.get("workCheckTypeId") or "").startswith("break-"):
+                employee["workStatus"] = "paused"
+            else:
+                employee["workStatus"] = "online"
+        self._send(200, {"data": event})
+
+    def _authenticated_employee(self) -> Optional[dict[str, Any]]:
+        cookies = self.headers.get("Cookie", "")
+        for cookie in cookies.split(";"):
+            name, _, value = cookie.strip().partition("=")
+            if name == "USID":
+                with self.mock._lock:
+                    email = self.mock._sessions.get(value)
+                    return self.mock._employees.get(email) if email else None
+        return None
+
+    def _read_body(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    def _send_cacheable(self, payload: dict[str, Any]) -> None:
+        encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+        etag = '"' + hashlib.sha1(encoded).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send_raw(304, b"", {"ETag": etag})
+        self._send_raw(200, encoded, {"ETag": etag})
+
+    def _send(self, status: int, payload: dict[str, Any], headers: Optional[dict[str, str]] = None) -> None:
+        self._send_raw(status, json.dumps(payload).encode("utf-8"), headers)
+
+    def _send_raw(self, status: int, encoded: bytes, headers: Optional[dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if encoded:
+            self.wfile.write(encoded)
+        with self.mock._lock:
+            self.mock.bytes_sent += len(encoded)
@@ -0,0 +1,290 @@
+import argparse
+import gc
+import heapq
+import json
+import os
+import resource
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Iterator, Optional
+from sesame_automate.simulation.mock_sesame_server import MockSesameServer
+from sesame_automate.simulation.virtual_clock import VirtualClock
+
+SOAK_SCHEDULE = {
+    "IN_TIME_CRON": "0 9 * * mon-fri",
+    "BREAK_START_CRON": "0 14 * * mon-fri",
+    "BREAK_END_CRON": "0 15 * * mon-fri",
+    "OUT_TIME_CRON": "0 18 * * mon-fri"
+}
+
+
+def process_resources() -> dict[str, Any]:
+    import requests
+
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as f:
+            rss_kb = int(f.read().split()[1]) * resource.getpagesize() // 1024
+    except OSError:
+        rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    open_fds = open_sockets = None
+    try:
+        descriptors = os.listdir("/proc/self/fd")
+        open_fds = len(descriptors)
+        open_sockets = sum(1 for fd in descriptors if _fd_target(fd).startswith("socket:"))
+    except OSError:
+        pass
+
+    sessions = [obj for obj in gc.get_objects() if isinstance(obj, requests.Session)]
+    return {
+        "rss_kb": rss_kb,
+        "threads": threading.active_count(),
+        "open_fds": open_fds,
+        "open_sockets": open_sockets,
+        "http_sessions": len(sessions),
+        "cookies": sum(len(session.cookies) for session in sessions)
+    }
+
+
+def _fd_target(fd: str) -> str:
+    try:
+        return os.readlink(os.path.join("/proc/self/fd", fd))
+    except OSError:
+        return ""
+
+
+def fire_schedule(jobs: list[Any], start: datetime, end: datetime) -> Iterator[tuple[datetime, list[Any]]]:
+    pending = []
+    for index, job in enumerate(jobs):
+        fire_time = job.trigger.get_next_fire_time(None, start)
+        if fire_time and fire_time < end:
+            heapq.heappush(pending, (fire_time, index, job))
+
+    while pending:
+        fire_time = pending[0][0]
+        due = []
+        while pending and pending[0][0] == fire_time:
+            _, index, job = heapq.heappop(pending)
+            due.append(job)
+            next_fire_time = job.trigger.get_next_fire_time(fire_time, fire_time)
+            if next_fire_time and next_fire_time < end:
+                heapq.heappush(pending, (next_fire_time, index, job))
+        yield fire_time, due
+
+
+def job_failures(result: Any) -> int:
+    if isinstance(result, Future):
+        result = result.result()
+    if isinstance(result, dict) and "last_successful" not in result:
+        return sum(job_failures(value) for value in result.values())
+    return 0 if result and result.get("last_successful") else 1
+
+
+def trend(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000
+    }
+
+
+def soak_variables(workdir: str, base_url: str, accounts: int) -> dict[str, str]:
+    environment = {
+        "BASE_URL": base_url,
+        "COOKIE_DOMAIN": "127.0.0.1",
+        "BREAK_NAME": "Lunch",
+        "SESSION_STORE_PATH": os.path.join(workdir, "session.json"),
+        "STATE_STORE_PATH": os.path.join(workdir, "state.sqlite"),
+        "RUN_HISTORY_PATH": os.path.join(workdir, "runs.sqlite"),
+        "CLOCK_OUTBOX_PATH": os.path.join(workdir, "outbox.sqlite"),
+        "REFERENCE_CACHE_PATH": os.path.join(workdir, "reference_cache.json"),
+        "COORDINATION_PATH": os.path.join(workdir, "leases.sqlite"),
+        "HTTP_CASSETTE": "off",
+        "LOG_DIR": os.path.join(workdir, "logs"),
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "warning"),
+        "METRICS_FILE": "",
+        "TRACE_FILE": "",
+        "SETTINGS_FILE": "",
+        "SETTINGS_HOT_RELOAD": "false",
+        "FAST_START": "false"
+    }
+    if accounts == 1:
+        environment.update({"SESAME_EMAIL": "soak0@example.com", "SESAME_PASSWORD": "soak", "SESAME_ACCOUNTS_FILE": ""})
+    else:
+        accounts_file = os.path.join(workdir, "accounts.toml")
+        with open(accounts_file, "w", encoding="utf-8") as f:
+            for index in range(accounts):
+                f.write(f'[[accounts]]\nname = "soak{index}"\nemail = "soak{index}@example.com"\npassword = "soak"\n\n')
+        environment["SESAME_ACCOUNTS_FILE"] = accounts_file
+    return environment
+
+
+@contextmanager
+def soak_environment(environment: dict[str, str]) -> Iterator[None]:
+    previous = dict(os.environ)
+    os.environ.update(environment)
+    for variable, cron in SOAK_SCHEDULE.items():
+        os.environ.setdefault(variable, cron)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(previous)
+
+
+def run_soak(
+    accounts: int = 1,
+    days: int = 28,
+    start: Optional[date] = None,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    expire_sessions_daily: bool = True
+) -> dict[str, Any]:
+    virtual_start = datetime.combine(start or date.today(), datetime.min.time()).astimezone()
+    virtual_end = virtual_start + timedelta(days=days)
+    with tempfile.TemporaryDirectory(prefix="sesame-soak-") as workdir, \
+            MockSesameServer(latency=latency, error_rate=error_rate) as server, \
+            soak_environment(soak_variables(workdir, server.base_url, accounts)), \
+            VirtualClock(virtual_start) as clock:
+        from sesame_automate import main
+        from sesame_automate.config import reload_settings
+        from sesame_automate.logging_pipeline import shutdown_logging
+
+        settings = reload_settings()
+        main.setup_logging()
+        try:
+            scheduler = main.prepare_scheduler()
+            jobs = [job for job in scheduler.get_jobs() if not job.id.endswith(":catch-up")]
+
+            samples = [dict(process_resources(), day="start", requests=server.total_requests)]
+            server.reset_stats()
+            latencies: dict[str, dict[int, list[float]]] = defaultdict(lambda: defaultdict(list))
+            failures: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+            firings = 0
+            current_day = virtual_start.date()
+            started = time.perf_counter()
+
+            def sample_day(day: date) -> None:
+                clock.set(datetime.combine(day + timedelta(days=1), datetime.min.time()).astimezone())
+                gc.collect()
+                samples.append(dict(process_resources(), day=day.isoformat(), requests=server.total_requests))
+                server.reset_stats()
+                if expire_sessions_daily:
+                    server.expire_sessions()
+
+            def fire(job: Any) -> tuple[str, float, int]:
+                job_started = time.perf_counter()
+                try:
+                    result = job.func(*job.args, **job.kwargs)
+                    failed = job_failures(result)
+                except Exception:
+                    failed = 1
+                return job.id.split(":")[0], time.perf_counter() - job_started, failed
+
+            with ThreadPoolExecutor(settings.scheduler_max_workers, thread_name_prefix="soak-job") as executor:
+                for fire_time, due in fire_schedule(jobs, virtual_start, virtual_end):
+                    while current_day < fire_time.date():
+                        sample_day(current_day)
+                        current_day += timedelta(days=1)
+                    week = (fire_time - virtual_start).days // 7
+                    clock.set(fire_time)
+                    for job_name, seconds, failed in executor.map(fire, due):
+                        latencies[job_name][week].append(seconds)
+                        failures[job_name][week] += failed
+                        firings += 1
+                while current_day < virtual_end.date():
+                    sample_day(current_day)
+                    current_day += timedelta(days=1)
+
+            elapsed = time.perf_counter() - started
+        finally:
+            shutdown_logging()
+        first, last = samples[0], samples[-1]
+        return {
+            "config": {
+                "accounts": accounts,
+                "days": days,
+                "start": virtual_start.date().isoformat(),
+                "latency": latency,
+                "error_rate": error_rate,
+                "expire_sessions_daily": expire_sessions_daily
+            },
+            "elapsed_seconds": elapsed,
+            "firings": firings,
+            "samples": samples,
+            "growth": {
+                key: last[key] - first[key]
+                for key in ("rss_kb", "threads", "open_fds", "open_sockets", "http_sessions", "cookies")
+                if first[key] is not None and last[key] is not None
+            },
+            "jobs": {
+                job_name: {
+                    week: dict(trend(values), failures=failures[job_name][week])
+                    for week, values in sorted(weeks.items())
+                }
+                for job_name, weeks in latencies.items()
+            }
+        }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    lines = [
+        f"Soak configuration: {json.dumps(report['config'])}",
+        f"Replayed {report['firings']} firings in {report['elapsed_seconds']:.1f}s",
+        "",
+        f"{'day':<12}{'rss KB':>10}{'threads':>9}{'fds':>6}{'sockets':>9}{'sessions':>10}{'cookies':>9}{'requests':>10}"
+    ]
+    for sample in report["samples"]:
+        lines.append(
+            f"{sample['day']:<12}{sample['rss_kb']:>10}{sample['threads']:>9}{sample['open_fds'] or '-':>6}"
+            f"{sample['open_sockets'] or '-':>9}{sample['http_sessions']:>10}{sample['cookies']:>9}{sample['requests']:>10}"
+        )
+    lines.append("")
+    lines.append("Growth: " + ", ".join(f"{key} {value:+}" for key, value in report["growth"].items()))
+    lines.append("")
+    lines.append(f"{'job':<22}{'week':>6}{'runs':>6}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'failures':>10}")
+    for job_name, weeks in report["jobs"].items():
+        for week, stats in weeks.items():
+            lines.append(
+                f"{job_name:<22}{week:>6}{stats['count']:>6}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+                f"{stats['max_ms']:>10.2f}{stats['failures']:>10}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay weeks of scheduled jobs against a local mock server on a virtual clock")
+    parser.add_argument("--accounts", type=int, default=1)
+    parser.add_argument("--days", type=int, default=28, help="Virtual days to replay")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="First virtual day, YYYY-MM-DD (default today)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock server latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--keep-sessions", action="store_true", help="Do not expire server sessions at every virtual midnight")
+    parser.add_argument("--json", dest="json_path", help="Also write the full report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_soak(
+        accounts=args.accounts,
+        days=args.days,
+        start=args.start,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        expire_sessions_daily=not args.keep_sessions
+    )
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import sys
+import time
+from datetime import datetime, tzinfo
+from typing import Any, Optional
+
+_real_time = time.time
+_real_datetime = datetime
+_active_clock: Optional["VirtualClock"] = None
+
+
+class _VirtualDatetimeType(type):
+    def __instancecheck__(cls, instance: Any) -> bool:
+        return isinstance(instance, _real_datetime)
+
+
+class _VirtualDatetime(_real_datetime, metaclass=_VirtualDatetimeType):
+    @classmethod
+    def now(cls, tz: Optional[tzinfo] = None) -> datetime:
+        if _active_clock is None:
+            return _real_datetime.now(tz)
+        return _real_datetime.fromtimestamp(_active_clock.time(), tz)
+
+
+class VirtualClock:
+    def __init__(self, start: datetime, module_prefix: str = "sesame_automate"):
+        self._offset = start.timestamp() - _real_time()
+        self._module_prefix = module_prefix
+        self._previous_time = time.time
+
+    def time(self) -> float:
+        return _real_time() + self._offset
+
+    def now(self) -> datetime:
+        return _real_datetime.fromtimestamp(self.time()).astimezone()
+
+    def set(self, moment: datetime) -> None:
+        self._offset = moment.timestamp() - _real_time()
+        if _active_clock is self:
+            self._patch_modules(_real_datetime, _VirtualDatetime)
+
+    def __enter__(self) -> "VirtualClock":
+        global _active_clock
+        if _active_clock is not None:
+            raise RuntimeError("Another virtual clock is already running")
+        _active_clock = self
+        self._previous_time = time.time
+        time.time = self.time
+        try:
+            self._patch_modules(_real_datetime, _VirtualDatetime)
+        except BaseException:
+            self.__exit__()
+            raise
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        global _active_clock
+        try:
+            self._patch_modules(_VirtualDatetime, _real_datetime)
+        finally:
+            time.time = self._previous_time
+            _active_clock = None
+
+    def _patch_modules(self, current: type, replacement: type) -> None:
+        for name, module in list(sys.modules.items()):
+            if name.startswith(self._module_prefix) and getattr(module, "datetime", None) is current:
+                module.datetime = replacement
@@ -0,0 +1,2 @@
+from sesame_automate.status.job_history import JobHistory, JobRun, get_job_history
+from sesame_automate.status.status_server import StatusServer
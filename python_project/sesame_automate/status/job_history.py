@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Iterator, Optional
+from sesame_automate.config.settings import get_settings
+from sesame_automate.models.runnable_sequence import Runnable, RunnableHook, step_failed
+
+
+class JobRun:
+    def __init__(self, account: str, job: str):
+        self.account = account
+        self.job = job
+        self.started_at = time.time()
+        self.steps: list[dict[str, Any]] = []
+        self.result: Any = None
+        self.error: Optional[str] = None
+
+    def finish(self, result: Any) -> None:
+        self.result = result
+
+    def to_dict(self, duration: float) -> dict[str, Any]:
+        result = self.result if isinstance(self.result, dict) else {}
+        error = self.error or result.get('error')
+        return {
+            'account': self.account,
+            'job': self.job,
+            'started_at': datetime.fromtimestamp(self.started_at).astimezone().isoformat(),
+            'duration_ms': duration * 1000,
+            'ok': self.error is None and bool(result.get('last_successful')),
+            'skipped': result.get('skip_reason'),
+            'error': str(error) if error is not None else None,
+            'steps': self.steps
+        }
+
+
+_current_run: ContextVar[Optional[JobRun]] = ContextVar("sesame_job_run", default=None)
+
+
+class JobHistory(RunnableHook):
+    def __init__(self, size: Optional[int] = None):
+        self._runs: deque[dict[str, Any]] = deque(maxlen=size or get_settings().status_history_size)
+        self._last_login: dict[str, float] = {}
+        self._last_handled: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, account: str, job: str) -> Iterator[JobRun]:
+        run = JobRun(account, job)
+        token = _current_run.set(run)
+        started = time.perf_counter()
+        try:
+            yield run
+        except Exception as e:
+            run.error = str(e)
+            raise
+        finally:
+            _current_run.reset(token)
+            entry = run.to_dict(time.perf_counter() - started)
+            with self._lock:
+                self._runs.append(entry)
+                if isinstance(run.result, dict) and run.result.get('login_successful'):
+                    self._last_login[account] = time.time()
+                if isinstance(run.result, dict) and (run.result.get('login_successful') or run.result.get('skipped')):
+                    self._last_handled[account] = time.time()
+
+    def after_step(self, step: Runnable, data: dict[str, Any], step_result: Any, duration: float, context: dict[str, Any]) -> None:
+        run = _current_run.get()
+        if run is None:
+            return
+        failed = step_failed(step_result)
+        run.steps.append({
+            'step': context['step'],
+            'duration_ms': duration * 1000,
+            'ok': not failed,
+            'error': step_result.get('error') if failed else None
+        })
+
+    def on_error(self, step: Runnable, data: dict[str, Any], error: Exception, duration: float, context: dict[str, Any]) -> None:
+        run = _current_run.get()
+        if run is not None:
+            run.steps.append({'step': context['step'], 'duration_ms': duration * 1000, 'ok': False, 'error': str(error)})
+
+    def on_skip(self, step: Runnable, data: dict[str, Any], reason: str, context: dict[str, Any]) -> None:
+        run = _current_run.get()
+        if run is not None:
+            run.steps.append({'step': context['step'], 'duration_ms': 0.0, 'ok': True, 'skipped': reason})
+
+    def recent(self, account: Optional[str] = None, job: Optional[str] = None, limit: Optional[int] = None) -> list[dict[str, Any]]:
+        if limit is not None and limit < 0:
+            raise ValueError(f"limit must not be negative, got {limit}")
+        with self._lock:
+            runs = list(self._runs)
+        runs = [
+            run for run in reversed(runs)
+            if (account is None or run['account'] == account) and (job is None or run['job'] == job)
+        ]
+        return runs[:limit] if limit is not None else runs
+
+    def last_login(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._last_login)
+
+    def last_handled(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._last_handled)
+
+
+_default_history: Optional[JobHistory] = None
+_default_history_lock = threading.Lock()
+
+
+def get_job_history() -> JobHistory:
+    global _default_history
+    with _default_history_lock:
+        if _default_history is None:
+            _default_history = JobHistory()
+        return _default_history
@@ -0,0 +1,155 @@
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+from urllib.parse import parse_qs, urlsplit
+from sesame_automate.status.job_history import JobHistory
+
+if TYPE_CHECKING:
+    from apscheduler.schedulers.base import BaseScheduler
+
+LOGIN_JOBS = ("in_time_job", "out_time_job", "break_start_job", "break_finished_job", "calendar_job")
+
+
+class StatusServer:
+    def __init__(
+        self,
+        scheduler: "BaseScheduler",
+        history: JobHistory,
+        accounts: Iterable[str],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        login_grace: float = 900.0
+    ):
+        self.scheduler = scheduler
+        self.history = history
+        self.accounts = list(accounts)
+        self.login_grace = login_grace
+        self.started_at = time.time()
+        self._host = host
+        self._port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def base_url(self) -> str:
+        if not self._server:
+            raise RuntimeError("Status server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        handler = type("StatusHandler", (_StatusHandler,), {"status": self})
+        self._server = ThreadingHTTPServer((self._host, self._port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="status-server", daemon=True)
+        self._thread.start()
+        self._logger.info(f"Status server listening on {self.base_url}")
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def liveness(self) -> tuple[int, dict[str, Any]]:
+        return 200, {"status": "ok", "uptime": time.time() - self.started_at}
+
+    def readiness(self) -> tuple[int, dict[str, Any]]:
+        last_login = self.history.last_login()
+        last_handled = self.history.last_handled()
+        expected = self.expected_runs(time.time() - self.login_grace)
+        stale = [
+            account for account in self.accounts
+            if account not in last_handled or last_handled[account] < expected.get(account, 0.0)
+        ]
+        running = bool(self.scheduler.running)
+        ready = running and not stale
+        return (200 if ready else 503), {
+            "ready": ready,
+            "scheduler_running": running,
+            "last_successful_login": {account: last_login.get(account) for account in self.accounts},
+            "last_expected_run": {account: expected.get(account) for account in self.accounts},
+            "stale_logins": stale
+        }
+
+    def expected_runs(self, until: float) -> dict[str, float]:
+        from sesame_automate.scheduling.catch_up import last_fire_time
+
+        since = datetime.fromtimestamp(self.started_at).astimezone()
+        until_time = datetime.fromtimestamp(until).astimezone()
+        expected: dict[str, float] = {}
+        if until_time <= since:
+            return expected
+        for job in self.scheduler.get_jobs():
+            if job.id.split(":")[0] not in LOGIN_JOBS or job.id.endswith(":catch-up"):
+                continue
+            fire_time = last_fire_time(job.trigger, since, until_time)
+            if fire_time is None:
+                continue
+            accounts = [job.args[0]] if job.args and job.args[0] in self.accounts else self.accounts
+            for account in accounts:
+                expected[account] = max(expected.get(account, 0.0), fire_time.timestamp())
+        return expected
+
+    def jobs(self) -> tuple[int, dict[str, Any]]:
+        return 200, {
+            "jobs": [
+                {
+                    "id": job.id,
+                    "name": job.name,
+                    "trigger": str(job.trigger),
+                    "next_run_time": job.next_run_time.isoformat() if getattr(job, "next_run_time", None) else None
+                }
+                for job in self.scheduler.get_jobs()
+            ]
+        }
+
+    def recent(self, query: dict[str, list[str]]) -> tuple[int, dict[str, Any]]:
+        try:
+            limit = int(query["limit"][0]) if "limit" in query else 50
+        except ValueError:
+            return 400, {"error": "limit must be an integer"}
+        if limit < 0:
+            return 400, {"error": "limit must not be negative"}
+        account = query.get("account", [None])[0]
+        job = query.get("job", [None])[0]
+        return 200, {"runs": self.history.recent(account=account, job=job, limit=limit)}
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    status: StatusServer
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        routes = {
+            "/healthz": lambda: self.status.liveness(),
+            "/readyz": lambda: self.status.readiness(),
+            "/jobs": lambda: self.status.jobs(),
+            "/history": lambda: self.status.recent(parse_qs(url.query))
+        }
+        route = routes.get(url.path.rstrip("/") or "/")
+        if route is None:
+            self._send(404, {"error": f"Unknown path {url.path}", "paths": list(routes)})
+            return
+        try:
+            self._send(*route())
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+
+    def _send(self, status: int, payload: dict[str, Any]) -> None:
+        encoded = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(encoded)
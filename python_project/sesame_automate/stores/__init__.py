@@ -0,0 +1,5 @@
+from sesame_automate.stores.session_store import SessionStore, get_session_store
+from sesame_automate.stores.reference_cache import FileCacheBackend, MemoryCacheBackend, ReferenceCache, get_reference_cache
+from sesame_automate.stores.state_store import StateStore, get_state_store
+from sesame_automate.stores.run_history import RunHistory, get_run_history
+from sesame_automate.stores.clock_outbox import ClockOutbox, get_clock_outbox
@@ -0,0 +1,169 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Iterator, Optional
+from sesame_automate.config.settings import get_settings
+from sesame_automate.http_client.http_policy import is_transient_error
+from sesame_automate.models.enums.state import State
+
+COLUMNS = (
+    "id", "account", "event_type", "target_state", "url", "payload", "work_check_type_id",
+    "scheduled_at", "created_at", "status", "attempts", "next_attempt_at", "last_error", "finished_at"
+)
+
+
+class ClockOutbox:
+    def __init__(self, path: Optional[str] = None, mode: Optional[str] = None):
+        self._path = path or get_settings().clock_outbox_path
+        self.mode = mode or get_settings().clock_outbox
+        self._lock = threading.Lock()
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS clock_events ("
+                "id TEXT PRIMARY KEY, "
+                "account TEXT NOT NULL, "
+                "event_type TEXT NOT NULL, "
+                "target_state TEXT NOT NULL, "
+                "url TEXT NOT NULL, "
+                "payload TEXT NOT NULL, "
+                "work_check_type_id TEXT, "
+                "scheduled_at REAL NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "status TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, "
+                "next_attempt_at REAL NOT NULL, "
+                "last_error TEXT, "
+                "finished_at REAL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS clock_events_pending ON clock_events (status, account, created_at)")
+
+    def should_queue(self, account: Optional[str]) -> bool:
+        if self.mode == "always":
+            return True
+        return self.mode == "fallback" and bool(account) and self.has_pending(account)
+
+    def accepts(self, error: Exception) -> bool:
+        return self.mode != "off" and is_transient_error(error)
+
+    def enqueue(
+        self,
+        account: str,
+        event_type: str,
+        target_state: State,
+        url: str,
+        payload: dict[str, Any],
+        scheduled_at: Optional[datetime] = None
+    ) -> str:
+        event_id = str(uuid.uuid4())
+        now = time.time()
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "INSERT INTO clock_events (id, account, event_type, target_state, url, payload, work_check_type_id, "
+                "scheduled_at, created_at, status, attempts, next_attempt_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending', 0, ?)",
+                (
+                    event_id, account, event_type, str(target_state), url, json.dumps(payload), payload.get("workCheckTypeId"),
+                    scheduled_at.timestamp() if scheduled_at else now, now, now
+                )
+            )
+        return event_id
+
+    def has_pending(self, account: str) -> bool:
+        with self._lock, self._connect() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM clock_events WHERE account = ? AND status = 'pending' LIMIT 1", (account,)
+            ).fetchone()
+        return row is not None
+
+    def is_pending(self, event_id: str) -> bool:
+        with self._lock, self._connect() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM clock_events WHERE id = ? AND status = 'pending'", (event_id,)
+            ).fetchone()
+        return row is not None
+
+    def due(self, limit: int = 100, now: Optional[float] = None) -> list[dict[str, Any]]:
+        now = now or time.time()
+        with self._lock, self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM clock_events WHERE status = 'pending' ORDER BY created_at"
+            ).fetchall()
+        heads: dict[str, dict[str, Any]] = {}
+        for row in rows:
+            event = self._event(row)
+            heads.setdefault(event["account"], event)
+        return [event for event in heads.values() if event["next_attempt_at"] <= now][:limit]
+
+    def mark_delivered(self, event_id: str, status: str = "sent") -> None:
+        self._finish(event_id, status, None)
+
+    def mark_failed(self, event_id: str, error: str, retry_at: Optional[float] = None) -> None:
+        if retry_at is None:
+            self._finish(event_id, "failed", error)
+            return
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "UPDATE clock_events SET attempts = attempts + 1, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (retry_at, error, event_id)
+            )
+
+    def expire(self, max_age: float) -> int:
+        now = time.time()
+        with self._lock, self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE clock_events SET status = 'expired', finished_at = ? WHERE status = 'pending' AND scheduled_at < ?",
+                (now, now - max_age)
+            )
+            return cursor.rowcount
+
+    def counts(self) -> dict[str, int]:
+        with self._lock, self._connect() as connection:
+            rows = connection.execute("SELECT status, COUNT(*) FROM clock_events GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def recent(self, limit: int = 50) -> list[dict[str, Any]]:
+        with self._lock, self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM clock_events ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._event(row) for row in rows]
+
+    def _finish(self, event_id: str, status: str, error: Optional[str]) -> None:
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "UPDATE clock_events SET status = ?, attempts = attempts + 1, last_error = ?, finished_at = ? WHERE id = ?",
+                (status, error, time.time(), event_id)
+            )
+
+    def _event(self, row: tuple) -> dict[str, Any]:
+        event = dict(zip(COLUMNS, row))
+        event["payload"] = json.loads(event["payload"])
+        event["target_state"] = State(event["target_state"])
+        return event
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        directory = os.path.dirname(os.path.abspath(self._path))
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self._path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+_default_outbox: Optional[ClockOutbox] = None
+_default_outbox_lock = threading.Lock()
+
+
+def get_clock_outbox() -> ClockOutbox:
+    global _default_outbox
+    with _default_outbox_lock:
+        if _default_outbox is None:
+            _default_outbox = ClockOutbox()
+        return _default_outbox
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Optional
+import requests
+from sesame_automate.config.settings import Settings, get_settings
+from sesame_automate.http_client.http_policy import HttpPolicy, get_http_policy, is_transient_error
+
+
+class MemoryCacheBackend:
+    def __init__(self):
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+
+    def delete_prefix(self, prefix: str, keep: Optional[str] = None) -> None:
+        with self._lock:
+            for key in self._matching(prefix, keep):
+                del self._entries[key]
+
+    def _matching(self, prefix: str, keep: Optional[str]) -> list[str]:
+        return [k for k in self._entries if k.startswith(prefix) and not (keep and k.startswith(keep))]
+
+
+class FileCacheBackend(MemoryCacheBackend):
+    def __init__(self, path: str):
+        super().__init__()
+        self._path = path
+        self._logger = logging.getLogger(__name__)
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self._logger.warning(f"Ignoring unreadable reference cache {self._path}: {e}")
+
+    def set(self, key: str, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._flush()
+
+    def delete_prefix(self, prefix: str, keep: Optional[str] = None) -> None:
+        with self._lock:
+            keys = self._matching(prefix, keep)
+            for key in keys:
+                del self._entries[key]
+            if keys:
+                self._flush()
+
+    def _flush(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self._path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".reference-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class ReferenceCache:
+    def __init__(self, backend: Optional[MemoryCacheBackend] = None, ttl: Optional[float] = None, http_policy: Optional[HttpPolicy] = None):
+        self._backend = backend or MemoryCacheBackend()
+        self._http_policy = http_policy or get_http_policy()
+        self._ttl = ttl if ttl is not None else get_settings().reference_cache_ttl
+        self._logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Settings] = None) -> "ReferenceCache":
+        settings = settings or get_settings()
+        if settings.reference_cache_backend == "file":
+            backend = FileCacheBackend(settings.reference_cache_path)
+        else:
+            backend = MemoryCacheBackend()
+        return cls(backend, settings.reference_cache_ttl)
+
+    def get_json(self, session: requests.Session, url: str, account: Optional[str] = None) -> dict[str, Any]:
+        key, entry, headers = self._lookup(session, url, account)
+        if entry and entry["expires_at"] > time.time():
+            return entry["body"]
+
+        try:
+            response = self._http_policy.request(session, "GET", url, headers=headers)
+            if response.status_code == 304 and entry:
+                return self._revalidated(key, entry)
+            response.raise_for_status()
+            body = response.json()
+        except Exception as e:
+            return self._stale_or_raise(key, entry, e)
+
+        return self._store(session, account, url, body, response.headers.get("ETag"))
+
+    async def aget_json(self, session: Any, url: str, account: Optional[str] = None) -> dict[str, Any]:
+        key, entry, headers = self._lookup(session, url, account)
+        if entry and entry["expires_at"] > time.time():
+            return entry["body"]
+
+        try:
+            response = await self._http_policy.arequest(session, "GET", url, headers=headers)
+            if response.status_code == 304 and entry:
+                return self._revalidated(key, entry)
+            response.raise_for_status()
+            body = response.json()
+        except Exception as e:
+            return self._stale_or_raise(key, entry, e)
+
+        return self._store(session, account, url, body, response.headers.get("ETag"))
+
+    def _lookup(self, session: Any, url: str, account: Optional[str]) -> tuple[str, Optional[dict[str, Any]], dict[str, str]]:
+        key = self._session_key(session, account) + url
+        entry = self._backend.get(key)
+        headers = {}
+        if entry and entry["expires_at"] <= time.time() and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        return key, entry, headers
+
+    def _stale_or_raise(self, key: str, entry: Optional[dict[str, Any]], error: Exception) -> dict[str, Any]:
+        if entry and is_transient_error(error):
+            self._logger.warning(f"Reference data fetch failed, serving the stale cached copy: {error}")
+            return entry["body"]
+        self._backend.delete_prefix(key)
+        raise error
+
+    def _revalidated(self, key: str, entry: dict[str, Any]) -> dict[str, Any]:
+        entry = dict(entry, expires_at=time.time() + self._ttl)
+        self._backend.set(key, entry)
+        return entry["body"]
+
+    def _store(self, session: Any, account: Optional[str], url: str, body: dict[str, Any], etag: Optional[str]) -> dict[str, Any]:
+        session_key = self._session_key(session, account)
+        self._backend.set(session_key + url, {
+            "body": body,
+            "etag": etag,
+            "expires_at": time.time() + self._ttl
+        })
+        # Entries stored under the account's previous sessions are never read again
+        self._backend.delete_prefix(self._account_key(account), keep=session_key)
+        return body
+
+    def invalidate(self, account: Optional[str] = None) -> None:
+        self._backend.delete_prefix(self._account_key(account))
+        self._logger.info("Reference data cache invalidated")
+
+    def clear(self) -> None:
+        self._backend.delete_prefix("")
+
+    def _account_key(self, account: Optional[str]) -> str:
+        account = account or get_settings().email or ""
+        return hashlib.sha256(account.encode("utf-8")).hexdigest()[:16] + ":"
+
+    def _session_key(self, session: Any, account: Optional[str]) -> str:
+        try:
+            usid = session.cookies.get("USID") or ""
+        except Exception:
+            # Both requests and httpx refuse to pick between duplicated cookies, the account still keeps them apart
+            usid = ""
+        return self._account_key(account) + hashlib.sha256(usid.encode("utf-8")).hexdigest()[:16] + ":"
+
+
+_default_cache: Optional[ReferenceCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_reference_cache() -> ReferenceCache:
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ReferenceCache.from_settings()
+        return _default_cache
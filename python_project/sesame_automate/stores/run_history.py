@@ -0,0 +1,77 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Iterator, Optional
+from sesame_automate.config.settings import get_settings
+
+
+class RunHistory:
+    def __init__(self, path: Optional[str] = None):
+        self._path = path or get_settings().run_history_path
+        self._lock = threading.Lock()
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS job_runs ("
+                "job_id TEXT NOT NULL, "
+                "scheduled_at REAL NOT NULL, "
+                "status TEXT NOT NULL, "
+                "error TEXT, "
+                "recorded_at REAL NOT NULL, "
+                "PRIMARY KEY (job_id, scheduled_at))"
+            )
+
+    def record(self, job_id: str, scheduled_at: datetime, status: str, error: Optional[str] = None) -> None:
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "INSERT INTO job_runs (job_id, scheduled_at, status, error, recorded_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(job_id, scheduled_at) DO UPDATE SET status = excluded.status, error = excluded.error, "
+                "recorded_at = excluded.recorded_at",
+                (job_id, scheduled_at.timestamp(), status, error, time.time())
+            )
+
+    def last_run(self, job_id: str) -> Optional[dict[str, Any]]:
+        with self._lock, self._connect() as connection:
+            row = connection.execute(
+                "SELECT scheduled_at, status, error, recorded_at FROM job_runs WHERE job_id = ? "
+                "ORDER BY scheduled_at DESC LIMIT 1", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"scheduled_at": row[0], "status": row[1], "error": row[2], "recorded_at": row[3]}
+
+    def recent(self, limit: int = 50) -> list[dict[str, Any]]:
+        with self._lock, self._connect() as connection:
+            rows = connection.execute(
+                "SELECT job_id, scheduled_at, status, error, recorded_at FROM job_runs "
+                "ORDER BY recorded_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [
+            {"job_id": row[0], "scheduled_at": row[1], "status": row[2], "error": row[3], "recorded_at": row[4]}
+            for row in rows
+        ]
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        directory = os.path.dirname(os.path.abspath(self._path))
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self._path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+_default_history: Optional[RunHistory] = None
+_default_history_lock = threading.Lock()
+
+
+def get_run_history() -> RunHistory:
+    global _default_history
+    with _default_history_lock:
+        if _default_history is None:
+            _default_history = RunHistory()
+        return _default_history
@@ -0,0 +1,96 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Optional
+from sesame_automate.config.settings import get_settings
+
+
+class SessionStore:
+    def __init__(self, path: Optional[str] = None):
+        self._path = path or get_settings().session_store_path
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._signature: Optional[tuple[int, int, int]] = None
+        self._logger = logging.getLogger(__name__)
+
+    def load(self, account: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            entry = self._read().get(account)
+            return dict(entry) if entry else None
+
+    def save_session(self, account: str, usid: str) -> None:
+        with self._lock:
+            entries = self._read()
+            entries[account] = {
+                "usid": usid,
+                "user_info": None,
+                "saved_at": time.time()
+            }
+            self._write(entries)
+
+    def save_user_info(self, account: str, user_info: dict[str, Any]) -> None:
+        with self._lock:
+            entries = self._read()
+            entry = entries.get(account)
+            if not entry:
+                return
+            entry["user_info"] = user_info
+            self._write(entries)
+
+    def invalidate(self, account: str) -> None:
+        with self._lock:
+            entries = self._read()
+            if entries.pop(account, None) is not None:
+                self._write(entries)
+                self._logger.info("Stored session invalidated")
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        signature = self._file_signature()
+        if self._entries is None or signature != self._signature:
+            self._signature = signature
+            try:
+                with open(self._path, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, ValueError) as e:
+                self._logger.warning(f"Ignoring unreadable session store {self._path}: {e}")
+                self._entries = {}
+        return self._entries
+
+    def _write(self, entries: dict[str, dict[str, Any]]) -> None:
+        directory = os.path.dirname(os.path.abspath(self._path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".session-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self._path)
+            self._signature = self._file_signature()
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _file_signature(self) -> Optional[tuple[int, int, int]]:
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+_default_store: Optional[SessionStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = SessionStore()
+        return _default_store
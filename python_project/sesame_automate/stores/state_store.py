@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from sesame_automate.config.settings import get_settings
+from sesame_automate.models.enums.state import State
+
+
+class StateStore:
+    def __init__(self, path: Optional[str] = None):
+        self._path = path or get_settings().state_store_path
+        self._lock = threading.Lock()
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS account_state ("
+                "account TEXT PRIMARY KEY, "
+                "state TEXT NOT NULL, "
+                "source TEXT NOT NULL, "
+                "updated_at REAL NOT NULL)"
+            )
+
+    def get(self, account: str) -> Optional[dict[str, Any]]:
+        with self._lock, self._connect() as connection:
+            row = connection.execute(
+                "SELECT state, source, updated_at FROM account_state WHERE account = ?", (account,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"state": State(row[0]), "source": row[1], "updated_at": row[2]}
+
+    def set(self, account: str, state: State, source: str) -> None:
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "INSERT INTO account_state (account, state, source, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(account) DO UPDATE SET state = excluded.state, source = excluded.source, updated_at = excluded.updated_at",
+                (account, str(state), source, time.time())
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        directory = os.path.dirname(os.path.abspath(self._path))
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self._path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+_default_store: Optional[StateStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_state_store() -> StateStore:
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = StateStore()
+        return _default_store
@@ -0,0 +1,78 @@
+import os
+import pytest
+from record_cassettes import EMAIL, PASSWORD, WORKDAY_CASSETTE
+from sesame_automate.config import reload_settings
+
+SINGLETONS = (
+    ("sesame_automate.config.settings", "_settings"),
+    ("sesame_automate.http_client.cassette", "_default_cassette"),
+    ("sesame_automate.http_client.async_client", "_default_pool"),
+    ("sesame_automate.http_client.http_policy", "_default_policy"),
+    ("sesame_automate.logging_pipeline.logging_pipeline", "_default_pipeline"),
+    ("sesame_automate.stores.reference_cache", "_default_cache"),
+    ("sesame_automate.stores.session_store", "_default_store"),
+    ("sesame_automate.stores.run_history", "_default_history"),
+    ("sesame_automate.stores.clock_outbox", "_default_outbox"),
+    ("sesame_automate.stores.state_store", "_default_store"),
+    ("sesame_automate.scheduling.working_calendar", "_default_calendar"),
+    ("sesame_automate.planning.day_planner", "_default_planner"),
+    ("sesame_automate.metrics.metrics_collector", "_default_collector"),
+    ("sesame_automate.coordination.job_coordinator", "_default_coordinator"),
+    ("sesame_automate.status.job_history", "_default_history"),
+    ("sesame_automate.main", "_runtime"),
+)
+SETTINGS_PREFIXES = (
+    "TIME_ZONE", "REMOTE_WORK_DAYS", "REPLICA_", "BASE_URL", "COOKIE_DOMAIN", "SESAME_", "BREAK_", "IN_TIME_CRON",
+    "OUT_TIME_CRON", "CALENDAR_", "FAST_START", "SCHEDULE", "CATCH_UP_", "METRICS_", "TRACE_FILE", "STATUS_", "LOG_",
+    "CLOCK_OUTBOX", "OUTBOX_", "FLEET_", "COORDINATION_", "LEASE_TTL", "SESSION_STORE_PATH", "STATE_STORE_PATH",
+    "RUN_HISTORY_PATH", "REFERENCE_CACHE_", "HTTP_", "CIRCUIT_", "ASYNC_MAX_", "SETTINGS_"
+)
+
+
+def reset_singletons() -> None:
+    import importlib
+    from sesame_automate.models import runnable_sequence
+
+    for module_name, attribute in SINGLETONS:
+        setattr(importlib.import_module(module_name), attribute, None)
+    runnable_sequence._global_hooks.clear()
+
+
+@pytest.fixture(autouse=True)
+def sesame_env(tmp_path, monkeypatch):
+    for key in list(os.environ):
+        if key.startswith(SETTINGS_PREFIXES):
+            monkeypatch.delenv(key)
+    environ = {
+        "BASE_URL": "http://127.0.0.1:9",
+        "COOKIE_DOMAIN": "127.0.0.1",
+        "SESAME_EMAIL": EMAIL,
+        "SESAME_PASSWORD": PASSWORD,
+        "BREAK_NAME": "Lunch",
+        "HTTP_MAX_RETRIES": "0",
+        "HTTP_CASSETTE": "replay",
+        "HTTP_CASSETTE_PATH": WORKDAY_CASSETTE,
+        "SESSION_STORE_PATH": str(tmp_path / "session.json"),
+        "STATE_STORE_PATH": str(tmp_path / "state.sqlite"),
+        "RUN_HISTORY_PATH": str(tmp_path / "runs.sqlite"),
+        "CLOCK_OUTBOX_PATH": str(tmp_path / "outbox.sqlite"),
+        "REFERENCE_CACHE_PATH": str(tmp_path / "reference_cache.json"),
+        "COORDINATION_PATH": str(tmp_path / "leases.sqlite"),
+        "LOG_DIR": str(tmp_path / "logs")
+    }
+    for key, value in environ.items():
+        monkeypatch.setenv(key, value)
+    monkeypatch.chdir(tmp_path)
+    reset_singletons()
+    reload_settings()
+    yield environ
+    reset_singletons()
+
+
+@pytest.fixture
+def settings_env(monkeypatch):
+    def apply(**values):
+        for key, value in values.items():
+            monkeypatch.setenv(key, value)
+        return reload_settings()
+    return apply
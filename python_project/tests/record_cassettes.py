@@ -0,0 +1,60 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+CASSETTE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes")
+WORKDAY_CASSETTE = os.path.join(CASSETTE_DIR, "workday.json.gz")
+EMAIL = "ana@example.com"
+PASSWORD = "correct-horse-battery"
+
+
+def record_workday(base_url: str, workdir: str) -> None:
+    from sesame_automate.config import reload_settings
+    from sesame_automate.http_client import get_cassette
+    from sesame_automate.jobs import AccountJobs
+    from sesame_automate.models.account import Account
+    from sesame_automate.models.enums.state import State
+
+    os.environ.update({
+        "BASE_URL": base_url,
+        "COOKIE_DOMAIN": "127.0.0.1",
+        "BREAK_NAME": "Lunch",
+        "REMOTE_WORK_DAYS": "",
+        "HTTP_MAX_RETRIES": "0",
+        "HTTP_CASSETTE": "record",
+        "HTTP_CASSETTE_PATH": WORKDAY_CASSETTE,
+        "SESSION_STORE_PATH": os.path.join(workdir, "session.json"),
+        "STATE_STORE_PATH": os.path.join(workdir, "state.sqlite"),
+        "RUN_HISTORY_PATH": os.path.join(workdir, "runs.sqlite"),
+        "CLOCK_OUTBOX_PATH": os.path.join(workdir, "outbox.sqlite"),
+        "LOG_DIR": os.path.join(workdir, "logs")
+    })
+    reload_settings()
+
+    jobs = AccountJobs(Account("ana", EMAIL, PASSWORD))
+    for job_name in ("welcome_job", "in_time_job", "break_start_job", "break_finished_job", "out_time_job", "plan_job"):
+        result = getattr(jobs, job_name)()
+        if not (result and result.get("last_successful")):
+            raise SystemExit(f"{job_name} failed while recording: {result}")
+
+    async def status() -> dict:
+        return await (jobs._login | jobs._me | jobs._check_status).ainvoke({"current_state": State.WORKING})
+
+    result = asyncio.run(status())
+    if not result.get("last_successful"):
+        raise SystemExit(f"async status failed while recording: {result}")
+    get_cassette().save()
+
+
+def main() -> None:
+    from sesame_automate.simulation import MockSesameServer
+
+    with tempfile.TemporaryDirectory(prefix="sesame-cassette-") as workdir, MockSesameServer() as server:
+        record_workday(server.base_url, workdir)
+    print(f"Recorded {WORKDAY_CASSETTE}")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    main()
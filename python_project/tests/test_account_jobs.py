@@ -0,0 +1,148 @@
+import json
+from datetime import date, datetime, timedelta
+import pytest
+from record_cassettes import EMAIL, PASSWORD
+from sesame_automate.fleet import Fleet
+from sesame_automate.jobs import AccountJobs
+from sesame_automate.models.account import Account
+from sesame_automate.models.enums.state import State
+from sesame_automate.models.runnable_sequence import register_hook
+from sesame_automate.status.job_history import get_job_history
+from sesame_automate.stores.clock_outbox import get_clock_outbox
+from sesame_automate.stores.state_store import get_state_store
+
+
+@pytest.fixture
+def jobs():
+    return AccountJobs(Account("ana", EMAIL, PASSWORD))
+
+
+def test_workday_pipeline(jobs):
+    welcome = jobs.welcome_job()
+    assert welcome['last_successful'] is True
+    assert welcome['critical_path'][0] == "login"
+    assert welcome['day_plan'].work_break_id == "break-1"
+
+    check_in = jobs.in_time_job()
+    assert check_in['last_successful'] is True
+    assert check_in['server_state'] == State.WORKING
+
+    break_start = jobs.break_start_job()
+    assert break_start['check_out_successful'] is True
+    assert break_start['server_state'] == State.BREAK
+
+    break_end = jobs.break_finished_job()
+    assert break_end['check_in_successful'] is True
+    assert break_end['server_state'] == State.WORKING
+
+    check_out = jobs.out_time_job()
+    assert check_out['server_state'] == State.OFFLINE
+    assert get_state_store().get(EMAIL)['state'] == State.OFFLINE
+
+    runs = get_job_history().recent(account="ana")
+    assert [run['job'] for run in runs] == ["out_time_job", "break_finished_job", "break_start_job", "in_time_job", "welcome_job"]
+    assert all(run['ok'] for run in runs)
+    assert "ana" in get_job_history().last_login()
+
+
+def test_failed_welcome_login_skips_the_dependent_nodes(settings_env):
+    settings_env(SESAME_PASSWORD="")
+    register_hook(get_job_history())
+
+    result = AccountJobs(Account("ana", EMAIL, "")).welcome_job()
+
+    assert result['last_successful'] is False
+    assert result['errors'][0]['step'] == "login"
+    assert [skipped['step'] for skipped in result['skipped_steps']] == ["me", "work_break", "assigned_work_check_types", "day_plan"]
+    run, = get_job_history().recent(job="welcome_job")
+    assert run['ok'] is False
+    assert [step['step'] for step in run['steps']] == ["login", "me", "work_break", "assigned_work_check_types", "day_plan"]
+
+
+def test_plan_job(jobs):
+    jobs.welcome_job()
+
+    result = jobs.plan_job(date(2026, 3, 4))
+
+    assert result['last_successful'] is True
+    assert result['day_plan']['day'] == "2026-03-04"
+    assert result['day_plan']['work_break_id'] == "break-1"
+    assert result['day_off'] is None
+    json.dumps(result)
+
+
+def test_remote_day_plan_uses_remote_check_type():
+    jobs = AccountJobs(Account("ana", EMAIL, PASSWORD, remote_work_days=["wednesday"]))
+    jobs.welcome_job()
+
+    result = jobs.plan_job(date(2026, 3, 4))
+
+    assert result['day_plan']['remote'] is True
+    assert result['day_plan']['work_check_type_id'] == "check-type-remote"
+
+
+def test_day_off_skips_clock_jobs(tmp_path, settings_env):
+    calendar = tmp_path / "calendar.json"
+    calendar.write_text(json.dumps([{"date": date.today().isoformat(), "reason": "Holiday"}]))
+    settings_env(CALENDAR_FILE=str(calendar))
+    jobs = AccountJobs(Account("ana", EMAIL, PASSWORD))
+
+    for job in (jobs.in_time_job, jobs.break_start_job, jobs.break_finished_job, jobs.out_time_job):
+        result = job()
+        assert result['skipped'] is True
+        assert result['skip_reason'] == "day off: Holiday"
+    assert "ana" in get_job_history().last_handled()
+
+
+def test_day_off_uses_the_scheduled_day(tmp_path, settings_env):
+    yesterday = datetime.now().astimezone() - timedelta(days=1)
+    calendar = tmp_path / "calendar.json"
+    calendar.write_text(json.dumps([{"date": yesterday.date().isoformat(), "reason": "Holiday"}]))
+    settings_env(CALENDAR_FILE=str(calendar), CLOCK_OUTBOX="always")
+    jobs = AccountJobs(Account("ana", EMAIL, PASSWORD))
+
+    assert jobs.in_time_job(scheduled_at=yesterday)['skip_reason'] == "day off: Holiday"
+    assert jobs.out_time_job().get('skip_reason') != "day off: Holiday"
+
+
+def test_calendar_job_is_disabled_without_api_source(jobs):
+    assert jobs.calendar_job() is None
+
+
+def test_scheduled_slot_reaches_the_outbox(settings_env):
+    settings_env(CLOCK_OUTBOX="always")
+    jobs = AccountJobs(Account("ana", EMAIL, PASSWORD))
+    slot = datetime.now().astimezone().replace(microsecond=0) - timedelta(minutes=5)
+    jobs.welcome_job()
+
+    result = jobs.in_time_job(scheduled_at=slot)
+
+    assert result['queued'] is True
+    event, = get_clock_outbox().due()
+    assert event['scheduled_at'] == slot.timestamp()
+    assert event['target_state'] == State.WORKING
+    assert get_state_store().get(EMAIL)['state'] == State.OFFLINE
+
+
+def test_deliver_outbox_event(jobs):
+    jobs.welcome_job()
+    outbox = get_clock_outbox()
+    plan = jobs.plan_job()['day_plan']
+    outbox.enqueue(EMAIL, "check_in", State.WORKING, plan['check_in_url'], {"workCheckTypeId": None})
+    event, = outbox.due()
+
+    result = jobs.deliver_outbox_event(event)
+
+    assert result['delivery_status'] == "sent"
+    assert get_state_store().get(EMAIL)['state'] == State.WORKING
+
+
+def test_fleet_runs_jobs_through_the_coordinator():
+    fleet = Fleet([Account("ana", EMAIL, PASSWORD)], max_workers=2)
+    try:
+        assert fleet.welcome_job()["ana"]['last_successful'] is True
+        result = fleet.in_time_job(datetime.now().astimezone())["ana"]
+        assert result['server_state'] == State.WORKING
+        assert fleet.deliver_outbox_event({"account": "nobody@example.com"})['retryable'] is False
+    finally:
+        fleet.shutdown()
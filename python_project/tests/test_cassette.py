@@ -0,0 +1,210 @@
+import gzip
+import json
+import threading
+import pytest
+import requests
+from record_cassettes import PASSWORD, WORKDAY_CASSETTE
+from sesame_automate.http_client import get_cassette
+from sesame_automate.http_client.cassette import (
+    SCRUBBED,
+    SCRUBBED_USID,
+    Cassette,
+    CassetteAdapter,
+    CassetteError,
+    interaction_key,
+    mount_cassette
+)
+
+LOGIN_URL = "http://127.0.0.1:9/api/v3/security/login"
+USID = "0123456789abcdef0123456789abcdef"
+
+
+def record_login(cassette: Cassette) -> None:
+    cassette.record(
+        "POST", LOGIN_URL,
+        {"Content-Type": "application/json"},
+        json.dumps({"email": "ana@example.com", "password": PASSWORD}).encode("utf-8"),
+        200, "OK",
+        {"Content-Type": "application/json", "Content-Length": "44"},
+        json.dumps({"data": USID}).encode("utf-8")
+    )
+    cassette.record(
+        "GET", "http://127.0.0.1:9/api/v3/security/me",
+        {"Cookie": f"USID={USID}"},
+        None,
+        200, "OK",
+        {"Set-Cookie": f"USID={USID}; Path=/"},
+        json.dumps({"data": [{"id": "employee-1", "token": "secret-token-value"}]}).encode("utf-8")
+    )
+
+
+class TestInteractionKey:
+    def test_ignores_host_and_query_order(self):
+        assert interaction_key("get", "http://a/x?b=2&a=1") == interaction_key("GET", "https://b:8080/x?a=1&b=2")
+
+    def test_keeps_query(self):
+        assert interaction_key("GET", "http://a/x?from=2026-01-01") == "GET /x?from=2026-01-01"
+
+
+class TestScrubbing:
+    def test_recorded_workday_has_no_secrets(self):
+        with gzip.open(WORKDAY_CASSETTE, "rt", encoding="utf-8") as f:
+            content = f.read()
+        assert PASSWORD not in content
+        assert SCRUBBED_USID in content
+        assert json.loads(content)["version"] == 1
+
+    def test_scrubs_usid_password_and_cookies(self, tmp_path):
+        path = str(tmp_path / "scrubbed.json")
+        cassette = Cassette(path, "record")
+        record_login(cassette)
+        cassette.save()
+
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        assert USID not in content
+        assert PASSWORD not in content
+        assert "secret-token-value" not in content
+        login, me = json.loads(content)["interactions"]
+        assert json.loads(login["request"]["body"])["password"] == SCRUBBED
+        assert json.loads(login["response"]["body"])["data"] == SCRUBBED_USID
+        assert "content-length" not in {name.lower() for name in login["response"]["headers"]}
+        assert me["request"]["headers"]["Cookie"] == SCRUBBED
+        assert me["response"]["headers"]["Set-Cookie"] == SCRUBBED
+
+    def test_keeps_binary_bodies(self, tmp_path):
+        path = str(tmp_path / "binary.json")
+        cassette = Cassette(path, "record")
+        cassette.record("GET", "http://x/file", {}, None, 200, "OK", {}, b"\xff\x00\xfe")
+        cassette.save()
+
+        replayed = Cassette(path, "replay")
+        assert replayed.play("GET", "http://y/file")["body_base64"]
+
+
+class TestReplay:
+    def test_gz_round_trip(self, tmp_path):
+        path = str(tmp_path / "round_trip.json.gz")
+        cassette = Cassette(path, "record")
+        record_login(cassette)
+        cassette.save()
+
+        with open(path, "rb") as f:
+            assert f.read(2) == b"\x1f\x8b"
+        replayed = Cassette(path, "replay")
+        assert len(replayed) == 2
+        assert json.loads(replayed.play("POST", "https://sesame.test/api/v3/security/login")["body"]) == {"data": SCRUBBED_USID}
+
+    def test_cycles_through_recorded_responses(self):
+        cassette = Cassette(WORKDAY_CASSETTE, "replay")
+        employee_url = "http://x/api/v3/employees/4badeee4-791f-51e2-a027-2c59bc6f8144/check-in"
+        first = cassette.play("POST", employee_url)
+        second = cassette.play("POST", employee_url)
+        cassette.play("POST", employee_url)
+        assert cassette.play("POST", employee_url) is first
+        assert first is not second
+
+    def test_concurrent_play_hands_out_each_response_once(self):
+        cassette = Cassette(WORKDAY_CASSETTE, "replay")
+        url = "http://x/api/v3/employees/4badeee4-791f-51e2-a027-2c59bc6f8144"
+        responses = len(cassette._recorded[interaction_key("GET", url)])
+        played = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(8)
+
+        def play():
+            barrier.wait()
+            for _ in range(responses * 25):
+                response = cassette.play("GET", url)
+                with lock:
+                    played.append(id(response))
+
+        threads = [threading.Thread(target=play) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(played) == 8 * responses * 25
+        assert len(set(played)) == responses
+        assert all(played.count(response) == 8 * 25 for response in set(played))
+
+    def test_missing_interaction_raises(self):
+        cassette = Cassette(WORKDAY_CASSETTE, "replay")
+        with pytest.raises(CassetteError, match="No recorded response for DELETE /unknown"):
+            cassette.play("DELETE", "http://x/unknown")
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(CassetteError, match="Cannot replay cassette"):
+            Cassette(str(tmp_path / "missing.json.gz"), "replay")
+
+    def test_unsupported_version_raises(self, tmp_path):
+        path = tmp_path / "future.json"
+        path.write_text(json.dumps({"version": 99, "interactions": []}))
+        with pytest.raises(CassetteError, match="Unsupported cassette version 99"):
+            Cassette(str(path), "replay")
+
+
+class TestAdapter:
+    def test_session_replays_through_adapter(self):
+        session = mount_cassette(requests.Session())
+        assert isinstance(session.get_adapter("http://127.0.0.1:9"), CassetteAdapter)
+
+        response = session.post("http://127.0.0.1:9/api/v3/security/login", json={"email": "a", "password": "b"})
+        assert response.status_code == 200
+        assert response.json() == {"data": SCRUBBED_USID}
+        assert response.headers["Content-Type"] == "application/json"
+
+    def test_adapter_records_live_responses(self, tmp_path):
+        from sesame_automate.simulation import MockSesameServer
+
+        cassette = Cassette(str(tmp_path / "live.json"), "record")
+        session = requests.Session()
+        session.mount("http://", CassetteAdapter(cassette))
+        with MockSesameServer() as server:
+            response = session.post(server.base_url + "/api/v3/security/login", json={"email": "a@b.c", "password": PASSWORD})
+        usid = response.json()["data"]
+        cassette.save()
+
+        content = (tmp_path / "live.json").read_text()
+        assert usid not in content
+        assert PASSWORD not in content
+        assert len(cassette) == 1
+
+    def test_off_mode_leaves_session_alone(self, settings_env):
+        settings_env(HTTP_CASSETTE="off")
+        session = mount_cassette(requests.Session())
+        assert get_cassette() is None
+        assert not isinstance(session.get_adapter("http://x"), CassetteAdapter)
+
+    def test_async_transport_replays(self):
+        import asyncio
+        import httpx
+        from sesame_automate.http_client.cassette import AsyncCassetteTransport
+
+        async def fetch():
+            async with httpx.AsyncClient(transport=AsyncCassetteTransport(get_cassette())) as client:
+                return await client.post("http://127.0.0.1:9/api/v3/security/login", json={})
+
+        response = asyncio.run(fetch())
+        assert response.json() == {"data": SCRUBBED_USID}
+
+    def test_async_transport_records(self, tmp_path):
+        import asyncio
+        import httpx
+        from sesame_automate.http_client.cassette import AsyncCassetteTransport
+        from sesame_automate.simulation import MockSesameServer
+
+        cassette = Cassette(str(tmp_path / "async.json"), "record")
+
+        async def login(base_url):
+            transport = AsyncCassetteTransport(cassette, httpx.AsyncHTTPTransport())
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await client.post(base_url + "/api/v3/security/login", json={"email": "a@b.c", "password": PASSWORD})
+
+        with MockSesameServer() as server:
+            response = asyncio.run(login(server.base_url))
+        cassette.save()
+
+        assert response.status_code == 200
+        assert response.json()["data"] not in (tmp_path / "async.json").read_text()
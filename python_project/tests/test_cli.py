@@ -0,0 +1,194 @@
+import io
+import json
+from datetime import date
+from types import SimpleNamespace
+import pytest
+from sesame_automate.batch import batch_cli
+from sesame_automate.batch.batch_cli import BatchRunner, read_account_names, result_line, select_accounts
+from sesame_automate.fleet import load_accounts
+from sesame_automate.models.account import Account
+from sesame_automate.planning import plan_cli
+from sesame_automate.simulation import MockSesameServer
+
+ACCOUNTS_TOML = """
+[[accounts]]
+name = "ana"
+email = "ana@example.com"
+password = "secret"
+
+[[accounts]]
+name = "ben"
+email = "ben@example.com"
+password_env = "BEN_PASSWORD"
+remote_work_days = ["wednesday"]
+"""
+
+
+@pytest.fixture
+def live(settings_env, monkeypatch):
+    monkeypatch.setenv("BEN_PASSWORD", "secret")
+    with MockSesameServer() as server:
+        settings_env(HTTP_CASSETTE="off", BASE_URL=server.base_url)
+        yield server
+
+
+@pytest.fixture
+def accounts_file(tmp_path, settings_env, live):
+    path = tmp_path / "accounts.toml"
+    path.write_text(ACCOUNTS_TOML)
+    settings_env(SESAME_ACCOUNTS_FILE=str(path))
+    return path
+
+
+def output_lines(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+class TestAccountsLoader:
+    def test_toml_and_yaml(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BEN_PASSWORD", "secret")
+        toml = tmp_path / "accounts.toml"
+        toml.write_text(ACCOUNTS_TOML)
+        yaml = tmp_path / "accounts.yaml"
+        yaml.write_text("- email: ana@example.com\n  password: secret\n")
+
+        assert [account.name for account in load_accounts(str(toml))] == ["ana", "ben"]
+        assert load_accounts(str(yaml))[0].name == "ana@example.com"
+
+    def test_errors(self, tmp_path):
+        empty = tmp_path / "empty.yml"
+        empty.write_text("")
+        duplicated = tmp_path / "duplicated.toml"
+        duplicated.write_text('accounts = [{email = "a@x", password = "p"}, {email = "a@x", password = "p"}]\n')
+
+        with pytest.raises(ValueError, match="expected .toml, .yaml or .yml"):
+            load_accounts(str(tmp_path / "accounts.json"))
+        with pytest.raises(ValueError, match="No accounts found"):
+            load_accounts(str(empty))
+        with pytest.raises(ValueError, match="Duplicated account names.*a@x"):
+            load_accounts(str(duplicated))
+
+
+class TestBatchHelpers:
+    def test_select_accounts(self):
+        accounts = {name: SimpleNamespace(account=Account(name, f"{name}@example.com", "x")) for name in ("ana", "ben", "carl")}
+
+        assert list(select_accounts(accounts, [], [])) == ["ana", "ben", "carl"]
+        assert list(select_accounts(accounts, ["carl"], ["b*@example.com"])) == ["ben", "carl"]
+        with pytest.raises(ValueError, match="Unknown accounts: dan"):
+            select_accounts(accounts, ["dan"], [])
+
+    def test_read_account_names(self, tmp_path, monkeypatch):
+        path = tmp_path / "names.txt"
+        path.write_text("ana\n\n  # comment\nben \n")
+        monkeypatch.setattr("sys.stdin", io.StringIO("carl\n"))
+
+        assert read_account_names(str(path)) == ["ana", "ben"]
+        assert read_account_names("-") == ["carl"]
+
+    def test_result_line(self):
+        class Plan:
+            def to_dict(self):
+                return {"remote": False}
+
+        line = result_line("plan", "ana", date(2026, 3, 4), {'last_successful': True, 'day_plan': Plan()}, 0.0123)
+        assert line == {
+            "command": "plan", "account": "ana", "ok": True, "skipped": False, "duration_ms": 12.3,
+            "date": "2026-03-04", "last_successful": True, "day_plan": {"remote": False}
+        }
+        assert result_line("check-in", "ana", None, None, 0.0)["error"] == "Job returned no result"
+        assert result_line("check-in", "ana", None, {}, 0.0, RuntimeError("boom"))["error"] == "boom"
+
+    def test_runner_counts_outcomes(self):
+        class Jobs:
+            def __init__(self, result):
+                self.result = result
+
+            def in_time_job(self):
+                if isinstance(self.result, Exception):
+                    raise self.result
+                return self.result
+
+        output = io.StringIO()
+        accounts = {
+            "ana": Jobs({'last_successful': True}),
+            "ben": Jobs({'last_successful': True, 'skipped': True}),
+            "carl": Jobs(RuntimeError("boom"))
+        }
+
+        summary = BatchRunner(2, rate_limit=1000, output=output).run("check-in", accounts, [None])["summary"]
+
+        assert (summary["ok"], summary["skipped"], summary["failed"]) == (1, 1, 1)
+        assert summary["failed_accounts"] == ["carl"]
+        assert len(output.getvalue().splitlines()) == 3
+
+
+class TestBatchCli:
+    def test_plans_every_day_for_the_fleet(self, accounts_file, capsys):
+        batch_cli.main(["plan", "--date", "2026-03-04", "--date", "2026-03-05"])
+
+        summary = output_lines(capsys)[-1]["summary"]
+        assert (summary["total"], summary["ok"], summary["failed"]) == (4, 4, 0)
+
+    def test_dry_run(self, accounts_file, capsys):
+        batch_cli.main(["check-in", "--match", "b*", "--dry-run"])
+
+        assert output_lines(capsys) == [{"command": "check-in", "account": "ben", "email": "ben@example.com", "dry_run": True}]
+
+    def test_check_in_single_account(self, live, capsys):
+        batch_cli.main(["check-in", "--all", "--workers", "1"])
+
+        assert output_lines(capsys)[-1]["summary"]["ok"] == 1
+        assert [event["type"] for event in live.clock_events] == ["check-in"]
+
+    def test_exits_with_failure(self, live, capsys):
+        live.error_rate = 1.0
+
+        with pytest.raises(SystemExit) as exit_info:
+            batch_cli.main(["check-out", "--account", "ana@example.com"])
+
+        assert exit_info.value.code == 1
+        assert output_lines(capsys)[-1]["summary"]["failed_accounts"] == ["ana@example.com"]
+
+    @pytest.mark.parametrize("argv, message", [
+        (["check-in", "--date", "2026-03-04", "--all"], "cannot be backdated"),
+        (["check-in"], "changes clock state"),
+        (["plan", "--workers", "0"], "--workers must be at least 1"),
+        (["plan", "--rate", "0"], "--rate must be positive"),
+        (["plan", "--account", "nobody"], "Unknown accounts: nobody"),
+        (["plan", "--match", "nobody*"], "No accounts match the selection")
+    ])
+    def test_argument_errors(self, live, capsys, argv, message):
+        with pytest.raises(SystemExit) as exit_info:
+            batch_cli.main(argv)
+
+        assert exit_info.value.code == 2
+        assert message in capsys.readouterr().err
+
+
+class TestPlanCli:
+    def test_prints_the_plan_of_every_account(self, accounts_file, capsys):
+        plan_cli.main(["--date", "2026-03-04"])
+
+        plans = json.loads(capsys.readouterr().out)
+        assert plans["ana"]["day_plan"]["remote"] is False
+        assert plans["ben"]["day_plan"]["remote"] is True
+
+    def test_single_account(self, accounts_file, capsys):
+        plan_cli.main(["--account", "ben"])
+
+        assert list(json.loads(capsys.readouterr().out)) == ["ben"]
+
+    def test_unknown_account(self, accounts_file, capsys):
+        with pytest.raises(SystemExit):
+            plan_cli.main(["--account", "nobody"])
+
+        assert "Unknown account 'nobody'" in capsys.readouterr().err
+
+    def test_exits_with_failure(self, live, capsys):
+        live.error_rate = 1.0
+
+        with pytest.raises(SystemExit) as exit_info:
+            plan_cli.main([])
+
+        assert exit_info.value.code == 1
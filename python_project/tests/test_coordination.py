@@ -0,0 +1,189 @@
+import threading
+import time
+from datetime import datetime
+import pytest
+from apscheduler.triggers.cron import CronTrigger
+from sesame_automate.coordination import (
+    FileLeaseBackend,
+    JobCoordinator,
+    SqliteLeaseBackend,
+    get_job_coordinator,
+    scheduled_slot,
+    shard_index
+)
+
+SLOT = datetime(2026, 3, 2, 9, 0).astimezone()
+
+
+@pytest.fixture(params=["sqlite", "file"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        return SqliteLeaseBackend(str(tmp_path / "leases" / "leases.sqlite"))
+    return FileLeaseBackend(str(tmp_path / "leases" / "leases.json"))
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def account_owned_by(index, replica_count=2):
+    return next(f"user{n}" for n in range(100) if shard_index(f"user{n}", replica_count) == index)
+
+
+class TestLeaseBackends:
+    def test_lease_lifecycle(self, backend):
+        assert backend.get("job") is None
+        assert backend.acquire("job", "a", ttl=30)
+        assert backend.acquire("job", "a", ttl=30)
+        assert not backend.acquire("job", "b", ttl=30)
+        assert backend.renew("job", "a", ttl=30)
+        assert not backend.renew("job", "b", ttl=30)
+
+        backend.complete("job", "a", "done")
+        assert backend.get("job")["status"] == "done"
+        assert not backend.acquire("job", "b", ttl=30)
+        assert not backend.renew("job", "a", ttl=30)
+
+    def test_failed_lease_can_be_acquired_again(self, backend):
+        assert backend.acquire("job", "a", ttl=30)
+        backend.complete("job", "a", "failed")
+
+        assert backend.acquire("job", "b", ttl=30)
+        assert backend.get("job")["status"] == "running"
+        assert not backend.acquire("job", "a", ttl=30)
+
+    def test_expired_lease_can_be_taken_over(self, backend):
+        assert backend.acquire("job", "a", ttl=-1)
+        assert backend.acquire("job", "b", ttl=30)
+        assert backend.get("job")["holder"] == "b"
+
+
+def test_file_backend_ignores_corrupt_file(tmp_path):
+    path = tmp_path / "leases.json"
+    path.write_text("{oops")
+
+    assert FileLeaseBackend(str(path)).acquire("job", "a", ttl=30)
+
+
+class TestJobCoordinator:
+    def test_runs_directly_without_backend(self):
+        coordinator = JobCoordinator(replica_id="a")
+
+        assert coordinator.run("ana", "in_time_job", SLOT, lambda: "ran") == "ran"
+        assert coordinator.owns("anyone")
+
+    def test_runs_each_slot_once(self, backend):
+        first = JobCoordinator(backend, "a", lease_ttl=30)
+        second = JobCoordinator(backend, "b", lease_ttl=30)
+
+        assert first.run("ana", "in_time_job", SLOT, lambda: {'last_successful': True}) == {'last_successful': True}
+        skipped = second.run("ana", "in_time_job", SLOT, lambda: pytest.fail("ran twice"))
+        assert skipped['skip_reason'] == "handled by replica a (done)"
+
+    def test_failed_run_is_retried_by_another_replica(self, backend):
+        first = JobCoordinator(backend, "a")
+        second = JobCoordinator(backend, "b")
+        with pytest.raises(RuntimeError):
+            first.run("ana", "in_time_job", SLOT, lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+        assert backend.get(f"ana:in_time_job:{SLOT.isoformat()}")["status"] == "failed"
+
+        assert second.run("ana", "in_time_job", SLOT, lambda: {'last_successful': True}) == {'last_successful': True}
+        assert backend.get(f"ana:in_time_job:{SLOT.isoformat()}") | {"expires_at": 0, "updated_at": 0} == {
+            "holder": "b", "expires_at": 0, "status": "done", "updated_at": 0
+        }
+
+    def test_waits_for_a_running_replica(self, backend):
+        first = JobCoordinator(backend, "a", lease_ttl=0.3)
+        second = JobCoordinator(backend, "b", lease_ttl=0.3)
+        started = threading.Event()
+        def slow_job():
+            started.set()
+            time.sleep(0.3)
+            return {'last_successful': True}
+
+        thread = threading.Thread(target=first.run, args=("ana", "out_time_job", SLOT, slow_job))
+        thread.start()
+        started.wait()
+        result = second.run("ana", "out_time_job", SLOT, lambda: pytest.fail("ran twice"))
+        thread.join()
+
+        assert result['skip_reason'] == "handled by replica a (done)"
+
+    def test_takes_over_an_abandoned_lease(self, backend):
+        backend.acquire(f"ana:in_time_job:{SLOT.isoformat()}", "crashed", ttl=0.2)
+        coordinator = JobCoordinator(backend, "b", lease_ttl=0.2)
+
+        assert coordinator.run("ana", "in_time_job", SLOT, lambda: {'last_successful': True})['last_successful']
+        assert backend.get(f"ana:in_time_job:{SLOT.isoformat()}")["holder"] == "b"
+
+    def test_gives_up_after_max_wait(self, backend):
+        backend.acquire(f"ana:in_time_job:{SLOT.isoformat()}", "busy", ttl=30)
+        coordinator = JobCoordinator(backend, "b", lease_ttl=30, max_wait=0)
+
+        assert coordinator.run("ana", "in_time_job", SLOT, lambda: pytest.fail("ran"))['skipped']
+
+    def test_standby_takes_over_when_the_owner_never_runs(self, backend):
+        account = account_owned_by(0)
+        standby = JobCoordinator(backend, "b", lease_ttl=0.2, replica_index=1, replica_count=2)
+        runs = []
+
+        result = standby.run(account, "in_time_job", SLOT, lambda: runs.append("b") or {'last_successful': True})
+
+        assert result['skip_reason'] == "owned by another replica, takeover check in 0s"
+        assert not standby.owns(account)
+        assert wait_for(lambda: runs == ["b"])
+        assert wait_for(lambda: backend.get(f"{account}:in_time_job:{SLOT.isoformat()}")["status"] == "done")
+
+    def test_standby_does_nothing_when_the_owner_ran(self, backend):
+        account = account_owned_by(0)
+        owner = JobCoordinator(backend, "a", lease_ttl=0.2, replica_index=0, replica_count=2)
+        standby = JobCoordinator(backend, "b", lease_ttl=0.2, replica_index=1, replica_count=2)
+        runs = []
+
+        standby.run(account, "in_time_job", SLOT, lambda: runs.append("b"))
+        owner.run(account, "in_time_job", SLOT, lambda: runs.append("a") or {'last_successful': True})
+        time.sleep(0.5)
+
+        assert runs == ["a"]
+
+    def test_standby_waits_while_the_owner_is_running(self, backend):
+        account = account_owned_by(0)
+        owner = JobCoordinator(backend, "a", lease_ttl=0.2, replica_index=0, replica_count=2)
+        standby = JobCoordinator(backend, "b", lease_ttl=0.2, replica_index=1, replica_count=2)
+        runs = []
+
+        def slow_owner():
+            time.sleep(0.5)
+            runs.append("a")
+            return {'last_successful': True}
+
+        thread = threading.Thread(target=owner.run, args=(account, "in_time_job", SLOT, slow_owner))
+        thread.start()
+        time.sleep(0.05)
+        standby.run(account, "in_time_job", SLOT, lambda: runs.append("b"))
+        thread.join()
+        time.sleep(0.3)
+
+        assert runs == ["a"]
+
+    def test_from_settings(self, settings_env, tmp_path):
+        settings_env(COORDINATION_BACKEND="sqlite", REPLICA_ID="replica-1", REPLICA_COUNT="2", REPLICA_INDEX="1")
+
+        coordinator = get_job_coordinator()
+        assert isinstance(coordinator._backend, SqliteLeaseBackend)
+        assert coordinator.replica_id == "replica-1"
+        assert coordinator.owns(account_owned_by(1))
+
+        settings_env(COORDINATION_BACKEND="file")
+        assert isinstance(JobCoordinator.from_settings()._backend, FileLeaseBackend)
+
+
+def test_scheduled_slot():
+    trigger = CronTrigger.from_crontab("0 9 * * *")
+    now = datetime(2026, 3, 2, 9, 0, 30).astimezone()
+
+    assert scheduled_slot(trigger, now) == now.replace(second=0)
+    assert scheduled_slot(CronTrigger(year=2020), now) == now.replace(second=0)
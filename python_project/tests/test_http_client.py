@@ -0,0 +1,352 @@
+import asyncio
+import io
+import threading
+import time
+import httpx
+import pytest
+import requests
+from urllib3.exceptions import NewConnectionError
+from record_cassettes import EMAIL
+from sesame_automate.http_client import (
+    AsyncHttpPool,
+    AsyncSessionRefresher,
+    CircuitBreaker,
+    CircuitOpenError,
+    HttpPolicy,
+    SessionRefresher,
+    TokenBucket,
+    get_http_policy,
+    is_transient_error
+)
+from sesame_automate.models.enums.state import State
+from sesame_automate.runnables import SesameTimeCheckStatusRunnable, SesameTimeLoginRunnable, SesameTimeMeInfoRunnable
+from sesame_automate.simulation import MockSesameServer
+
+URL = "http://sesame.test/api/v3/security/me"
+
+
+def response(status, headers=None):
+    result = requests.Response()
+    result.status_code = status
+    result.headers.update(headers or {})
+    result._content = b"{}"
+    result.raw = io.BytesIO()
+    return result
+
+
+class ScriptedSession:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class AsyncScriptedSession(ScriptedSession):
+    async def request(self, method, url, **kwargs):
+        return super().request(method, url, **kwargs)
+
+
+def async_response(status, headers=None):
+    return httpx.Response(status, headers=headers, request=httpx.Request("GET", URL))
+
+
+@pytest.fixture
+def policy():
+    return HttpPolicy(max_retries=2, backoff_base=0.0, backoff_max=0.01, failure_threshold=3, reset_timeout=60)
+
+
+class TestTransientErrors:
+    def test_classification(self):
+        assert is_transient_error(CircuitOpenError("open"))
+        assert is_transient_error(requests.HTTPError(response=response(503)))
+        assert not is_transient_error(requests.HTTPError(response=response(400)))
+        assert not is_transient_error(requests.HTTPError())
+        assert is_transient_error(requests.ConnectionError())
+        assert is_transient_error(requests.Timeout())
+        assert is_transient_error(httpx.HTTPStatusError("boom", request=httpx.Request("GET", URL), response=async_response(502)))
+        assert is_transient_error(httpx.ConnectError("refused"))
+        assert not is_transient_error(ValueError())
+
+
+class TestCircuitBreaker:
+    def test_opens_and_lets_one_trial_through(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        assert breaker.allow() is True
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow() is False
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow() is True
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_stays_open_until_reset_timeout(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        assert breaker.allow() is False
+
+    def test_unexpected_error_releases_the_trial(self):
+        policy = HttpPolicy(failure_threshold=1, reset_timeout=0, max_retries=0)
+        policy.breaker(URL).record_failure()
+
+        with pytest.raises(ValueError):
+            policy.request(ScriptedSession(ValueError("bad cassette")), "GET", URL)
+        assert policy.breaker(URL).state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(ValueError):
+            asyncio.run(policy.arequest(AsyncScriptedSession(ValueError("bad cassette")), "GET", URL))
+        assert policy.request(ScriptedSession(response(200)), "GET", URL).status_code == 200
+        assert policy.breaker(URL).state == CircuitBreaker.CLOSED
+
+
+class TestRequest:
+    def test_retries_idempotent_requests(self, policy):
+        session = ScriptedSession(response(503), requests.ConnectionError("reset"), response(200))
+
+        assert policy.request(session, "GET", URL).status_code == 200
+        assert len(session.calls) == 3
+        assert session.calls[0][2]["timeout"] == (5.0, 15.0)
+
+    def test_returns_last_response_when_retries_run_out(self, policy):
+        session = ScriptedSession(response(500), response(500), response(502))
+
+        assert policy.request(session, "GET", URL).status_code == 502
+        assert policy.breaker(URL).state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            policy.request(session, "GET", URL)
+
+    def test_post_is_only_retried_when_unprocessed(self, policy):
+        assert policy.request(ScriptedSession(response(500)), "POST", URL).status_code == 500
+
+        session = ScriptedSession(response(429, {"Retry-After": "0"}), response(200))
+        assert policy.request(session, "POST", URL).status_code == 200
+
+    def test_post_connection_errors(self, policy):
+        with pytest.raises(requests.ReadTimeout):
+            policy.request(ScriptedSession(requests.ReadTimeout()), "POST", URL)
+
+        policy = HttpPolicy(max_retries=2, backoff_base=0.0)
+        refused = requests.ConnectionError(type("Pool", (), {"reason": NewConnectionError(None, "refused")})())
+        session = ScriptedSession(refused, requests.exceptions.ConnectTimeout(), response(201))
+        assert policy.request(session, "POST", URL).status_code == 201
+
+    def test_gives_up_after_max_retries(self, policy):
+        with pytest.raises(requests.ConnectionError):
+            policy.request(ScriptedSession(*[requests.ConnectionError()] * 3), "GET", URL)
+
+    def test_backoff(self, policy):
+        assert policy._backoff(0, "5") == 0.01
+        assert 0 <= policy._backoff(3, "soon") <= 0.01
+
+    def test_rate_limit_and_concurrency(self):
+        policy = HttpPolicy(rate_limit=1000, rate_burst=5, max_concurrency=2)
+
+        assert policy.request(ScriptedSession(response(200)), "GET", URL).status_code == 200
+        assert policy.bucket(URL) is policy.bucket(URL + "?x=1")
+        assert policy.semaphore(URL) is policy.semaphore("http://sesame.test/other")
+        assert HttpPolicy().bucket(URL) is None
+        assert HttpPolicy().semaphore(URL) is None
+
+    def test_from_settings(self, settings_env):
+        settings_env(HTTP_MAX_RETRIES="5", HTTP_RATE_LIMIT="3", HTTP_MAX_CONCURRENCY="4")
+
+        policy = get_http_policy()
+        assert policy.max_retries == 5
+        assert policy.bucket(URL).rate == 3
+        assert policy is get_http_policy()
+
+
+class TestAsyncRequest:
+    def test_retries(self, policy):
+        session = AsyncScriptedSession(httpx.ConnectError("refused"), async_response(503), async_response(200))
+
+        assert asyncio.run(policy.arequest(session, "GET", URL)).status_code == 200
+        assert len(session.calls) == 3
+
+    def test_post_read_errors_are_not_retried(self, policy):
+        with pytest.raises(httpx.ReadTimeout):
+            asyncio.run(policy.arequest(AsyncScriptedSession(httpx.ReadTimeout("slow")), "POST", URL))
+
+    def test_concurrency_limit_is_per_loop(self):
+        policy = HttpPolicy(max_concurrency=1, rate_limit=1000, rate_burst=10)
+        active = []
+        peak = []
+
+        class SlowSession:
+            async def request(self, method, url, **kwargs):
+                active.append(1)
+                peak.append(len(active))
+                await asyncio.sleep(0.01)
+                active.pop()
+                return async_response(200)
+
+        async def run():
+            semaphore = policy.asemaphore(URL)
+            await asyncio.gather(*(policy.arequest(SlowSession(), "GET", URL) for _ in range(4)))
+            return semaphore
+
+        first = asyncio.run(run())
+        second = asyncio.run(run())
+        assert max(peak) == 1
+        assert first is not second
+
+    def test_no_concurrency_limit(self):
+        async def semaphore():
+            return HttpPolicy().asemaphore(URL)
+
+        assert asyncio.run(semaphore()) is None
+
+
+class TestTokenBucket:
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+    def test_spaces_out_requests(self):
+        bucket = TokenBucket(rate=100, burst=1)
+        started = time.monotonic()
+        bucket.acquire()
+        bucket.acquire()
+        asyncio.run(bucket.aacquire())
+        assert time.monotonic() - started >= 0.015
+        assert bucket.reserve() > 0
+
+
+class TestSessionRefresher:
+    def test_concurrent_refreshes_log_in_once(self):
+        logins = []
+        refresher = SessionRefresher(lambda: (time.sleep(0.01), logins.append(1)))
+        seen = refresher.generation
+        threads = [threading.Thread(target=refresher.refresh, args=(seen,)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(logins) == 1
+        assert refresher.generation == 1
+
+    def test_async_concurrent_refreshes_log_in_once(self):
+        logins = []
+
+        async def login():
+            await asyncio.sleep(0.01)
+            logins.append(1)
+
+        refresher = AsyncSessionRefresher(login)
+
+        async def run():
+            await asyncio.gather(*(refresher.refresh(0) for _ in range(5)))
+
+        asyncio.run(run())
+        asyncio.run(refresher.refresh(refresher.generation))
+        assert len(logins) == 2
+
+
+class TestReauthentication:
+    @pytest.fixture
+    def live(self, settings_env):
+        with MockSesameServer() as server:
+            settings_env(HTTP_CASSETTE="off", BASE_URL=server.base_url)
+            yield server
+
+    def test_expired_session_logs_in_again(self, live):
+        chain = SesameTimeLoginRunnable() | SesameTimeMeInfoRunnable() | SesameTimeCheckStatusRunnable()
+        assert chain.invoke()['server_state'] == State.OFFLINE
+
+        live.expire_sessions()
+        result = chain.invoke()
+
+        assert result['server_state'] == State.OFFLINE
+        assert 'status_error' not in result
+        assert live.request_counts["POST login"] == 2
+
+    def test_expired_async_session_logs_in_again(self, live):
+        login = SesameTimeLoginRunnable()
+        chain = login | SesameTimeMeInfoRunnable() | SesameTimeCheckStatusRunnable()
+
+        async def run():
+            first = await chain.ainvoke()
+            live.expire_sessions()
+            return first, await chain.ainvoke()
+
+        first, second = asyncio.run(run())
+        assert first['server_state'] == second['server_state'] == State.OFFLINE
+        assert 'status_error' not in second
+        assert live.request_counts["POST login"] == 2
+
+    def test_login_does_not_wait_for_the_rejected_request_slot(self, live, settings_env):
+        settings_env(HTTP_MAX_CONCURRENCY="1")
+        chain = SesameTimeLoginRunnable() | SesameTimeMeInfoRunnable() | SesameTimeCheckStatusRunnable()
+        chain.invoke()
+        live.expire_sessions()
+        results = []
+
+        worker = threading.Thread(target=lambda: results.append(chain.invoke()), daemon=True)
+        worker.start()
+        worker.join(10)
+
+        assert not worker.is_alive()
+        assert results[0]['server_state'] == State.OFFLINE
+        assert live.request_counts["POST login"] == 2
+
+        async def run():
+            live.expire_sessions()
+            return await asyncio.wait_for(chain.ainvoke(), 10)
+
+        assert 'status_error' not in asyncio.run(run())
+        assert live.request_counts["POST login"] == 3
+
+    def test_reuses_a_session_stored_by_another_login(self, live):
+        first = SesameTimeLoginRunnable()
+        second = SesameTimeLoginRunnable()
+        status = SesameTimeMeInfoRunnable() | SesameTimeCheckStatusRunnable()
+        status.invoke(first.execute())
+        stale = second.execute()
+
+        live.expire_sessions()
+        status.invoke(first.execute())
+        first.session.get(live.base_url + "/api/v3/security/me")
+        result = status.invoke(dict(stale))
+
+        assert result['server_state'] == State.OFFLINE
+        assert live.request_counts["POST login"] == 2
+
+    def test_missing_credentials(self, live, settings_env):
+        settings_env(SESAME_EMAIL="", SESAME_PASSWORD="")
+
+        result = SesameTimeLoginRunnable().execute()
+
+        assert result['login_successful'] is False
+        assert "SESAME_EMAIL" in result['error']
+
+
+class TestAsyncHttpPool:
+    def test_transport_per_event_loop(self):
+        pool = AsyncHttpPool(max_connections=2, max_keepalive_connections=1)
+
+        async def transport():
+            client = pool.client()
+            assert client._transport is pool.client()._transport
+            used = client._transport
+            await pool.aclose()
+            await pool.aclose()
+            return used
+
+        assert asyncio.run(transport()) is not asyncio.run(transport())
+
+    def test_login_client_replays_the_cassette(self):
+        async def run():
+            return await SesameTimeLoginRunnable().aexecute()
+
+        assert EMAIL in asyncio.run(run())['account']
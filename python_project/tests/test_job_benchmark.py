@@ -0,0 +1,73 @@
+import json
+import os
+import pytest
+from sesame_automate.benchmarks import job_benchmark
+from sesame_automate.benchmarks.job_benchmark import isolated_environment, measure_startup, percentile, run_benchmark, summarize
+
+
+@pytest.fixture
+def workdir(tmp_path):
+    before = set(os.listdir(tmp_path))
+    yield tmp_path
+    assert set(os.listdir(tmp_path)) == before
+
+
+class TestStatistics:
+    def test_percentile(self):
+        values = [0.5, 0.1, 0.4, 0.2, 0.3]
+
+        assert percentile(values, 50) == 0.3
+        assert percentile(values, 95) == 0.5
+        assert percentile(values, 0) == 0.1
+        assert percentile([], 50) == 0.0
+
+    def test_summarize(self):
+        assert summarize([0.001, 0.003]) == {"count": 2, "p50_ms": 3.0, "p95_ms": 3.0, "max_ms": 3.0}
+        assert summarize([0.001, 0.002, 0.003])["p50_ms"] == 2.0
+        assert summarize([])["max_ms"] == 0.0
+
+
+class TestIsolatedEnvironment:
+    def test_every_store_lives_in_the_workdir(self):
+        environ = isolated_environment("/tmp/bench")
+
+        paths = [value for key, value in environ.items() if key.endswith("_PATH") or key == "LOG_DIR"]
+        assert len(paths) == 8
+        assert all(path.startswith("/tmp/bench/") for path in paths)
+        assert environ["SETTINGS_FILE"] == environ["METRICS_FILE"] == environ["TRACE_FILE"] == ""
+        assert environ["SETTINGS_HOT_RELOAD"] == "false"
+
+
+class TestRunBenchmark:
+    def test_reports_every_job_without_touching_the_working_directory(self, workdir):
+        report = run_benchmark(accounts=2, iterations=2, job_types=("in_time_job", "out_time_job"))
+
+        assert report["config"]["accounts"] == 2
+        for job in report["jobs"].values():
+            assert job["failures"] == 0
+            assert job["latency"]["count"] == 4
+            assert job["requests_per_run"] > 0
+        assert report["jobs"]["in_time_job"]["steps"]["check_in"]["count"] == 4
+
+    def test_cold_runs_log_in_every_time(self, workdir):
+        warm = run_benchmark(iterations=2, job_types=("in_time_job",))["jobs"]["in_time_job"]
+        cold = run_benchmark(iterations=2, cold=True, job_types=("in_time_job",))["jobs"]["in_time_job"]
+
+        assert cold["requests"].get("POST login", 0) > warm["requests"].get("POST login", 0)
+
+    def test_main_prints_and_writes_the_report(self, workdir, tmp_path_factory, capsys):
+        path = tmp_path_factory.mktemp("report") / "report.json"
+
+        job_benchmark.main(["--iterations", "1", "--jobs", "in_time_job", "--json", str(path)])
+
+        assert "in_time_job" in capsys.readouterr().out
+        assert json.loads(path.read_text())["jobs"]["in_time_job"]["failures"] == 0
+
+
+class TestMeasureStartup:
+    def test_measures_both_start_modes(self, workdir):
+        results = measure_startup(runs=1)
+
+        assert set(results) == {"blocking_start", "fast_start"}
+        for startup in results.values():
+            assert 0 < startup["import_ms"] <= startup["ready_ms"]
@@ -0,0 +1,251 @@
+import logging
+import os
+import time
+import urllib.request
+import pytest
+from apscheduler.schedulers.background import BackgroundScheduler
+from record_cassettes import EMAIL, PASSWORD
+from sesame_automate import main
+from sesame_automate.config import reload_settings
+from sesame_automate.config import settings as settings_module
+from sesame_automate.fleet import Fleet
+from sesame_automate.jobs import AccountJobs
+from sesame_automate.models.account import Account
+from sesame_automate.models.enums.state import State
+from sesame_automate.models.runnable_sequence import _global_hooks
+from sesame_automate.metrics import TraceFileHook
+from sesame_automate.scheduling import SpreadTrigger
+from sesame_automate.stores.clock_outbox import get_clock_outbox
+
+EMPLOYEE_ID = "4badeee4-791f-51e2-a027-2c59bc6f8144"
+SCHEDULES = {
+    "IN_TIME_CRON": "0 9 * * mon-fri",
+    "OUT_TIME_CRON": "0 18 * * mon-fri",
+    "BREAK_START_CRON": "0 14 * * mon-fri",
+    "BREAK_END_CRON": "0 15 * * mon-fri"
+}
+
+
+@pytest.fixture
+def schedules(settings_env):
+    return settings_env(**SCHEDULES)
+
+
+@pytest.fixture
+def account_runtime(monkeypatch):
+    runtime = AccountJobs(Account("ana", EMAIL, PASSWORD))
+    monkeypatch.setattr(main, "_runtime", runtime)
+    return runtime
+
+
+@pytest.fixture
+def fleet_runtime(monkeypatch):
+    runtime = Fleet([Account("ana", EMAIL, PASSWORD), Account("ben", "ben@example.com", PASSWORD)], max_workers=2)
+    monkeypatch.setattr(main, "_runtime", runtime)
+    yield runtime
+    runtime.shutdown()
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = BackgroundScheduler()
+    yield scheduler
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+
+
+class TestJobSpecs:
+    def test_one_job_per_schedule(self, schedules, account_runtime):
+        specs = main.job_specs(schedules)
+
+        assert sorted(specs) == ["break_finished_job:0", "break_start_job:0", "in_time_job:0", "out_time_job:0"]
+        assert specs["in_time_job:0"]["kwargs"] == {"cron": "0 9 * * mon-fri"}
+
+    def test_optional_jobs(self, settings_env, account_runtime, tmp_path):
+        settings = settings_env(**{
+            **SCHEDULES, "IN_TIME_CRON": "0 9 * * mon-fri, 30 8 * * sat", "CALENDAR_SOURCE": "api",
+            "METRICS_FILE": str(tmp_path / "metrics.prom")
+        })
+
+        specs = main.job_specs(settings)
+
+        assert {"in_time_job:1", "calendar_job:0", "export_metrics_job"} <= set(specs)
+        main.export_metrics_job()
+        assert (tmp_path / "metrics.prom").read_text().endswith("# EOF\n")
+
+    def test_fleet_jobs_are_spread_per_account(self, settings_env, fleet_runtime):
+        settings = settings_env(**SCHEDULES, SCHEDULE_SPREAD_MODE="deterministic", SCHEDULE_SPREAD_WINDOW="600")
+
+        specs = main.job_specs(settings)
+
+        assert {"in_time_job:0:ana", "in_time_job:0:ben"} <= set(specs)
+        assert isinstance(specs["in_time_job:0:ana"]["trigger"], SpreadTrigger)
+        assert specs["in_time_job:0:ben"]["args"] == ["ben", "in_time_job"]
+
+    def test_schedule_jobs_applies_changes(self, settings_env, account_runtime, scheduler):
+        main.schedule_jobs(scheduler, settings_env(**SCHEDULES))
+        scheduler.add_job(main.in_time_job, "date", id="in_time_job:0:catch-up")
+        scheduler.start(paused=True)
+
+        main.schedule_jobs(scheduler, settings_env(OUT_TIME_CRON="30 18 * * mon-fri", CALENDAR_SOURCE="api"))
+        assert scheduler.get_job("out_time_job:0").kwargs == {"cron": "30 18 * * mon-fri"}
+        assert scheduler.get_job("calendar_job:0") is not None
+
+        main.schedule_jobs(scheduler, settings_env(CALENDAR_SOURCE="none"))
+        assert scheduler.get_job("calendar_job:0") is None
+        assert scheduler.get_job("in_time_job:0:catch-up") is not None
+
+
+class TestScheduledJobs:
+    def test_runs_the_account_job_for_its_slot(self, schedules, account_runtime):
+        main.run_welcome_job()
+
+        result = main.in_time_job("0 9 * * mon-fri")
+
+        assert result['last_successful'] is True
+        assert result['server_state'] == State.WORKING
+        assert main.break_start_job()['server_state'] == State.BREAK
+        assert main.break_finished_job()['server_state'] == State.WORKING
+        assert main.out_time_job()['server_state'] == State.OFFLINE
+        assert main.calendar_job() is None
+
+    def test_fleet_jobs(self, schedules, fleet_runtime):
+        results = main.run_scheduled_job("calendar_job", "0 9 * * mon-fri")
+        assert results == {"ana": None, "ben": None}
+
+        assert main.run_account_job("ana", "calendar_job").result() is None
+
+    def test_welcome_errors_are_logged(self, monkeypatch, caplog):
+        monkeypatch.setattr(main, "_runtime", None)
+
+        main.run_welcome_job()
+
+        assert "Error during welcome" in caplog.text
+
+
+class TestRuntime:
+    def test_single_account(self):
+        runtime = main.build_runtime()
+
+        assert isinstance(runtime, AccountJobs)
+        assert runtime.account.email == EMAIL
+
+    def test_fleet(self, settings_env, tmp_path):
+        path = tmp_path / "accounts.toml"
+        path.write_text('[[accounts]]\nname = "ana"\nemail = "ana@example.com"\npassword = "x"\n')
+        settings_env(SESAME_ACCOUNTS_FILE=str(path))
+
+        runtime = main.build_runtime()
+
+        assert list(runtime.accounts) == ["ana"]
+        runtime.shutdown()
+
+    def test_instrumentation_hooks(self, settings_env, tmp_path):
+        settings_env(TRACE_FILE=str(tmp_path / "trace.jsonl"))
+
+        main.setup_instrumentation()
+
+        assert len(_global_hooks) == 4
+        assert isinstance(_global_hooks[-1], TraceFileHook)
+
+    def test_create_scheduler(self, settings_env):
+        settings = settings_env(TIME_ZONE="Europe/Madrid", SCHEDULER_MAX_INSTANCES="2")
+
+        scheduler = main.create_scheduler(settings)
+
+        assert str(scheduler.timezone) == "Europe/Madrid"
+        assert scheduler._job_defaults["max_instances"] == 2
+
+    def test_load_settings_requires_every_schedule(self, schedules, monkeypatch, caplog):
+        assert main.load_settings() is schedules
+
+        monkeypatch.delenv("OUT_TIME_CRON")
+        reload_settings()
+        with pytest.raises(SystemExit):
+            main.load_settings()
+        assert "OUT_TIME_CRON not set" in caplog.text
+
+    def test_load_settings_rejects_invalid_settings(self, monkeypatch, caplog):
+        monkeypatch.setenv("LOG_LEVEL", "loud")
+        monkeypatch.setattr(settings_module, "_settings", None)
+
+        with pytest.raises(SystemExit):
+            main.load_settings()
+        assert "LOG_LEVEL='loud' is not valid" in caplog.text
+
+    def test_load_environment(self):
+        assert main.load_environment() is True
+
+
+class TestServices:
+    def test_outbox_drainer_delivers_queued_events(self, settings_env, account_runtime):
+        outbox = get_clock_outbox()
+        outbox.enqueue(EMAIL, "check_in", State.WORKING, f"http://127.0.0.1:9/api/v3/employees/{EMPLOYEE_ID}/check-in", {})
+
+        drainer = main.start_outbox_drainer(settings_env(OUTBOX_RATE_LIMIT="100"))
+        try:
+            deadline = time.monotonic() + 5
+            while outbox.counts() == {"pending": 1} and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            drainer.stop()
+
+        assert outbox.counts() == {"sent": 1}
+
+    def test_status_server(self, settings_env, account_runtime, scheduler):
+        server = main.start_status_server(scheduler, settings_env(STATUS_PORT="0"))
+        try:
+            with urllib.request.urlopen(server.base_url + "/healthz") as response:
+                assert response.status == 200
+            assert server.accounts == ["ana"]
+        finally:
+            server.stop()
+
+    def test_settings_watcher(self, settings_env, account_runtime, scheduler, tmp_path):
+        path = tmp_path / "settings.toml"
+        path.write_text("")
+        watcher = main.watch_settings(scheduler, settings_env(**SCHEDULES, SETTINGS_FILE=str(path)))
+        watcher.stop()
+
+        path.write_text('calendar_source = "api"\n')
+        os.utime(path, (time.time(), time.time() + 10))
+        assert watcher.check() is True
+        assert scheduler.get_job("calendar_job:0") is not None
+
+
+class TestPrepareScheduler:
+    def test_schedules_jobs_and_catches_up(self, settings_env, caplog):
+        caplog.set_level(logging.INFO)
+        settings_env(**{**SCHEDULES, "IN_TIME_CRON": "* * * * *", "CLOCK_OUTBOX": "off"})
+
+        scheduler = main.prepare_scheduler()
+
+        assert isinstance(main._runtime, AccountJobs)
+        assert scheduler.get_job("in_time_job:0:catch-up") is not None
+        assert "Welcome, Sesame Time Automate is starting" in caplog.text
+
+    def test_starts_optional_services(self, settings_env, monkeypatch):
+        settings_env(**SCHEDULES, STATUS_PORT="0", SETTINGS_HOT_RELOAD="true")
+        started = []
+        monkeypatch.setattr(main, "start_outbox_drainer", lambda settings: started.append("outbox"))
+        monkeypatch.setattr(main, "start_status_server", lambda scheduler, settings: started.append("status"))
+        monkeypatch.setattr(main, "watch_settings", lambda scheduler, settings: started.append("watcher"))
+
+        main.prepare_scheduler()
+
+        assert started == ["outbox", "status", "watcher"]
+
+    def test_main_starts_the_scheduler(self, monkeypatch, caplog):
+        class Scheduler:
+            def start(self):
+                started.append(True)
+
+        started = []
+        caplog.set_level(logging.INFO)
+        monkeypatch.setattr(main, "setup_logging", lambda: None)
+        monkeypatch.setattr(main, "prepare_scheduler", Scheduler)
+
+        main.main()
+
+        assert started == [True]
+        assert "Environment variables loaded from .env file" in caplog.text
@@ -0,0 +1,259 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import queue
+import sys
+import httpx
+import pytest
+import requests
+from sesame_automate.config import Settings
+from sesame_automate.logging_pipeline import (
+    ContextFilter,
+    JsonLinesFormatter,
+    LogContextHook,
+    LoggingPipeline,
+    current_context,
+    gzip_namer,
+    gzip_rotator,
+    log_context,
+    setup_logging,
+    shutdown_logging
+)
+from sesame_automate.logging_pipeline.logging_pipeline import DroppingQueueHandler
+from sesame_automate.metrics import MetricsCollector, TraceFileHook, get_metrics_collector
+from sesame_automate.models.runnable_sequence import Runnable, RunnableSequence
+from sesame_automate.simulation import MockSesameServer
+
+
+class Step(Runnable):
+    def __init__(self, result=None, error=None, name=None):
+        self.result = result
+        self.error = error
+        self.name = name
+
+    def execute(self, data=None):
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def record(message="hello", **extra):
+    record = logging.LogRecord("sesame", logging.INFO, __file__, 1, message, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    shutdown_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+class TestMetricsCollector:
+    def test_observes_steps(self):
+        collector = MetricsCollector(buckets=(0.1, 1.0))
+        chain = RunnableSequence(Step({'last_successful': True}, name="me"), Step({'login_successful': False}, name="login"),
+                                 hooks=[collector], short_circuit=False)
+        chain.invoke()
+        with pytest.raises(RuntimeError):
+            RunnableSequence(Step(error=RuntimeError("boom"), name="clock"), hooks=[collector]).invoke()
+
+        snapshot = collector.snapshot()
+        assert snapshot['steps']['me'] == {'count': 1, 'sum': snapshot['steps']['me']['sum'], 'failures': 0}
+        assert snapshot['steps']['login']['failures'] == 1
+        assert snapshot['steps']['clock']['failures'] == 1
+
+        metrics = collector.to_openmetrics()
+        assert 'sesame_step_duration_seconds_bucket{step="me",le="0.1"} 1' in metrics
+        assert 'sesame_step_failures_total{step="clock"} 1' in metrics
+        assert metrics.endswith("# EOF\n")
+
+    def test_counts_http_traffic(self):
+        collector = MetricsCollector()
+        with MockSesameServer() as server:
+            session = requests.Session()
+            chain = RunnableSequence(Step({'session': session}), hooks=[collector])
+            chain.invoke()
+            session.post(server.base_url + "/api/v3/security/login", json={"email": "ana@example.com", "password": "x"})
+            session.get(server.base_url + "/api/v3/security/me")
+            collector.instrument_session(session)
+            collector.instrument_session(object())
+
+            async def fetch():
+                async with httpx.AsyncClient() as client:
+                    collector.before_step(None, {'async_session': client}, {})
+                    await client.get(server.base_url + "/api/v3/security/me")
+
+            asyncio.run(fetch())
+
+        snapshot = collector.snapshot()
+        assert snapshot['http_requests'] == {"POST 200": 1, "GET 401": 2}
+        assert snapshot['http_request_bytes'] > 0
+        assert snapshot['http_response_bytes'] > 0
+        assert 'sesame_http_requests_total{method="GET",status="401"} 2' in collector.to_openmetrics()
+
+    def test_writes_openmetrics_atomically(self, tmp_path):
+        path = tmp_path / "metrics" / "sesame.prom"
+        collector = get_metrics_collector()
+        collector.write_openmetrics(str(path))
+
+        assert path.read_text() == collector.to_openmetrics()
+        assert os.listdir(path.parent) == ["sesame.prom"]
+
+
+class TestTraceFileHook:
+    def test_writes_a_span_per_step(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        hook = TraceFileHook(str(path))
+        chain = RunnableSequence(
+            Step({'last_successful': False, 'error': 'denied'}, name="login"),
+            Step({}, name="me"),
+            hooks=[hook]
+        )
+        chain.invoke({'trace_id': "trace-1"})
+        with pytest.raises(RuntimeError):
+            RunnableSequence(Step(error=RuntimeError("boom"), name="clock"), hooks=[hook]).invoke({'trace_id': "trace-2"})
+
+        spans = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [(span['trace_id'], span['step'], span['ok']) for span in spans] == [
+            ("trace-1", "login", False), ("trace-1", "me", True), ("trace-2", "clock", False)
+        ]
+        assert spans[0]['error'] == "denied"
+        assert spans[1]['skipped'] == "short-circuited after login failed"
+        assert spans[2]['error'] == "boom"
+
+
+class TestLogContext:
+    def test_nested_contexts(self):
+        with log_context(account="ana", job=None):
+            with log_context(job="in_time_job"):
+                assert current_context() == {"account": "ana", "job": "in_time_job"}
+            assert current_context() == {"account": "ana"}
+        assert current_context() == {}
+
+    def test_filter_adds_context_fields(self):
+        entry = record(step="explicit")
+        with log_context(account="ana", step="ignored"):
+            assert ContextFilter().filter(entry)
+
+        assert (entry.account, entry.job, entry.step) == ("ana", None, "explicit")
+
+    def test_hook_binds_the_current_step(self):
+        seen = []
+
+        class Capture(Runnable):
+            def execute(self, data=None):
+                seen.append(dict(current_context()))
+                return {}
+
+        hook = LogContextHook()
+        RunnableSequence(Capture(), hooks=[hook]).invoke({'trace_id': "trace-1"})
+        with pytest.raises(RuntimeError):
+            RunnableSequence(Step(error=RuntimeError("boom")), hooks=[hook]).invoke()
+        hook.after_step(None, {}, {}, 0.0, {'step': "orphan"})
+
+        assert seen == [{"step": "Capture", "trace_id": "trace-1"}]
+        assert current_context() == {}
+
+
+class TestJsonLinesFormatter:
+    def test_formats_context_and_exceptions(self):
+        entry = record("clocked in", account="ana", duration=0.5, trace_id=None)
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            entry.exc_info = sys.exc_info()
+
+        line = json.loads(JsonLinesFormatter().format(entry))
+
+        assert line['message'] == "clocked in"
+        assert line['account'] == "ana"
+        assert line['duration'] == 0.5
+        assert "trace_id" not in line
+        assert "ZeroDivisionError" in line['exception']
+
+
+class TestLoggingPipeline:
+    def test_writes_json_lines_through_the_queue(self, tmp_path, root_logger):
+        settings = Settings.from_mapping({"LOG_DIR": str(tmp_path / "logs"), "LOG_FORMAT": "json", "LOG_LEVEL": "debug"})
+        pipeline = setup_logging(settings)
+
+        with log_context(account="ana"):
+            logging.getLogger("sesame").info("hello %s", "world")
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logging.getLogger("sesame").exception("failed")
+        shutdown_logging()
+        pipeline.stop()
+
+        lines = [json.loads(line) for line in (tmp_path / "logs" / "sesame_automate.jsonl").read_text().splitlines()]
+        assert lines[0]['message'] == "hello world"
+        assert lines[0]['account'] == "ana"
+        assert "ZeroDivisionError" in lines[1]['exception']
+
+    def test_rotates_and_compresses_text_logs(self, tmp_path, root_logger):
+        settings = Settings.from_mapping({"LOG_DIR": str(tmp_path), "LOG_MAX_BYTES": "1024", "LOG_BACKUP_COUNT": "2"})
+        setup_logging(settings)
+        setup_logging(settings)
+
+        for index in range(40):
+            logging.getLogger("sesame").info(f"line {index:03d} " + "x" * 40)
+        shutdown_logging()
+
+        assert (tmp_path / "sesame_automate.log").exists()
+        with gzip.open(tmp_path / "sesame_automate.log.1.gz", "rt") as f:
+            assert "line" in f.read()
+
+    def test_timed_rotation_without_files(self, tmp_path, root_logger):
+        settings = Settings.from_mapping({"LOG_DIR": str(tmp_path), "LOG_ROTATION": "time", "LOG_COMPRESS": "false"})
+        handlers = LoggingPipeline(settings)._handlers()
+
+        assert isinstance(handlers[1], logging.handlers.TimedRotatingFileHandler)
+        assert handlers[1].namer is None
+        for handler in handlers:
+            handler.close()
+        assert len(LoggingPipeline(Settings(log_dir=""))._handlers()) == 1
+
+    def test_falls_back_to_defaults_on_invalid_settings(self, monkeypatch, root_logger):
+        monkeypatch.setenv("LOG_LEVEL", "loud")
+
+        pipeline = setup_logging()
+
+        assert root_logger.level == logging.INFO
+        assert pipeline.queue_handler in root_logger.handlers
+        shutdown_logging()
+        shutdown_logging()
+
+    def test_counts_dropped_records(self, root_logger, caplog):
+        handler = DroppingQueueHandler(queue.Queue(1))
+        handler.emit(record())
+        handler.emit(record())
+        pipeline = LoggingPipeline(Settings(log_dir=""))
+        pipeline.queue_handler.dropped = 3
+        pipeline.start()
+        root_logger.addHandler(caplog.handler)
+        pipeline.stop()
+        pipeline.stop()
+
+        assert handler.dropped == 1
+        assert "3 log records were dropped" in caplog.text
+
+    def test_gzip_helpers(self, tmp_path):
+        source = tmp_path / "app.log"
+        source.write_text("hello\n")
+
+        gzip_rotator(str(source), gzip_namer(str(source) + ".1"))
+
+        assert not source.exists()
+        with gzip.open(tmp_path / "app.log.1.gz", "rt") as f:
+            assert f.read() == "hello\n"
@@ -0,0 +1,302 @@
+import asyncio
+import time
+from datetime import date
+import pytest
+from sesame_automate.models.account import Account
+from sesame_automate.models.day_plan import DayPlan
+from sesame_automate.models.enums.state import State
+from sesame_automate.models.runnable_branch import RunnableBranch
+from sesame_automate.models.runnable_graph import RunnableGraph
+from sesame_automate.models.runnable_parallel import RunnableParallel
+from sesame_automate.models.runnable_sequence import Runnable, RunnableHook, RunnableSequence, register_hook, unregister_hook
+
+CHECK_TYPES = [
+    {"id": "check-type-office", "workType": "office", "status": "active"},
+    {"id": "check-type-remote", "workType": "remote", "status": "active"}
+]
+
+
+class Step(Runnable):
+    def __init__(self, result=None, error=None, name=None, delay=0.0):
+        self.result = result
+        self.error = error
+        self.name = name
+        self.delay = delay
+        self.calls = []
+
+    def execute(self, data=None):
+        self.calls.append(dict(data or {}))
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class Recorder(RunnableHook):
+    def __init__(self):
+        self.events = []
+
+    def before_step(self, step, data, context):
+        self.events.append(("before", context['step']))
+
+    def after_step(self, step, data, step_result, duration, context):
+        self.events.append(("after", context['step']))
+
+    def on_error(self, step, data, error, duration, context):
+        self.events.append(("error", context['step']))
+
+    def on_skip(self, step, data, reason, context):
+        self.events.append(("skip", context['step']))
+
+
+class TestRunnableSequence:
+    def test_merges_results_and_traces_steps(self):
+        chain = Step({'a': 1}, name="first") | Step("plain") | Step({'b': 2}, name="third")
+
+        result = chain.invoke({'trace_id': "trace-1"})
+
+        assert (result['a'], result['b'], result['Step_result']) == (1, 2, "plain")
+        assert result['executed_steps'] == ["first", "Step", "third"]
+        assert result['trace_id'] == "trace-1"
+        assert chain.invoke("seed")['initial_data'] == "seed"
+
+    def test_short_circuits_after_a_failure(self):
+        last = Step({'c': 3}, name="last")
+        chain = Step({'login_successful': False, 'error': 'denied'}, name="login") | last
+
+        result = chain.invoke()
+        assert result['last_successful'] is False
+        assert result['error_chain'][0]['error'] == "denied"
+        assert result['skipped_steps'] == [{'step': "last", 'reason': "short-circuited after login failed"}]
+        assert last.calls == []
+
+        assert chain.without_short_circuit().invoke()['c'] == 3
+
+    def test_skip_if(self):
+        skipped = Step({'ran': True}, name="clock").skip_if(lambda data: data.get('offline'), "offline")
+        dynamic = Step({'ran': True}, name="dynamic").skip_if(lambda data: data.get('reason'))
+        default = Step({}, name="default").skip_if(lambda data: True)
+
+        result = (Step({'offline': True, 'reason': "custom"}) | skipped | dynamic | default).invoke()
+
+        assert [(entry['step'], entry['reason']) for entry in result['skipped_steps']] == [
+            ("clock", "offline"), ("dynamic", "custom"), ("default", "skip condition of default met")
+        ]
+        assert skipped.execute({'offline': True}) == {'skipped_steps': [{'step': "clock", 'reason': "offline"}]}
+        assert skipped.execute()['ran'] is True
+        assert asyncio.run(skipped.aexecute({'offline': True}))['skipped_steps'][0]['reason'] == "offline"
+        assert asyncio.run(skipped.aexecute())['ran'] is True
+        with pytest.raises(TypeError):
+            Runnable.skip_if("not a runnable", lambda data: True)
+
+    def test_nested_skipped_steps_are_reported_once(self):
+        inner = Step({}, name="inner").skip_if(lambda data: True, "nested")
+        chain = Step({}) | RunnableSequence(inner)
+
+        assert chain.invoke()['skipped_steps'] == [{'step': "inner", 'reason': "nested"}]
+
+    def test_hooks(self):
+        recorder = Recorder()
+        broken = Recorder()
+        broken.before_step = lambda *args: 1 / 0
+        register_hook(recorder)
+        register_hook(recorder)
+        try:
+            chain = RunnableSequence(
+                Step({'last_successful': False}, name="a"), Step({}, name="b")
+            ).with_hooks(broken)
+            chain.invoke()
+            with pytest.raises(RuntimeError):
+                RunnableSequence(Step(error=RuntimeError("boom"), name="c")).invoke()
+        finally:
+            unregister_hook(recorder)
+            unregister_hook(recorder)
+
+        assert recorder.events == [("before", "a"), ("after", "a"), ("skip", "b"), ("before", "c"), ("error", "c")]
+
+    def test_async(self):
+        recorder = Recorder()
+        chain = (Step({'a': 1}, name="a") | Step({'b': 2}, name="b")).with_hooks(recorder)
+
+        result = asyncio.run(chain.ainvoke())
+
+        assert (result['a'], result['b']) == (1, 2)
+        assert asyncio.run(chain.aexecute({'x': 0}))['x'] == 0
+        assert chain.execute()['executed_steps'] == ["a", "b"]
+        with pytest.raises(RuntimeError):
+            asyncio.run(RunnableSequence(Step(error=RuntimeError("boom"))).with_hooks(recorder).ainvoke())
+        assert recorder.events[-1] == ("error", "Step")
+
+    def test_rejects_non_runnables(self):
+        with pytest.raises(TypeError, match="Step 0"):
+            RunnableSequence("login")
+        with pytest.raises(TypeError, match="Cannot chain"):
+            RunnableSequence(Step()) | "login"
+        with pytest.raises(NotImplementedError):
+            Runnable().execute()
+
+
+class TestRunnableBranch:
+    def test_routes_to_the_first_matching_branch(self):
+        office = Step({'mode': "office"}, name="office")
+        remote = Step("remote")
+        branch = RunnableBranch(
+            (lambda data: data.get('remote'), remote),
+            (lambda data: True, office),
+            name="check_in"
+        )
+
+        assert branch.execute() == {'mode': "office", 'branch_taken': "office"}
+        assert branch.execute({'remote': True}) == {'branch_taken': "Step", 'Step_result': "remote"}
+        assert asyncio.run(branch.aexecute({'remote': False}))['branch_taken'] == "office"
+
+    def test_default_and_no_match(self):
+        branch = RunnableBranch((lambda data: False, Step({})), default=Step({'d': 1}, name="default"))
+        unmatched = RunnableBranch((lambda data: False, Step({})), name="maybe")
+
+        assert branch.execute()['branch_taken'] == "default"
+        assert unmatched.execute() == {
+            'branch_taken': None,
+            'skipped_steps': [{'step': "maybe", 'reason': "no branch condition matched"}]
+        }
+        assert asyncio.run(unmatched.aexecute())['branch_taken'] is None
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            RunnableBranch()
+        with pytest.raises(TypeError, match="Branch 0 must be a"):
+            RunnableBranch((Step(),))
+        with pytest.raises(TypeError, match="must route to a Runnable"):
+            RunnableBranch((lambda data: True, "login"))
+        with pytest.raises(TypeError, match="Default branch"):
+            RunnableBranch(default="login")
+
+
+class TestRunnableGraph:
+    def graph(self):
+        return (
+            RunnableGraph()
+            .add("login", Step({'session': "s"}, delay=0.01))
+            .add("me", Step({'user': "ana"}), depends_on=["login"])
+            .add("breaks", Step({'break': "b"}, delay=0.02), depends_on=["me"])
+            .add("check_types", Step("types"), depends_on=["me"])
+            .add("plan", Step({'plan': True}), depends_on=["breaks", "check_types"])
+        )
+
+    def test_runs_nodes_after_their_dependencies(self):
+        result = self.graph().invoke({'seed': 1})
+
+        assert (result['plan'], result['check_types_result']) == (True, "types")
+        assert result['critical_path'] == ["login", "me", "breaks", "plan"]
+        assert result['critical_path_duration'] >= 0.03
+        assert result['graph_timings']['plan']['start'] >= result['graph_timings']['breaks']['end']
+
+    def test_async(self):
+        result = asyncio.run(self.graph().aexecute("seed"))
+
+        assert result['initial_data'] == "seed"
+        assert result['critical_path'][0] == "login"
+        assert RunnableGraph().execute()['critical_path'] == []
+
+    def test_failed_node_skips_its_dependents(self):
+        recorder = Recorder()
+        graph = (
+            RunnableGraph(hooks=[recorder])
+            .add("login", Step({'last_successful': True}))
+            .add("breaks", Step({'last_successful': False, 'error': "denied"}), depends_on=["login"])
+            .add("check_types", Step({'last_successful': True}, delay=0.02), depends_on=["login"])
+            .add("plan", Step({'plan': True}), depends_on=["breaks", "check_types"])
+            .add("notify", Step({}), depends_on=["plan"])
+        )
+
+        for result in (graph.invoke(), asyncio.run(graph.ainvoke())):
+            assert result['last_successful'] is False
+            assert result['error'] == "denied"
+            assert result['errors'] == [{'step': "breaks", 'error': "denied"}]
+            assert [skipped['step'] for skipped in result['skipped_steps']] == ["plan", "notify"]
+            assert 'plan' not in result
+        assert ("skip", "notify") in recorder.events
+        assert recorder.events.count(("after", "check_types")) == 2
+
+    def test_runs_global_hooks_and_reports_errors(self):
+        recorder = Recorder()
+        register_hook(recorder)
+        try:
+            with pytest.raises(RuntimeError):
+                RunnableGraph().add("login", Step(error=RuntimeError("boom"))).invoke()
+        finally:
+            unregister_hook(recorder)
+
+        assert recorder.events == [("before", "login"), ("error", "login")]
+
+    def test_validation(self):
+        graph = RunnableGraph().add("login", Step())
+
+        with pytest.raises(TypeError):
+            graph.add("me", "runnable")
+        with pytest.raises(ValueError, match="already defined"):
+            graph.add("login", Step())
+        with pytest.raises(ValueError, match="undefined nodes: me"):
+            graph.add("plan", Step(), depends_on=["me"])
+
+
+class TestRunnableParallel:
+    def test_merges_results(self):
+        parallel = RunnableParallel(Step({'a': 1, 'last_successful': True}), Step("b"), Step({'last_successful': False, 'error': "boom"}))
+
+        result = parallel.execute()
+
+        assert (result['a'], result['Step_result'], result['last_successful'], result['error']) == (1, "b", False, "boom")
+        assert RunnableParallel(Step({'only': True})).execute() == {'only': True}
+        assert asyncio.run(parallel.aexecute({'x': 1}))['last_successful'] is False
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            RunnableParallel()
+        with pytest.raises(TypeError):
+            RunnableParallel(Step(), "login")
+
+
+class TestAccount:
+    def test_from_env(self):
+        account = Account.from_env()
+
+        assert account.name == account.email == "ana@example.com"
+        assert "password" not in repr(account)
+
+    def test_from_dict(self, monkeypatch):
+        monkeypatch.setenv("BEN_PASSWORD", "secret")
+
+        account = Account.from_dict({
+            "name": "ben", "email": "ben@example.com", "password_env": "BEN_PASSWORD",
+            "remote_work_days": "monday, friday", "break_name": "Comiendo"
+        })
+
+        assert account.password == "secret"
+        assert account.remote_work_days == ["monday", "friday"]
+        assert Account.from_dict({"email": "c@example.com", "password": "x"}).name == "c@example.com"
+
+    def test_from_dict_errors(self):
+        with pytest.raises(ValueError, match="needs an 'email'"):
+            Account.from_dict({"password": "x"})
+        with pytest.raises(ValueError, match="password_env"):
+            Account.from_dict({"email": "c@example.com", "password_env": "UNSET_PASSWORD"})
+
+
+class TestDayPlan:
+    def test_remote_day_without_remote_check_type(self):
+        plan = DayPlan.build("ana", "user-1", CHECK_TYPES[:1], "break-1", ["wednesday"], date(2026, 3, 4))
+
+        assert plan.missing_remote_check_type
+        with pytest.raises(ValueError, match="No remote work check type"):
+            plan.payload(State.WORKING)
+        assert plan.payload(State.BREAK)["workCheckTypeId"] == "break-1"
+        with pytest.raises(ValueError, match="cannot build a clock payload"):
+            plan.payload(State.OFFLINE)
+
+    def test_requires_base_url_and_user(self, settings_env):
+        with pytest.raises(ValueError, match="User ID"):
+            DayPlan.build("ana", None, CHECK_TYPES)
+        settings_env(BASE_URL="")
+        with pytest.raises(ValueError, match="BASE_URL"):
+            DayPlan.build("ana", "user-1", CHECK_TYPES)
@@ -0,0 +1,432 @@
+import asyncio
+import pytest
+from record_cassettes import EMAIL
+from sesame_automate.http_client.cassette import SCRUBBED_USID, Cassette
+from sesame_automate.models.day_plan import DayPlan
+from sesame_automate.models.enums.state import State
+from sesame_automate.planning.day_planner import get_day_planner
+from sesame_automate.runnables import (
+    SesameTimeAssignedWorkCheckTypesRunnable,
+    SesameTimeBreakTransitionRunnable,
+    SesameTimeCheckInRunnable,
+    SesameTimeCheckOutRunnable,
+    SesameTimeCheckStatusRunnable,
+    SesameTimeClockRunnable,
+    SesameTimeDayPlanRunnable,
+    SesameTimeLoginRunnable,
+    SesameTimeMeInfoRunnable,
+    SesameTimeOutboxDeliveryRunnable,
+    SesameTimeWorkBreakRunnable
+)
+from sesame_automate.simulation import MockSesameServer
+from sesame_automate.stores.clock_outbox import get_clock_outbox
+from sesame_automate.stores.session_store import get_session_store
+from sesame_automate.stores.state_store import get_state_store
+
+EMPLOYEE_ID = "4badeee4-791f-51e2-a027-2c59bc6f8144"
+
+
+@pytest.fixture
+def signed_in():
+    return (SesameTimeLoginRunnable() | SesameTimeMeInfoRunnable()).invoke()
+
+
+def day_plan_runnable():
+    return SesameTimeDayPlanRunnable(SesameTimeAssignedWorkCheckTypesRunnable(), SesameTimeWorkBreakRunnable())
+
+
+@pytest.fixture
+def live(settings_env):
+    with MockSesameServer() as server:
+        settings_env(HTTP_CASSETTE="off", BASE_URL=server.base_url)
+        yield server
+
+
+def live_signed_in():
+    return (SesameTimeLoginRunnable() | SesameTimeMeInfoRunnable() | SesameTimeCheckStatusRunnable()).invoke()
+
+
+class TestLogin:
+    def test_logs_in_and_stores_the_session(self):
+        result = SesameTimeLoginRunnable().execute()
+
+        assert result['login_successful'] is True
+        assert result['session_reused'] is False
+        assert result['account'] == EMAIL
+        assert result['session'].cookies.get('USID') == SCRUBBED_USID
+        assert get_session_store().load(EMAIL)['usid'] == SCRUBBED_USID
+
+    def test_reuses_the_stored_session(self, signed_in):
+        result = SesameTimeLoginRunnable().execute()
+
+        assert result['session_reused'] is True
+        assert result['user_info']['user_id'] == EMPLOYEE_ID
+
+    def test_reports_rejected_credentials(self, tmp_path, settings_env):
+        cassette = Cassette(str(tmp_path / "rejected.json"), "record")
+        cassette.record("POST", "http://x/api/v3/security/login", {}, None, 401, "Unauthorized", {}, b'{"error": "Unauthorized"}')
+        cassette.save()
+        settings_env(HTTP_CASSETTE_PATH=str(tmp_path / "rejected.json"))
+
+        result = SesameTimeLoginRunnable().execute()
+
+        assert result['login_successful'] is False
+        assert "401" in result['error']
+
+    def test_async_login_reuses_the_stored_session(self, signed_in):
+        login = SesameTimeLoginRunnable()
+
+        async def run():
+            result = await login.aexecute()
+            return result, login.async_session
+
+        result, session = asyncio.run(run())
+        assert result['login_successful'] is True
+        assert session.cookies.get('USID') == SCRUBBED_USID
+        assert login.async_session is None
+
+
+class TestMeInfo:
+    def test_fetches_user_info(self, signed_in):
+        assert signed_in['last_successful'] is True
+        assert signed_in['user_info'] == {
+            "company_id": "company-1",
+            "user_id": EMPLOYEE_ID,
+            "full_name": "ana Employee1",
+            "company_name": "Mock Company"
+        }
+        assert get_session_store().load(EMAIL)['user_info']['user_id'] == EMPLOYEE_ID
+
+    def test_requires_login(self):
+        result = SesameTimeMeInfoRunnable().execute({'login_successful': False, 'error': 'boom'})
+
+        assert result['last_successful'] is False
+        assert result['previous_error'] == 'boom'
+
+    def test_async_fetch(self):
+        async def run():
+            return await (SesameTimeLoginRunnable() | SesameTimeMeInfoRunnable()).ainvoke()
+
+        assert asyncio.run(run())['user_info']['user_id'] == EMPLOYEE_ID
+
+
+class TestReferences:
+    def test_work_break_by_name(self, signed_in):
+        assert SesameTimeWorkBreakRunnable().execute(signed_in)['work_break_id'] == "break-1"
+
+    def test_unknown_work_break(self, signed_in):
+        result = SesameTimeWorkBreakRunnable(break_name="Siesta").execute(signed_in)
+
+        assert result['last_successful'] is True
+        assert result['work_break_id'] is None
+
+    def test_work_break_requires_company(self, signed_in):
+        result = SesameTimeWorkBreakRunnable().execute(dict(signed_in, user_info={}))
+
+        assert result['last_successful'] is False
+        assert "Company ID is required" in result['error']
+
+    def test_assigned_work_check_types(self, signed_in):
+        result = SesameTimeAssignedWorkCheckTypesRunnable().execute(signed_in)
+
+        assert [check_type['id'] for check_type in result['check_types']] == ["check-type-office", "check-type-remote"]
+
+    def test_references_require_login(self):
+        for runnable in (SesameTimeWorkBreakRunnable(), SesameTimeAssignedWorkCheckTypesRunnable(), day_plan_runnable()):
+            assert runnable.execute(None)['last_successful'] is False
+
+    def test_async_references(self, signed_in):
+        async def run():
+            login = SesameTimeLoginRunnable()
+            data = await login.aexecute()
+            data['async_session'] = login.async_session
+            return (
+                await SesameTimeWorkBreakRunnable().aexecute(data),
+                await SesameTimeAssignedWorkCheckTypesRunnable().aexecute(data)
+            )
+
+        work_break, check_types = asyncio.run(run())
+        assert work_break['work_break_id'] == "break-1"
+        assert len(check_types['check_types']) == 2
+
+    def test_day_plan(self, signed_in):
+        result = day_plan_runnable().execute(signed_in)
+
+        plan = result['day_plan']
+        assert isinstance(plan, DayPlan)
+        assert plan.work_break_id == "break-1"
+        assert plan.check_in_url.endswith(f"/api/v3/employees/{EMPLOYEE_ID}/check-in")
+        assert plan.payload(State.BREAK)['workCheckTypeId'] == "break-1"
+
+
+class TestCheckStatus:
+    def test_reads_the_server_state(self, signed_in):
+        result = SesameTimeCheckStatusRunnable().execute(signed_in)
+
+        assert result['server_state'] == State.OFFLINE
+        assert get_state_store().get(EMAIL)['state'] == State.OFFLINE
+
+    def test_falls_back_to_the_stored_state(self, signed_in):
+        get_state_store().set(EMAIL, State.WORKING, "local")
+
+        result = SesameTimeCheckStatusRunnable().execute(dict(signed_in, user_info={"user_id": "someone-else"}))
+
+        assert result['last_successful'] is True
+        assert result['server_state'] == State.UNKNOWN
+        assert result['last_known_state'] == State.WORKING
+        assert "No recorded response" in result['status_error']
+
+    def test_requires_login(self):
+        assert SesameTimeCheckStatusRunnable().execute({})['last_successful'] is False
+
+    def test_async_status(self, signed_in):
+        async def run():
+            return await (SesameTimeLoginRunnable() | SesameTimeCheckStatusRunnable()).ainvoke()
+
+        assert asyncio.run(run())['server_state'] == State.OFFLINE
+
+
+class TestClock:
+    def status_and_plan(self, signed_in):
+        return (SesameTimeCheckStatusRunnable() | day_plan_runnable()).invoke(signed_in)
+
+    def test_base_class_is_abstract(self):
+        class Incomplete(SesameTimeClockRunnable):
+            def _target_state(self, data):
+                return State.WORKING
+
+        with pytest.raises(TypeError, match="_clock_url"):
+            Incomplete()
+
+    def test_check_in(self, signed_in):
+        data = self.status_and_plan(signed_in)
+
+        result = SesameTimeCheckInRunnable().execute(dict(data, current_state=State.WORKING))
+
+        assert result == {'last_successful': True, 'server_state': State.WORKING, 'timestamp': result['timestamp']}
+        assert get_state_store().get(EMAIL)['state'] == State.WORKING
+
+    def test_check_in_skips_when_already_working(self, signed_in):
+        result = SesameTimeCheckInRunnable().execute(dict(signed_in, current_state=State.WORKING, server_state=State.WORKING))
+
+        assert result['skipped'] is True
+        assert result['skip_reason'] == "already checked in as working"
+
+    def test_check_out(self, signed_in):
+        data = dict(signed_in, **day_plan_runnable().execute(signed_in))
+
+        result = SesameTimeCheckOutRunnable().execute(
+            dict(data, current_state=State.WORKING, server_state=State.WORKING, state_store=get_state_store())
+        )
+
+        assert result['server_state'] == State.OFFLINE
+        assert get_state_store().get(EMAIL)['state'] == State.OFFLINE
+
+    def test_check_out_skips_when_offline(self, signed_in):
+        result = SesameTimeCheckOutRunnable().execute(dict(signed_in, server_state=State.OFFLINE))
+
+        assert result['skip_reason'] == "already checked out"
+
+    def test_unknown_state_fails(self, signed_in):
+        result = SesameTimeCheckInRunnable().execute(dict(signed_in))
+
+        assert result['last_successful'] is False
+        assert "Current state is unknown" in result['error']
+
+    def test_requires_login(self):
+        result = SesameTimeCheckOutRunnable().execute({'login_successful': False})
+
+        assert result['error'] == "Login failed, cannot proceed with check-out"
+
+    def test_queues_when_the_outbox_always_queues(self, signed_in, settings_env):
+        settings_env(CLOCK_OUTBOX="always")
+        data = self.status_and_plan(signed_in)
+
+        result = SesameTimeCheckInRunnable().execute(dict(data, current_state=State.WORKING))
+
+        assert result['queued'] is True
+        assert result['queued_state'] == State.WORKING
+        assert result['server_state'] == State.OFFLINE
+        assert get_clock_outbox().has_pending(EMAIL)
+        assert get_state_store().get(EMAIL)['state'] == State.OFFLINE
+
+    def test_async_check_in(self, signed_in):
+        data = self.status_and_plan(signed_in)
+        login = SesameTimeLoginRunnable()
+
+        async def run():
+            await login.aexecute()
+            return await SesameTimeCheckInRunnable().aexecute(
+                dict(data, current_state=State.WORKING, async_session=login.async_session)
+            )
+
+        assert asyncio.run(run())['server_state'] == State.WORKING
+
+    def test_queues_when_the_backend_is_down(self, live):
+        data = self.status_and_plan(live_signed_in())
+        live.error_rate = 1.0
+
+        result = SesameTimeCheckInRunnable().execute(dict(data, current_state=State.WORKING))
+
+        assert result['queued'] is True
+        assert get_clock_outbox().has_pending(EMAIL)
+
+    def test_rejected_clock_drops_the_cached_plan(self, live, settings_env):
+        settings_env(CLOCK_OUTBOX="off")
+        data = self.status_and_plan(live_signed_in())
+        plan = data['day_plan']
+        forbidden = DayPlan(**dict(plan.__dict__, check_in_url=plan.check_in_url.replace(EMPLOYEE_ID, "someone-else")))
+
+        result = SesameTimeCheckInRunnable().execute(dict(data, current_state=State.WORKING, day_plan=forbidden))
+
+        assert result['last_successful'] is False
+        assert "403" in result['error']
+        assert get_day_planner().get(EMAIL) is None
+
+
+class TestDayPlanRunnable:
+    def test_reuses_the_compiled_plan(self, live):
+        data = live_signed_in()
+        first = day_plan_runnable().execute(data)
+        requests_made = live.total_requests
+
+        second = day_plan_runnable().execute(data)
+
+        assert second['day_plan'] is first['day_plan']
+        assert live.total_requests == requests_made
+
+    def test_reports_reference_errors(self, live):
+        data = live_signed_in()
+        live.error_rate = 1.0
+
+        result = day_plan_runnable().execute(data)
+
+        assert result['last_successful'] is False
+        assert "500" in result['error']
+
+    def test_async(self, live):
+        login = SesameTimeLoginRunnable()
+
+        async def run():
+            data = await (login | SesameTimeMeInfoRunnable()).ainvoke()
+            data['async_session'] = login.async_session
+            return await day_plan_runnable().aexecute(data)
+
+        assert asyncio.run(run())['day_plan'].work_break_id == "break-1"
+        assert asyncio.run(day_plan_runnable().aexecute())['last_successful'] is False
+
+
+class TestBreakTransition:
+    def start_break(self):
+        return SesameTimeBreakTransitionRunnable(SesameTimeCheckOutRunnable(), SesameTimeCheckInRunnable(), State.WORKING, State.BREAK)
+
+    def working(self, live):
+        data = (SesameTimeLoginRunnable() | SesameTimeMeInfoRunnable() | day_plan_runnable()).invoke()
+        SesameTimeCheckInRunnable().execute(dict(data, current_state=State.WORKING, server_state=State.OFFLINE))
+        return (SesameTimeCheckStatusRunnable() | day_plan_runnable()).invoke(data)
+
+    def test_checks_out_and_in(self, live):
+        result = self.start_break().execute(self.working(live))
+
+        assert result['server_state'] == State.BREAK
+        assert result['check_in_successful'] is True
+        assert result['transition_gap_ms'] >= 0
+        assert [event["type"] for event in live.clock_events] == ["check-in", "check-out", "check-in"]
+        assert live.clock_events[-1]["workCheckTypeId"] == "break-1"
+
+    def test_async(self, live):
+        data = self.working(live)
+        login = SesameTimeLoginRunnable()
+
+        async def run():
+            await login.aexecute()
+            return await self.start_break().aexecute(dict(data, async_session=login.async_session))
+
+        assert asyncio.run(run())['server_state'] == State.BREAK
+
+    def test_skips_when_already_in_the_target_state(self):
+        result = self.start_break().execute({'login_successful': True, 'server_state': State.BREAK})
+
+        assert result['skip_reason'] == "already in break"
+        assert asyncio.run(self.start_break().aexecute({'login_successful': True, 'server_state': State.BREAK}))['skipped']
+
+    def test_skips_when_not_clocked_in(self, live):
+        data = (SesameTimeLoginRunnable() | SesameTimeMeInfoRunnable() | SesameTimeCheckStatusRunnable() | day_plan_runnable()).invoke()
+
+        result = self.start_break().execute(data)
+
+        assert result['skip_reason'] == "not clocked in"
+        assert asyncio.run(self.start_break().aexecute(dict(data, async_session=None)))['skipped']
+        assert live.clock_events == []
+
+    def test_failed_check_out_skips_the_check_in(self, live, settings_env):
+        settings_env(CLOCK_OUTBOX="off")
+        data = self.working(live)
+        live.error_rate = 1.0
+
+        result = self.start_break().execute(data)
+
+        assert result['check_out_successful'] is False
+        assert result['error'].startswith("Check-out failed, check-in skipped")
+        assert asyncio.run(self.start_break().aexecute(dict(data, async_session=None)))['check_in_successful'] is False
+
+    def test_requires_login(self):
+        assert self.start_break().execute()['previous_error'] is None
+        assert asyncio.run(self.start_break().aexecute({'error': 'denied'}))['previous_error'] == 'denied'
+
+
+class TestOutboxDelivery:
+    def event(self, data, url=None, target_state=State.WORKING):
+        plan = data['day_plan']
+        event_id = get_clock_outbox().enqueue(EMAIL, "check_in", target_state, url or plan.check_in_url, plan.payload(State.WORKING))
+        return get_clock_outbox().due()[0] | {'id': event_id}
+
+    def test_delivers_the_queued_event(self, live):
+        data = (SesameTimeCheckStatusRunnable() | day_plan_runnable()).invoke(live_signed_in())
+
+        result = SesameTimeOutboxDeliveryRunnable().execute(dict(data, outbox_event=self.event(data), state_store=get_state_store()))
+
+        assert result['delivery_status'] == "sent"
+        assert get_state_store().get(EMAIL)['state'] == State.WORKING
+        assert live.clock_events[0]["type"] == "check-in"
+
+    def test_skips_events_the_server_already_applied(self, live):
+        data = (SesameTimeCheckStatusRunnable() | day_plan_runnable()).invoke(live_signed_in())
+
+        result = SesameTimeOutboxDeliveryRunnable().execute(dict(data, outbox_event=self.event(data, target_state=State.OFFLINE)))
+
+        assert result['delivery_status'] == "duplicate"
+        assert live.clock_events == []
+
+    def test_transient_and_permanent_errors(self, live):
+        data = (SesameTimeCheckStatusRunnable() | day_plan_runnable()).invoke(live_signed_in())
+        forbidden = self.event(data, url=data['day_plan'].check_in_url.replace(EMPLOYEE_ID, "someone-else"))
+
+        rejected = SesameTimeOutboxDeliveryRunnable().execute(dict(data, outbox_event=forbidden))
+        live.error_rate = 1.0
+        failed = SesameTimeOutboxDeliveryRunnable().execute(dict(data, outbox_event=forbidden))
+
+        assert (rejected['retryable'], failed['retryable']) == (False, True)
+
+    def test_async(self, live):
+        data = (SesameTimeCheckStatusRunnable() | day_plan_runnable()).invoke(live_signed_in())
+        event = self.event(data)
+        login = SesameTimeLoginRunnable()
+
+        async def run():
+            await login.aexecute()
+            delivered = await SesameTimeOutboxDeliveryRunnable().aexecute(dict(data, outbox_event=event, async_session=login.async_session))
+            duplicate = await SesameTimeOutboxDeliveryRunnable().aexecute(dict(data, outbox_event=event, server_state=State.WORKING))
+            live.error_rate = 1.0
+            failed = await SesameTimeOutboxDeliveryRunnable().aexecute(dict(data, outbox_event=event, async_session=login.async_session))
+            return delivered, duplicate, failed
+
+        delivered, duplicate, failed = asyncio.run(run())
+        assert (delivered['delivery_status'], duplicate['delivery_status']) == ("sent", "duplicate")
+        assert failed['retryable'] is True
+
+    def test_requires_login(self):
+        result = SesameTimeOutboxDeliveryRunnable().execute({'login_successful': False, 'error': 'denied'})
+
+        assert (result['previous_error'], result['retryable']) == ('denied', True)
+        assert asyncio.run(SesameTimeOutboxDeliveryRunnable().aexecute())['last_successful'] is False
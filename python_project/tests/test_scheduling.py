@@ -0,0 +1,357 @@
+import asyncio
+import json
+import os
+import time
+from datetime import date, datetime, timedelta
+import pytest
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MISSED, JobExecutionEvent
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+from sesame_automate.coordination import JobCoordinator, SqliteLeaseBackend
+from sesame_automate.models.enums.state import State
+from sesame_automate.runnables import SesameTimeCalendarRunnable, SesameTimeLoginRunnable, SesameTimeMeInfoRunnable
+from sesame_automate.scheduling import (
+    OutboxDrainer,
+    RunHistoryListener,
+    SpreadTrigger,
+    WorkingCalendar,
+    account_offset,
+    expand_days_off,
+    last_fire_time,
+    schedule_catch_ups,
+    spread_trigger
+)
+from sesame_automate.simulation import MockSesameServer
+from sesame_automate.stores.clock_outbox import ClockOutbox
+from sesame_automate.stores.run_history import RunHistory
+
+NOW = datetime(2026, 3, 2, 9, 10).astimezone()
+
+
+def noop():
+    pass
+
+
+@pytest.fixture
+def run_history(tmp_path):
+    return RunHistory(str(tmp_path / "history.sqlite"))
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = BackgroundScheduler(timezone=NOW.tzinfo)
+    scheduler.add_job(noop, CronTrigger(hour=9, minute=0, timezone=NOW.tzinfo), id="in_time_job:ana", name="ana in time")
+    scheduler.add_job(noop, CronTrigger(hour=18, minute=0, timezone=NOW.tzinfo), id="out_time_job:ana", name="ana out time")
+    return scheduler
+
+
+class TestSpreadTrigger:
+    def test_shifts_every_fire_time(self):
+        trigger = SpreadTrigger(CronTrigger(hour=9, minute=0, timezone=NOW.tzinfo), offset=90)
+
+        first = trigger.get_next_fire_time(None, NOW - timedelta(hours=1))
+        assert first == NOW.replace(minute=1, second=30)
+        assert trigger.get_next_fire_time(first, first + timedelta(seconds=1)) == first + timedelta(days=1)
+        assert "offset=90.0s" in str(trigger)
+        assert "offset=90" in repr(trigger)
+
+    def test_jitter_stays_within_the_window(self):
+        trigger = SpreadTrigger(CronTrigger(hour=9, minute=0, timezone=NOW.tzinfo), jitter=60)
+
+        fire_time = trigger.get_next_fire_time(None, NOW - timedelta(hours=1))
+        assert NOW.replace(minute=0) <= fire_time <= NOW.replace(minute=1)
+        assert SpreadTrigger(CronTrigger(year=2020)).get_next_fire_time(None, NOW) is None
+
+    def test_account_offset_is_stable(self):
+        assert account_offset("ana", "in_time_job", 600) == account_offset("ana", "in_time_job", 600)
+        assert 0 <= account_offset("ana", "in_time_job", 600) < 600
+        assert account_offset("ana", "in_time_job", 0) == 0.0
+
+    def test_modes(self):
+        trigger = CronTrigger(hour=9)
+
+        assert spread_trigger(trigger, "ana", "in_time_job", "none", 600) is trigger
+        assert spread_trigger(trigger, "ana", "in_time_job", "random", 0) is trigger
+        assert spread_trigger(trigger, "ana", "in_time_job", "deterministic", 600).offset == account_offset("ana", "in_time_job", 600)
+        assert spread_trigger(trigger, "ana", "in_time_job", "random", 600).jitter == 600
+        with pytest.raises(ValueError, match="Unknown spread mode"):
+            spread_trigger(trigger, "ana", "in_time_job", "sideways", 600)
+
+
+class TestCatchUp:
+    def test_last_fire_time(self):
+        trigger = CronTrigger(minute="*/5", timezone=NOW.tzinfo)
+
+        assert last_fire_time(trigger, NOW - timedelta(minutes=12), NOW) == NOW
+        assert last_fire_time(trigger, NOW - timedelta(minutes=12), NOW - timedelta(seconds=1)) == NOW - timedelta(minutes=5)
+        assert last_fire_time(trigger, NOW + timedelta(minutes=1), NOW) is None
+
+    def test_schedules_missed_jobs(self, scheduler, run_history):
+        listener = RunHistoryListener(run_history)
+
+        scheduled = schedule_catch_ups(scheduler, listener, run_history, ["in_time_job", "out_time_job"], 1800, now=NOW)
+
+        assert scheduled == ["in_time_job:ana:catch-up"]
+        assert scheduler.get_job("in_time_job:ana:catch-up").name == "ana in time (catch-up)"
+
+    def test_skips_jobs_that_already_ran(self, scheduler, run_history):
+        run_history.record("in_time_job:ana", NOW.replace(minute=0), "executed")
+
+        assert schedule_catch_ups(scheduler, RunHistoryListener(run_history), run_history, ["in_time_job"], 1800, now=NOW) == []
+
+    def test_catches_up_missed_runs(self, scheduler, run_history):
+        run_history.record("in_time_job:ana", NOW.replace(minute=0), "missed")
+
+        assert schedule_catch_ups(scheduler, RunHistoryListener(run_history), run_history, ["in_time_job"], 1800, now=NOW)
+
+    def test_disabled(self, scheduler, run_history):
+        listener = RunHistoryListener(run_history)
+
+        assert schedule_catch_ups(scheduler, listener, run_history, ["in_time_job"], 0, now=NOW) == []
+        assert schedule_catch_ups(scheduler, listener, run_history, [], 1800, now=NOW) == []
+        assert schedule_catch_ups(scheduler, listener, run_history, ["in_time_job"], 60, now=NOW) == []
+
+    def test_listener_records_catch_ups_under_the_original_slot(self, run_history):
+        listener = RunHistoryListener(run_history)
+        slot = NOW.replace(minute=0)
+        listener.track_catch_up("in_time_job:ana:catch-up", "in_time_job:ana", slot)
+
+        listener(JobExecutionEvent(EVENT_JOB_EXECUTED, "in_time_job:ana:catch-up", "default", NOW))
+        listener(JobExecutionEvent(EVENT_JOB_ERROR, "out_time_job:ana", "default", NOW, exception=RuntimeError("boom")))
+
+        assert run_history.last_run("in_time_job:ana")["scheduled_at"] == slot.timestamp()
+        assert run_history.last_run("out_time_job:ana")["error"] == "boom"
+
+    def test_listener_survives_history_errors(self, run_history):
+        listener = RunHistoryListener(None)
+        listener(JobExecutionEvent(EVENT_JOB_MISSED, "in_time_job:ana", "default", NOW))
+
+    def test_attach(self, run_history):
+        scheduler = BackgroundScheduler()
+        RunHistoryListener(run_history).attach(scheduler)
+
+        assert len(scheduler._listeners) == 1
+
+
+class TestOutboxDrainer:
+    @pytest.fixture
+    def outbox(self, tmp_path):
+        return ClockOutbox(str(tmp_path / "outbox.sqlite"), "fallback")
+
+    def enqueue(self, outbox, account="ana"):
+        return outbox.enqueue(account, "check_in", State.WORKING, "http://x/check-in", {}, datetime.now().astimezone())
+
+    def test_delivers_due_events(self, outbox):
+        delivered = []
+        for account in ("ana", "ben"):
+            self.enqueue(outbox, account)
+        drainer = OutboxDrainer(outbox, lambda event: delivered.append(event['account']) or {'last_successful': True}, rate_limit=1000)
+
+        assert drainer.drain() == 2
+        assert sorted(delivered) == ["ana", "ben"]
+        assert outbox.counts() == {"sent": 2}
+        assert drainer.drain() == 0
+        drainer.stop()
+
+    def test_retries_transient_failures_with_backoff(self, outbox):
+        event_id = self.enqueue(outbox)
+        drainer = OutboxDrainer(outbox, lambda event: {'last_successful': False, 'error': '502'}, rate_limit=1000)
+
+        assert drainer.drain() == 0
+        assert outbox.counts() == {"pending": 1}
+        assert outbox.recent()[0]["id"] == event_id
+        assert outbox.due() == []
+        drainer.stop()
+
+    def test_gives_up_on_rejected_events(self, outbox):
+        self.enqueue(outbox)
+        self.enqueue(outbox, "ben")
+        results = iter([{'last_successful': False, 'error': 'rejected', 'retryable': False}, None])
+        drainer = OutboxDrainer(outbox, lambda event: next(results), max_concurrency=1, rate_limit=1000)
+
+        assert drainer.drain() == 0
+        assert outbox.counts() == {"failed": 1, "pending": 1}
+        drainer.stop()
+
+    def test_delivery_errors_are_retried(self, outbox):
+        self.enqueue(outbox)
+        drainer = OutboxDrainer(outbox, lambda event: 1 / 0, rate_limit=1000)
+
+        assert drainer.drain() == 0
+        assert "division by zero" in outbox.recent()[0]["last_error"]
+        drainer.stop()
+
+    def test_expires_old_events(self, outbox, caplog):
+        outbox.enqueue("ana", "check_in", State.WORKING, "http://x/check-in", {}, datetime.now().astimezone() - timedelta(hours=2))
+        drainer = OutboxDrainer(outbox, lambda event: pytest.fail("delivered"), max_age=60)
+
+        assert drainer.drain() == 0
+        assert "expired" in caplog.text
+        drainer.stop()
+
+    def test_skips_accounts_drained_by_another_replica(self, outbox, tmp_path):
+        backend = SqliteLeaseBackend(str(tmp_path / "leases.sqlite"))
+        backend.acquire("outbox:ana", "a", ttl=30)
+        for account in ("ana", "ben"):
+            self.enqueue(outbox, account)
+        delivered = []
+        drainer = OutboxDrainer(
+            outbox,
+            lambda event: delivered.append(event['account']) or {'last_successful': True},
+            rate_limit=1000,
+            coordinator=JobCoordinator(backend, "b")
+        )
+
+        assert drainer.drain() == 1
+        assert delivered == ["ben"]
+        assert outbox.has_pending("ana")
+        assert backend.get("outbox:ben")["status"] == "released"
+        assert backend.acquire("outbox:ben", "a", ttl=30)
+        drainer.stop()
+
+    def test_skips_events_delivered_while_waiting_for_the_lease(self, outbox):
+        self.enqueue(outbox)
+        event = outbox.due()[0]
+        outbox.mark_delivered(event['id'])
+        drainer = OutboxDrainer(outbox, lambda event: pytest.fail("delivered twice"), rate_limit=1000)
+
+        assert drainer._deliver_one(event) is False
+        drainer.stop()
+
+    def test_drains_in_the_background(self, outbox):
+        self.enqueue(outbox)
+        drainer = OutboxDrainer(outbox, lambda event: {'last_successful': True}, interval=0.01, rate_limit=1000)
+        drainer.start()
+        try:
+            deadline = time.monotonic() + 5
+            while outbox.counts().get("sent") != 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            drainer.stop()
+
+        assert outbox.counts() == {"sent": 1}
+
+
+class TestWorkingCalendar:
+    def test_expand_days_off(self):
+        days_off = expand_days_off([
+            {"date": "2026-03-05", "name": "Holiday"},
+            {"startDate": "2026-03-09T00:00:00", "endDate": date(2026, 3, 10)},
+            {"start": datetime(2026, 3, 12, 8), "reason": "Moving"}
+        ])
+
+        assert days_off == {
+            date(2026, 3, 5): "Holiday",
+            date(2026, 3, 9): "day off",
+            date(2026, 3, 10): "day off",
+            date(2026, 3, 12): "Moving"
+        }
+
+    def test_api_days_off_are_refreshed_daily(self):
+        calendar = WorkingCalendar("")
+        assert calendar.needs_refresh("ana")
+
+        calendar.update("ana", {date(2026, 3, 5): "Holiday"}, day=date(2026, 3, 2))
+
+        assert not calendar.needs_refresh("ana", date(2026, 3, 2))
+        assert calendar.day_off_reason("ana", date(2026, 3, 5)) == "Holiday"
+        assert calendar.is_working_day("ben", date(2026, 3, 5))
+
+    def test_toml_file(self, tmp_path):
+        path = tmp_path / "calendar.toml"
+        path.write_text(
+            '[[days_off]]\ndate = 2026-03-05\nname = "Holiday"\n\n'
+            '[[days_off]]\nstart = 2026-03-09\nend = 2026-03-10\nreason = "Vacation"\naccounts = ["ana"]\n'
+        )
+        calendar = WorkingCalendar(str(path))
+
+        assert calendar.day_off_reason("ben", date(2026, 3, 5)) == "Holiday"
+        assert calendar.day_off_reason("ana", date(2026, 3, 10)) == "Vacation"
+        assert calendar.is_working_day("ben", date(2026, 3, 10))
+
+    def test_json_file_is_reloaded_when_it_changes(self, tmp_path):
+        path = tmp_path / "calendar.json"
+        path.write_text(json.dumps([{"date": "2026-03-05"}]))
+        calendar = WorkingCalendar(str(path))
+        assert not calendar.is_working_day("ana", date(2026, 3, 5))
+
+        path.write_text(json.dumps({"days_off": [{"date": "2026-03-06"}]}))
+        os.utime(path, (time.time(), time.time() + 10))
+
+        assert calendar.is_working_day("ana", date(2026, 3, 5))
+        assert not calendar.is_working_day("ana", date(2026, 3, 6))
+
+    def test_keeps_the_previous_file_on_errors(self, tmp_path, caplog):
+        path = tmp_path / "calendar.json"
+        path.write_text(json.dumps([{"date": "2026-03-05"}]))
+        calendar = WorkingCalendar(str(path))
+        assert not calendar.is_working_day("ana", date(2026, 3, 5))
+
+        path.write_text("[broken")
+        os.utime(path, (time.time(), time.time() + 10))
+
+        assert not calendar.is_working_day("ana", date(2026, 3, 5))
+        assert "Failed to load calendar file" in caplog.text
+
+    def test_unsupported_and_missing_files(self, tmp_path, caplog):
+        path = tmp_path / "calendar.yaml"
+        path.write_text("days_off: []")
+
+        assert WorkingCalendar(str(path)).is_working_day("ana")
+        assert "expected .toml or .json" in caplog.text
+        assert WorkingCalendar(str(tmp_path / "missing.json")).is_working_day("ana")
+        assert "is not readable" in caplog.text
+
+
+class TestCalendarRunnable:
+    @pytest.fixture
+    def live(self, settings_env):
+        with MockSesameServer(holidays=("2026-03-05",), absences=("2026-03-09", "2026-03-10")) as server:
+            settings_env(HTTP_CASSETTE="off", BASE_URL=server.base_url)
+            yield server
+
+    def test_refreshes_the_working_calendar(self, live):
+        calendar = WorkingCalendar("")
+        runnable = SesameTimeLoginRunnable() | SesameTimeMeInfoRunnable() | SesameTimeCalendarRunnable("ana", calendar)
+
+        result = runnable.invoke()
+
+        assert result['days_off'] == 3
+        assert calendar.day_off_reason("ana", date(2026, 3, 9)) == "Vacation"
+        assert live.request_counts["GET calendar-holidays"] == live.request_counts["GET absences"] == 1
+
+    def test_async_refresh(self, live):
+        calendar = WorkingCalendar("")
+        runnable = SesameTimeLoginRunnable() | SesameTimeMeInfoRunnable() | SesameTimeCalendarRunnable("ana", calendar, 7)
+
+        result = asyncio.run(runnable.ainvoke())
+
+        assert result['last_successful'] is True
+        assert calendar.day_off_reason("ana", date(2026, 3, 5)) == "Holiday"
+
+    def test_keeps_the_previous_calendar_on_errors(self, live):
+        calendar = WorkingCalendar("")
+        calendar.update("ana", {date(2026, 3, 5): "Holiday"})
+        signed_in = (SesameTimeLoginRunnable() | SesameTimeMeInfoRunnable()).invoke()
+        live.error_rate = 1.0
+
+        result = SesameTimeCalendarRunnable("ana", calendar).execute(signed_in)
+
+        assert result['last_successful'] is False
+        assert "500" in result['error']
+        assert calendar.day_off_reason("ana", date(2026, 3, 5)) == "Holiday"
+        assert asyncio.run(SesameTimeCalendarRunnable("ana", calendar).aexecute(dict(signed_in, user_info={})))['error'] == \
+            "User ID is required to fetch the working calendar"
+
+    def test_requires_login(self):
+        runnable = SesameTimeCalendarRunnable("ana", WorkingCalendar(""))
+
+        assert runnable.execute({'login_successful': False, 'error': 'denied'})['previous_error'] == 'denied'
+        assert asyncio.run(runnable.aexecute())['last_successful'] is False
+
+    def test_requires_base_url(self, settings_env):
+        settings_env(BASE_URL="")
+
+        result = SesameTimeCalendarRunnable("ana", WorkingCalendar("")).execute({'login_successful': True, 'session': None})
+
+        assert "BASE_URL" in result['error']
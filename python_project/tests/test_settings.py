@@ -0,0 +1,167 @@
+import logging
+import os
+import time
+import pytest
+from sesame_automate.config import Settings, SettingsError, SettingsWatcher, get_settings, parse_work_days, reload_settings
+
+
+def test_defaults():
+    settings = Settings.from_mapping({})
+
+    assert settings.http_cassette == "off"
+    assert settings.clock_outbox == "fallback"
+    assert settings.catch_up_jobs == ("in_time_job",)
+    assert settings.cron_triggers == {}
+    assert settings.missing_schedules() == {
+        "IN_TIME_CRON": "check in",
+        "OUT_TIME_CRON": "check out",
+        "BREAK_START_CRON": "break start",
+        "BREAK_END_CRON": "break end"
+    }
+
+
+def test_parses_values():
+    settings = Settings.from_mapping({
+        "TIME_ZONE": "Europe/Madrid",
+        "REMOTE_WORK_DAYS": "Monday, friday",
+        "IN_TIME_CRON": "0 9 * * mon-fri, 30 8 * * sat",
+        "OUT_TIME_CRON": "0 18 * * mon-fri",
+        "BREAK_START_CRON": "0 14 * * mon-fri",
+        "BREAK_END_CRON": "0 15 * * mon-fri",
+        "FAST_START": "yes",
+        "HTTP_RATE_LIMIT": "2.5",
+        "REPLICA_COUNT": "3",
+        "REPLICA_INDEX": "2"
+    })
+
+    assert settings.remote_work_days == {"monday", "friday"}
+    assert settings.in_time_crons == ("0 9 * * mon-fri", "30 8 * * sat")
+    assert settings.fast_start is True
+    assert settings.http_rate_limit == 2.5
+    assert settings.replica_index == 2
+    assert settings.missing_schedules() == {}
+    assert str(settings.cron_trigger("0 18 * * mon-fri").timezone) == "Europe/Madrid"
+
+
+def test_collects_every_error():
+    with pytest.raises(SettingsError) as error:
+        Settings.from_mapping({
+            "TIME_ZONE": "Mars/Olympus",
+            "REMOTE_WORK_DAYS": "funday",
+            "REPLICA_COUNT": "2",
+            "REPLICA_INDEX": "2",
+            "FAST_START": "maybe",
+            "LOG_LEVEL": "loud",
+            "HTTP_MAX_RETRIES": "many",
+            "SCHEDULER_MISFIRE_GRACE_TIME": "0",
+            "IN_TIME_CRON": "not a cron"
+        })
+
+    assert len(error.value.errors) == 8
+    message = str(error.value)
+    assert "TIME_ZONE='Mars/Olympus' is not a known time zone" in message
+    assert "unknown weekdays: funday" in message
+    assert "REPLICA_INDEX=2 must be lower than REPLICA_COUNT=2" in message
+    assert "FAST_START='maybe' is not a boolean" in message
+    assert "LOG_LEVEL='loud' is not valid" in message
+    assert "HTTP_MAX_RETRIES='many' is not a valid int" in message
+    assert "SCHEDULER_MISFIRE_GRACE_TIME='0' must be at least 1" in message
+    assert "IN_TIME_CRON='not a cron' is not a valid cron expression" in message
+
+
+def test_parse_work_days():
+    assert parse_work_days(None) == frozenset()
+    assert parse_work_days(["Monday ", ""]) == {"monday"}
+
+
+def test_settings_file_wins_over_environment(tmp_path, caplog):
+    path = tmp_path / "settings.toml"
+    path.write_text('break_name = "Comiendo"\nremote_work_days = ["monday", "tuesday"]\nfast_start = true\nhttp_max_retries = 2\n')
+
+    with caplog.at_level(logging.WARNING):
+        settings = Settings.load({"SETTINGS_FILE": str(path), "BREAK_NAME": "Lunch", "HTTP_MAX_RETRIES": "2"})
+
+    assert settings.break_name == "Comiendo"
+    assert settings.remote_work_days == {"monday", "tuesday"}
+    assert settings.fast_start is True
+    assert "overrides the environment for BREAK_NAME" in caplog.text
+
+
+def test_settings_file_errors(tmp_path):
+    with pytest.raises(SettingsError, match="expected a .toml file"):
+        Settings.load({"SETTINGS_FILE": "settings.yaml"})
+    with pytest.raises(SettingsError, match="could not be read"):
+        Settings.load({"SETTINGS_FILE": str(tmp_path / "missing.toml")})
+
+
+def test_reload_replaces_the_shared_settings(monkeypatch):
+    monkeypatch.setenv("BREAK_NAME", "Siesta")
+
+    assert reload_settings() is get_settings()
+    assert get_settings().break_name == "Siesta"
+
+
+class TestSettingsWatcher:
+    def touch(self, path, content):
+        path.write_text(content)
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    def test_reloads_changed_settings_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "settings.toml"
+        path.write_text('break_name = "Lunch"\n')
+        monkeypatch.setenv("SETTINGS_FILE", str(path))
+        changes = []
+        watcher = SettingsWatcher([str(path), ""], changes.append)
+
+        assert watcher.check() is False
+        self.touch(path, 'break_name = "Comiendo"\n')
+
+        assert watcher.check() is True
+        assert changes[0].break_name == "Comiendo"
+        assert get_settings().break_name == "Comiendo"
+
+    def test_keeps_settings_on_invalid_change(self, tmp_path, monkeypatch):
+        path = tmp_path / "settings.toml"
+        path.write_text('break_name = "Lunch"\n')
+        monkeypatch.setenv("SETTINGS_FILE", str(path))
+        watcher = SettingsWatcher([str(path)], lambda settings: None)
+        previous = get_settings()
+
+        self.touch(path, 'log_level = "loud"\n')
+
+        assert watcher.check() is False
+        assert get_settings() is previous
+
+    def test_reloads_env_file(self, tmp_path, monkeypatch):
+        path = tmp_path / ".env"
+        path.write_text("BREAK_NAME=Lunch\n")
+        monkeypatch.setenv("BREAK_NAME", "Lunch")
+        watcher = SettingsWatcher([str(path)], lambda settings: 1 / 0)
+
+        self.touch(path, "BREAK_NAME=Merienda\n")
+
+        assert watcher.check() is True
+        assert get_settings().break_name == "Merienda"
+
+    def test_polls_in_the_background(self, tmp_path, monkeypatch):
+        path = tmp_path / "settings.toml"
+        path.write_text('break_name = "Lunch"\n')
+        monkeypatch.setenv("SETTINGS_FILE", str(path))
+        changes = []
+        watcher = SettingsWatcher([str(path)], changes.append, interval=0.01)
+        watcher.start()
+        try:
+            self.touch(path, 'break_name = "Comiendo"\n')
+            deadline = time.monotonic() + 5
+            while not changes and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            watcher.stop()
+
+        assert changes[0].break_name == "Comiendo"
+
+    def test_nothing_to_watch(self):
+        watcher = SettingsWatcher([], lambda settings: None)
+        watcher.start()
+        watcher.stop()
@@ -0,0 +1,64 @@
+import os
+import time
+from datetime import date, datetime
+import pytest
+from sesame_automate.simulation import VirtualClock, run_soak
+from sesame_automate.simulation.soak_simulation import soak_environment
+
+
+class TestVirtualClock:
+    def test_moves_and_restores_the_clock(self):
+        from sesame_automate.jobs import account_jobs
+
+        real_time = time.time
+        with VirtualClock(datetime(2026, 3, 2, 9).astimezone()) as clock:
+            assert date.fromtimestamp(time.time()) == date(2026, 3, 2)
+            assert account_jobs.datetime.now().date() == date(2026, 3, 2)
+            clock.set(datetime(2026, 3, 3, 18).astimezone())
+            assert account_jobs.datetime.now().hour == 18
+
+        assert time.time is real_time
+        assert account_jobs.datetime is datetime
+        assert account_jobs.datetime.now().date() == date.today()
+
+    def test_restores_the_clock_after_an_error(self):
+        real_time = time.time
+
+        with pytest.raises(RuntimeError, match="already running"):
+            with VirtualClock(datetime(2026, 3, 2).astimezone()):
+                with VirtualClock(datetime(2026, 3, 3).astimezone()):
+                    pass
+
+        assert time.time is real_time
+        with VirtualClock(datetime(2026, 3, 2).astimezone()):
+            pass
+
+
+class TestSoak:
+    def test_environment_is_restored(self, monkeypatch):
+        monkeypatch.setenv("BASE_URL", "http://real.test")
+        monkeypatch.delenv("IN_TIME_CRON", raising=False)
+
+        with pytest.raises(ValueError):
+            with soak_environment({"BASE_URL": "http://soak.test"}):
+                assert os.environ["BASE_URL"] == "http://soak.test"
+                assert os.environ["IN_TIME_CRON"] == "0 9 * * mon-fri"
+                raise ValueError("boom")
+
+        assert os.environ["BASE_URL"] == "http://real.test"
+        assert "IN_TIME_CRON" not in os.environ
+
+    def test_counts_requests_per_virtual_day(self):
+        environ = dict(os.environ)
+        real_time = time.time
+
+        report = run_soak(days=4, start=date(2026, 3, 5))
+
+        assert report["firings"] == 8
+        days = {sample["day"]: sample["requests"] for sample in report["samples"]}
+        assert list(days) == ["start", "2026-03-05", "2026-03-06", "2026-03-07", "2026-03-08"]
+        assert days["2026-03-05"] > 0 and days["2026-03-06"] > 0
+        assert days["2026-03-07"] == days["2026-03-08"] == 0
+        assert all(week[0]["failures"] == 0 for week in report["jobs"].values())
+        assert dict(os.environ) == environ
+        assert time.time is real_time
@@ -0,0 +1,177 @@
+import json
+import time
+import urllib.error
+import urllib.request
+import pytest
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+from sesame_automate.models.runnable_graph import RunnableGraph
+from sesame_automate.models.runnable_sequence import Runnable, RunnableSequence
+from sesame_automate.status import JobHistory, StatusServer, get_job_history
+
+
+class Step(Runnable):
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+
+    def execute(self, data=None):
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def noop(account=None):
+    pass
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = BackgroundScheduler()
+    scheduler.add_job(noop, CronTrigger(minute="*"), args=["ana"], id="in_time_job:ana", name="ana in time")
+    scheduler.add_job(noop, CronTrigger(minute="*"), id="metrics", name="metrics export")
+    scheduler.start(paused=True)
+    yield scheduler
+    scheduler.shutdown(wait=False)
+
+
+@pytest.fixture
+def server(scheduler):
+    history = JobHistory(size=10)
+    server = StatusServer(scheduler, history, ["ana", "ben"], login_grace=0)
+    server.start()
+    yield server
+    server.stop()
+
+
+def get(server, path):
+    try:
+        with urllib.request.urlopen(server.base_url + path) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class TestJobHistory:
+    def test_records_steps_of_tracked_runs(self):
+        history = JobHistory(size=2)
+        chain = (Step({'login_successful': True}) | Step({'last_successful': True})).with_hooks(history)
+
+        with history.track("ana", "in_time_job") as run:
+            run.finish(chain.invoke())
+        chain.invoke()
+
+        entry = history.recent()[0]
+        assert entry['ok'] is True
+        assert [step['step'] for step in entry['steps']] == ["Step", "Step"]
+        assert "ana" in history.last_login()
+        assert "ana" in history.last_handled()
+
+    def test_records_failures_and_skips(self):
+        history = JobHistory(size=5)
+        chain = (Step({'last_successful': False, 'error': 'denied'}) | Step({})).with_hooks(history)
+
+        with history.track("ana", "out_time_job") as run:
+            run.finish(chain.invoke())
+        with pytest.raises(RuntimeError):
+            with history.track("ben", "out_time_job"):
+                RunnableSequence(Step(error=RuntimeError("boom")), hooks=[history]).invoke()
+
+        failed, skipped = history.recent(account="ben")[0], history.recent(account="ana")[0]
+        assert (failed['ok'], failed['error']) == (False, "boom")
+        assert failed['steps'][0]['error'] == "boom"
+        assert skipped['steps'][0]['error'] == "denied"
+        assert skipped['steps'][1]['skipped'] == "short-circuited after Step failed"
+        assert history.last_login() == {}
+
+    def test_records_graph_nodes(self):
+        history = JobHistory(size=5)
+        graph = (
+            RunnableGraph(hooks=[history])
+            .add("login", Step({'login_successful': False, 'error': 'denied'}))
+            .add("me", Step({'last_successful': True}), depends_on=["login"])
+        )
+
+        with history.track("ana", "welcome_job") as run:
+            run.finish(graph.invoke())
+
+        entry = history.recent(job="welcome_job")[0]
+        assert (entry['ok'], entry['error']) == (False, "denied")
+        assert [(step['step'], step['ok']) for step in entry['steps']] == [("login", False), ("me", True)]
+        assert entry['steps'][1]['skipped'] == "dependency login did not complete"
+
+    def test_limits(self):
+        history = JobHistory(size=5)
+        for job in ("a", "b", "c"):
+            with history.track("ana", job):
+                pass
+
+        assert [run['job'] for run in history.recent(limit=2)] == ["c", "b"]
+        assert history.recent(limit=0) == []
+        with pytest.raises(ValueError, match="must not be negative"):
+            history.recent(limit=-1)
+        assert get_job_history() is get_job_history()
+
+
+class TestStatusServer:
+    def test_healthz(self, server):
+        status, body = get(server, "/healthz")
+
+        assert status == 200
+        assert body["status"] == "ok"
+
+    def test_not_ready_until_every_account_logged_in(self, server):
+        status, body = get(server, "/readyz")
+        assert status == 503
+        assert body["stale_logins"] == ["ana", "ben"]
+
+        for account in ("ana", "ben"):
+            with server.history.track(account, "in_time_job") as run:
+                run.finish({'login_successful': True})
+        status, body = get(server, "/readyz")
+        assert status == 200
+        assert body["ready"] is True
+
+    def test_readiness_waits_for_the_last_scheduled_run(self, server):
+        for account in ("ana", "ben"):
+            with server.history.track(account, "in_time_job") as run:
+                run.finish({'login_successful': True})
+        server.started_at -= 300
+        server.history._last_handled["ana"] = time.time() - 120
+
+        expected = server.expected_runs(time.time())
+        assert set(expected) == {"ana"}
+        assert server.expected_runs(server.started_at - 1) == {}
+        assert server.readiness()[1]["stale_logins"] == ["ana"]
+
+    def test_jobs(self, server):
+        status, body = get(server, "/jobs/")
+
+        assert status == 200
+        assert {job["id"] for job in body["jobs"]} == {"in_time_job:ana", "metrics"}
+
+    def test_history(self, server):
+        with server.history.track("ana", "in_time_job") as run:
+            run.finish({'last_successful': True})
+        with server.history.track("ben", "out_time_job") as run:
+            run.finish({'last_successful': True})
+
+        assert len(get(server, "/history")[1]["runs"]) == 2
+        assert get(server, "/history?account=ana")[1]["runs"][0]["job"] == "in_time_job"
+        assert get(server, "/history?job=out_time_job&limit=1")[1]["runs"][0]["account"] == "ben"
+        assert get(server, "/history?limit=many") == (400, {"error": "limit must be an integer"})
+        assert get(server, "/history?limit=-1") == (400, {"error": "limit must not be negative"})
+
+    def test_unknown_path_and_errors(self, server, monkeypatch):
+        status, body = get(server, "/metrics")
+        assert status == 404
+        assert "/healthz" in body["paths"]
+
+        monkeypatch.setattr(server, "liveness", lambda: 1 / 0)
+        assert get(server, "/healthz") == (500, {"error": "division by zero"})
+
+    def test_base_url_requires_a_running_server(self, scheduler):
+        server = StatusServer(scheduler, JobHistory(size=1), [])
+        with pytest.raises(RuntimeError):
+            server.base_url
+        server.stop()
@@ -0,0 +1,246 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+import httpx
+import pytest
+import requests
+from sesame_automate.http_client import HttpPolicy
+from sesame_automate.models.enums.state import State
+from sesame_automate.simulation import MockSesameServer
+from sesame_automate.stores.clock_outbox import ClockOutbox, get_clock_outbox
+from sesame_automate.stores.reference_cache import FileCacheBackend, MemoryCacheBackend, ReferenceCache, get_reference_cache
+from sesame_automate.stores.run_history import RunHistory, get_run_history
+from sesame_automate.stores.session_store import SessionStore
+from sesame_automate.stores.state_store import StateStore
+
+
+@pytest.fixture
+def server():
+    with MockSesameServer() as server:
+        yield server
+
+
+def signed_in_session(server, email="ana@example.com"):
+    session = requests.Session()
+    usid = session.post(server.base_url + "/api/v3/security/login", json={"email": email, "password": "x"}).json()["data"]
+    session.cookies.set("USID", usid)
+    return session
+
+
+class TestReferenceCache:
+    def test_serves_fresh_entries_from_memory(self, server):
+        cache = ReferenceCache(ttl=60, http_policy=HttpPolicy(max_retries=0))
+        session = signed_in_session(server)
+        url = server.base_url + "/api/v3/security/me"
+
+        assert cache.get_json(session, url) == cache.get_json(session, url)
+        assert server.request_counts["GET me"] == 1
+
+    def test_revalidates_expired_entries_with_etag(self, server):
+        cache = ReferenceCache(ttl=0, http_policy=HttpPolicy(max_retries=0))
+        session = signed_in_session(server)
+        url = server.base_url + "/api/v3/security/me"
+        body = cache.get_json(session, url)
+
+        assert cache.get_json(session, url) == body
+        assert server.request_counts["GET me"] == 2
+        assert server.bytes_sent < 2 * len(json.dumps(body)) + 100
+
+    def test_entries_are_per_account(self, server):
+        cache = ReferenceCache(ttl=60, http_policy=HttpPolicy(max_retries=0))
+        url = server.base_url + "/api/v3/security/me"
+        first = cache.get_json(signed_in_session(server, "ana@example.com"), url, "ana@example.com")
+        second = cache.get_json(signed_in_session(server, "ben@example.com"), url, "ben@example.com")
+
+        assert first["data"][0]["email"] != second["data"][0]["email"]
+
+    def test_serves_stale_entry_while_backend_is_down(self, server):
+        cache = ReferenceCache(ttl=0, http_policy=HttpPolicy(max_retries=0))
+        session = signed_in_session(server)
+        url = server.base_url + "/api/v3/security/me"
+        body = cache.get_json(session, url)
+
+        server.error_rate = 1.0
+        assert cache.get_json(session, url) == body
+
+    def test_drops_entry_on_permanent_error(self, server):
+        cache = ReferenceCache(ttl=0, http_policy=HttpPolicy(max_retries=0))
+        session = signed_in_session(server)
+        url = server.base_url + "/api/v3/security/me"
+        cache.get_json(session, url)
+
+        server.expire_sessions()
+        with pytest.raises(requests.HTTPError):
+            cache.get_json(session, url)
+        server.error_rate = 1.0
+        with pytest.raises(requests.HTTPError):
+            cache.get_json(session, url)
+
+    def test_async_fetch_and_revalidation(self, server):
+        cache = ReferenceCache(ttl=0, http_policy=HttpPolicy(max_retries=0))
+        usid = signed_in_session(server).cookies.get("USID")
+        url = server.base_url + "/api/v3/security/me"
+
+        async def fetch():
+            async with httpx.AsyncClient(cookies={"USID": usid}) as client:
+                first = await cache.aget_json(client, url)
+                second = await cache.aget_json(client, url)
+                server.error_rate = 1.0
+                third = await cache.aget_json(client, url)
+                return first, second, third
+
+        first, second, third = asyncio.run(fetch())
+        assert first == second == third
+
+    def test_invalidate_and_clear(self, server):
+        cache = ReferenceCache(ttl=60, http_policy=HttpPolicy(max_retries=0))
+        session = signed_in_session(server)
+        url = server.base_url + "/api/v3/security/me"
+        cache.get_json(session, url)
+
+        cache.invalidate("ana@example.com")
+        cache.get_json(session, url)
+        cache.clear()
+        cache.get_json(session, url)
+        assert server.request_counts["GET me"] == 3
+
+    def test_duplicated_cookies_keep_accounts_apart(self):
+        session = requests.Session()
+        session.cookies.set("USID", "a", domain="one.test")
+        session.cookies.set("USID", "b", domain="two.test")
+        cache = ReferenceCache(ttl=1)
+
+        assert cache._session_key(session, "ana@example.com") != cache._session_key(session, "ben@example.com")
+        assert cache._session_key(session, None) == cache._session_key(session, "ana@example.com")
+
+    def test_new_session_purges_the_previous_one(self, server, tmp_path):
+        path = str(tmp_path / "reference.json")
+        cache = ReferenceCache(FileCacheBackend(path), ttl=60, http_policy=HttpPolicy(max_retries=0))
+        url = server.base_url + "/api/v3/security/me"
+        cache.get_json(signed_in_session(server, "ben@example.com"), url, "ben@example.com")
+
+        for _ in range(3):
+            cache.get_json(signed_in_session(server), url, "ana@example.com")
+
+        with open(path) as f:
+            assert len(json.load(f)) == 2
+
+    def test_file_backend_survives_restarts(self, tmp_path):
+        path = str(tmp_path / "cache" / "reference.json")
+        backend = FileCacheBackend(path)
+        backend.set("a:me", {"body": 1})
+        backend.set("b:me", {"body": 2})
+        backend.delete_prefix("a:")
+        backend.delete_prefix("missing:")
+
+        assert FileCacheBackend(path).get("b:me") == {"body": 2}
+        assert FileCacheBackend(path).get("a:me") is None
+        assert oct(os.stat(path).st_mode & 0o777) == "0o600"
+
+    def test_file_backend_ignores_corrupt_file(self, tmp_path):
+        path = tmp_path / "reference.json"
+        path.write_text("{not json")
+
+        assert FileCacheBackend(str(path)).get("a") is None
+
+    def test_backend_from_settings(self, settings_env):
+        assert type(get_reference_cache()._backend) is MemoryCacheBackend
+
+        settings_env(REFERENCE_CACHE_BACKEND="file")
+        assert isinstance(ReferenceCache.from_settings()._backend, FileCacheBackend)
+
+
+class TestSessionStore:
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "sessions" / "store.json")
+        store = SessionStore(path)
+        store.save_user_info("ana", {"user_id": "1"})
+        store.save_session("ana", "usid-1")
+        store.save_user_info("ana", {"user_id": "1"})
+
+        assert SessionStore(path).load("ana")["user_info"] == {"user_id": "1"}
+        assert oct(os.stat(path).st_mode & 0o777) == "0o600"
+
+        store.invalidate("ana")
+        store.invalidate("ana")
+        assert SessionStore(path).load("ana") is None
+
+    def test_sees_sessions_written_by_another_process(self, tmp_path):
+        path = str(tmp_path / "store.json")
+        first = SessionStore(path)
+        second = SessionStore(path)
+        first.save_session("ana", "usid-1")
+        assert second.load("ana")["usid"] == "usid-1"
+
+        first.save_session("ana", "usid-2-longer")
+        assert second.load("ana")["usid"] == "usid-2-longer"
+
+    def test_ignores_corrupt_file(self, tmp_path):
+        path = tmp_path / "store.json"
+        path.write_text("[broken")
+
+        assert SessionStore(str(path)).load("ana") is None
+
+
+class TestStateStore:
+    def test_round_trip(self, tmp_path):
+        store = StateStore(str(tmp_path / "state.sqlite"))
+        assert store.get("ana") is None
+
+        store.set("ana", State.BREAK, "local")
+        state = StateStore(str(tmp_path / "state.sqlite")).get("ana")
+        assert state["state"] == State.BREAK
+        assert state["source"] == "local"
+
+
+class TestRunHistory:
+    def test_records_latest_status_per_slot(self, tmp_path):
+        history = RunHistory(str(tmp_path / "runs.sqlite"))
+        slot = datetime(2026, 3, 2, 9, 0).astimezone()
+        assert history.last_run("in_time_job") is None
+
+        history.record("in_time_job", slot - timedelta(days=1), "success")
+        history.record("in_time_job", slot, "running")
+        history.record("in_time_job", slot, "failed", "boom")
+
+        last = history.last_run("in_time_job")
+        assert last["scheduled_at"] == slot.timestamp()
+        assert (last["status"], last["error"]) == ("failed", "boom")
+        assert len(history.recent(limit=5)) == 2
+        assert get_run_history() is get_run_history()
+
+
+class TestClockOutbox:
+    def test_lifecycle(self, tmp_path):
+        outbox = ClockOutbox(str(tmp_path / "outbox.sqlite"), "fallback")
+        slot = datetime.now().astimezone() - timedelta(minutes=1)
+        first = outbox.enqueue("ana", "check_in", State.WORKING, "http://x/check-in", {"workCheckTypeId": None}, slot)
+        second = outbox.enqueue("ana", "check_out", State.OFFLINE, "http://x/check-out", {})
+        other = outbox.enqueue("ben", "check_in", State.WORKING, "http://x/check-in", {"workCheckTypeId": "office"})
+
+        assert outbox.should_queue("ana") and not outbox.should_queue("carl") and not outbox.should_queue(None)
+        assert [event["id"] for event in outbox.due()] == [first, other]
+        assert outbox.due(limit=1)[0]["scheduled_at"] == slot.timestamp()
+
+        outbox.mark_failed(first, "502", retry_at=9e12)
+        assert [event["id"] for event in outbox.due()] == [other]
+        outbox.mark_failed(other, "rejected")
+        outbox.mark_delivered(first)
+        assert [event["id"] for event in outbox.due()] == [second]
+
+        assert outbox.counts() == {"failed": 1, "pending": 1, "sent": 1}
+        assert outbox.recent(limit=1)[0]["id"] == other
+        assert outbox.expire(max_age=60) == 0
+        assert outbox.expire(max_age=-60) == 1
+        assert not outbox.has_pending("ana")
+
+    def test_modes(self, tmp_path, settings_env):
+        path = str(tmp_path / "outbox.sqlite")
+        assert ClockOutbox(path, "always").should_queue(None)
+        assert not ClockOutbox(path, "off").accepts(requests.ConnectionError())
+        assert ClockOutbox(path, "fallback").accepts(requests.ConnectionError())
+        assert not ClockOutbox(path, "fallback").accepts(ValueError())
+
+        settings_env(CLOCK_OUTBOX="off")
+        assert get_clock_outbox().mode == "off"